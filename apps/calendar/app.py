@@ -1,12 +1,15 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QCalendarWidget, QDialog, QLineEdit, 
                              QComboBox, QMessageBox, QListWidget, QListWidgetItem)
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtCore import Qt, QDate, Signal
 from PySide6.QtGui import QTextCharFormat, QColor, QBrush
 
-from .database import init_db, add_event, get_all_events, delete_event
+from .database import get_db, init_db, add_event, get_all_events, delete_event
 from src.ui.resolution_manager import ResolutionManager
 from src.ui.theme import Theme
+from src.ui.scroll_state import restore_scroll_position
+from src.core.query_runner import QueryRunner
+from src.core.change_bus import get_change_bus
 
 """
 Calendar Application Module.
@@ -21,12 +24,21 @@ class CalendarApp(QWidget):
 
     It shows the calendar grid and your list of events. You can add, view, 
     and delete events from here.
+
+    Emits `content_changed` whenever what's on screen changes.
     """
+    content_changed = Signal()
+
     def __init__(self, language_manager=None):
         """Sets up the calendar app, connects to the database, and builds the UI."""
         super().__init__()
         self.language_manager = language_manager
         init_db()
+        self.queries = QueryRunner(self)
+        bus = get_change_bus()
+        bus.watch(get_db())
+        bus.changed.connect(self.on_data_changed)
+        self.events = []
         self.res_manager = ResolutionManager()
         self.setup_ui()
         
@@ -51,6 +63,8 @@ class CalendarApp(QWidget):
         left_layout = QVBoxLayout()
         self.calendar = QCalendarWidget()
         self.calendar.setGridVisible(True)
+        self.calendar.currentPageChanged.connect(lambda year, month: self.content_changed.emit())
+        self.calendar.selectionChanged.connect(self.content_changed.emit)
         
         # Scaled Calendar Styles
         font_size = self.res_manager.scale(18)
@@ -174,14 +188,49 @@ class CalendarApp(QWidget):
         self.title_label.setText(events_title)
         self.add_btn.setText(add_text)
         self.del_btn.setText(del_text)
+        self.content_changed.emit()
 
     def refresh_data(self):
         """
-        Reloads events from the database and updates the UI.
+        Reloads events from the database in the background. The UI is
+        updated once they arrive.
+        """
+        self.queries.run("events", get_all_events, on_result=self.show_events)
+
+    def on_data_changed(self, change):
+        """Reloads the events when they were changed, here or anywhere else."""
+        if change.affects(get_db().path, ("events",)):
+            self.refresh_data()
+
+    def show_events(self, events):
+        """
+        Shows freshly loaded events in the calendar and the list.
+
+        Args:
+            events (List[Event]): All events.
         """
-        self.events = get_all_events()
+        self.events = events
         self.update_calendar_highlights()
         self.update_list()
+        self.content_changed.emit()
+
+    def save_state(self):
+        """Remembers the shown month, selected day and list position before the app is unloaded."""
+        return {
+            "selected": self.calendar.selectedDate().toString(Qt.DateFormat.ISODate),
+            "page": [self.calendar.yearShown(), self.calendar.monthShown()],
+            "scroll": self.event_list.verticalScrollBar().value()
+        }
+
+    def restore_state(self, state):
+        """Goes back to the month and day that were open before the app was unloaded."""
+        selected = QDate.fromString(state.get("selected", ""), Qt.DateFormat.ISODate)
+        if selected.isValid():
+            self.calendar.setSelectedDate(selected)
+        page = state.get("page")
+        if page:
+            self.calendar.setCurrentPage(page[0], page[1])
+        restore_scroll_position(self.event_list.verticalScrollBar(), state.get("scroll", 0))
 
     def update_calendar_highlights(self):
         """
@@ -198,7 +247,7 @@ class CalendarApp(QWidget):
         years_to_highlight = [current_year - 1, current_year, current_year + 1]
         
         for e in self.events:
-            cat = e.get("category", "General")
+            cat = e.category
             color_code = colors.get(cat, "#9E9E9E")
             
             fmt = QTextCharFormat()
@@ -207,7 +256,7 @@ class CalendarApp(QWidget):
             
             for year in years_to_highlight:
                 try:
-                    date = QDate(year, e['month'], e['day'])
+                    date = QDate(year, e.month, e.day)
                     if date.isValid():
                         self.calendar.setDateTextFormat(date, fmt)
                 except:
@@ -218,7 +267,7 @@ class CalendarApp(QWidget):
         Refreshes the list of events on the right side.
         """
         self.event_list.clear()
-        sorted_events = sorted(self.events, key=lambda x: (x['month'], x['day']))
+        sorted_events = sorted(self.events, key=lambda x: (x.month, x.day))
         
         months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
         
@@ -230,25 +279,25 @@ class CalendarApp(QWidget):
         }
         
         for e in sorted_events:
-            month_str = months[e['month'] - 1]
-            cat = e.get("category", "General")
+            month_str = months[e.month - 1]
+            cat = e.category
             icon = icons.get(cat, "📅")
             
-            text = f"{e['day']}. {month_str} - {icon} {e['title']}"
-            if e['year']:
-                text += f" ({e['year']})"
+            text = f"{e.day}. {month_str} - {icon} {e.title}"
+            if e.year:
+                text += f" ({e.year})"
             
             item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, e['id'])
+            item.setData(Qt.ItemDataRole.UserRole, e.id)
             self.event_list.addItem(item)
 
     def open_add_dialog(self):
         """
         Shows the dialog for adding a new event.
         """
+        # The event shows up once it's saved, see on_data_changed
         dialog = AddEventDialog(self, self.language_manager)
-        if dialog.exec():
-            self.refresh_data()
+        dialog.exec()
 
     def delete_selected(self):
         """
@@ -269,7 +318,6 @@ class CalendarApp(QWidget):
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if confirm == QMessageBox.StandardButton.Yes:
                 delete_event(e_id)
-                self.refresh_data()
 
 class AddEventDialog(QDialog):
     """
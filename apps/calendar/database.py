@@ -8,25 +8,40 @@ It manages the storage, retrieval, and deletion of events using SQLite.
 import sqlite3
 import os
 from datetime import datetime, date
+from typing import NamedTuple, Optional
+
+from src.core.database import get_database
+from src.core.migrations import run_migrations
 
 # Go up 3 levels from apps/calendar/database.py to root, then into data
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'events.db')
 
-def init_db():
-    """
-    Initializes the database schema.
-
-    Creates the 'events' table if it does not already exist.
-    """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    # We are changing the schema, so for simplicity in this prototype, we'll create a new table 'events'.
-    # If 'birthdays' exists, we could migrate, but let's just start fresh or coexist.
-    # Let's drop the old one to be clean if we want to replace it, or just make a new one.
-    # Given the user said "change it", let's assume we can start fresh or migrate.
-    # I'll just create 'events' table.
-    
-    cursor.execute("""
+def get_db():
+    """Returns the shared connection pool for the events database."""
+    return get_database(DB_PATH)
+
+class Event(NamedTuple):
+    """A row of 'events'. Events repeat every year; `year` is when it started, if known."""
+    id: int
+    title: str
+    day: int
+    month: int
+    year: Optional[int]
+    category: str
+
+class UpcomingEvent(NamedTuple):
+    """An event with how many days are left until it comes round again."""
+    id: int
+    title: str
+    day: int
+    month: int
+    year: Optional[int]
+    category: str
+    days_until: int
+
+def migrate_v1_events(conn):
+    """Schema v1: the 'events' table."""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS events (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             title TEXT NOT NULL,
@@ -36,8 +51,20 @@ def init_db():
             category TEXT DEFAULT 'General'
         )
     """)
-    conn.commit()
-    conn.close()
+
+# Schema migrations, oldest first. Never edit one that shipped; append a new one.
+MIGRATIONS = [
+    migrate_v1_events,
+]
+
+def init_db():
+    """
+    Brings the database up to the current schema.
+
+    Cheap to call from every constructor: once the schema is current this
+    doesn't touch the database again.
+    """
+    run_migrations(get_db(), MIGRATIONS)
 
 def add_event(title, day, month, year=None, category="General"):
     """
@@ -50,37 +77,19 @@ def add_event(title, day, month, year=None, category="General"):
         year (int, optional): The year of the event. Defaults to None.
         category (str, optional): The category of the event. Defaults to "General".
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO events (title, day, month, year, category) VALUES (?, ?, ?, ?, ?)", 
-                   (title, day, month, year, category))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    cursor = db.execute("INSERT INTO events (title, day, month, year, category) VALUES (?, ?, ?, ?, ?)", 
+                        (title, day, month, year, category))
+    db.record_change("events", cursor.lastrowid, "insert")
 
 def get_all_events():
     """
     Retrieves all events from the database.
 
     Returns:
-        list: A list of dictionaries, each representing an event.
+        List[Event]: All events, in calendar order.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, title, day, month, year, category FROM events ORDER BY month, day")
-    rows = cursor.fetchall()
-    conn.close()
-    
-    events = []
-    for row in rows:
-        events.append({
-            "id": row[0],
-            "title": row[1],
-            "day": row[2],
-            "month": row[3],
-            "year": row[4],
-            "category": row[5]
-        })
-    return events
+    return get_db().fetch_records(Event, "SELECT id, title, day, month, year, category FROM events ORDER BY month, day")
 
 def get_upcoming_events(days_ahead=7):
     """
@@ -91,7 +100,7 @@ def get_upcoming_events(days_ahead=7):
         days_ahead (int): The number of days to look ahead. Defaults to 7.
 
     Returns:
-        list: A sorted list of upcoming events with a 'days_until' key.
+        List[UpcomingEvent]: The upcoming events, soonest first.
     """
     all_events = get_all_events()
     upcoming = []
@@ -101,9 +110,9 @@ def get_upcoming_events(days_ahead=7):
     for e in all_events:
         # Create a date object for this event in the current year
         try:
-            e_date = date(current_year, e["month"], e["day"])
+            e_date = date(current_year, e.month, e.day)
         except ValueError:
-            if e["month"] == 2 and e["day"] == 29:
+            if e.month == 2 and e.day == 29:
                  e_date = date(current_year, 3, 1)
             else:
                 continue
@@ -111,19 +120,18 @@ def get_upcoming_events(days_ahead=7):
         # If event has passed this year, check next year
         if e_date < today:
             try:
-                e_date = date(current_year + 1, e["month"], e["day"])
+                e_date = date(current_year + 1, e.month, e.day)
             except ValueError:
-                 if e["month"] == 2 and e["day"] == 29:
+                 if e.month == 2 and e.day == 29:
                      e_date = date(current_year + 1, 3, 1)
 
         delta = (e_date - today).days
         
         if 0 <= delta <= days_ahead:
-            e["days_until"] = delta
-            upcoming.append(e)
+            upcoming.append(UpcomingEvent(*e, delta))
             
     # Sort by days until
-    upcoming.sort(key=lambda x: x["days_until"])
+    upcoming.sort(key=lambda x: x.days_until)
     return upcoming
 
 def delete_event(event_id):
@@ -133,8 +141,6 @@ def delete_event(event_id):
     Args:
         event_id (int): The ID of the event to delete.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM events WHERE id = ?", (event_id,))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    db.execute("DELETE FROM events WHERE id = ?", (event_id,))
+    db.record_change("events", event_id, "delete")
@@ -12,10 +12,11 @@ from PySide6.QtWidgets import (
     QLabel, QLineEdit, QDialog, QFormLayout, QMessageBox, QScrollArea,
     QGridLayout, QFrame, QCheckBox
 )
-from PySide6.QtCore import Qt, QTimer, QSize
+from PySide6.QtCore import Qt, QTimer, QSize, Signal
 from PySide6.QtGui import QIcon, QColor, QPalette
 
 from .api import HomeAssistantAPI
+from src.ui.scroll_state import restore_scroll_position
 
 # --- Theme Constants ---
 HA_BLUE = "#03a9f4"
@@ -89,6 +90,8 @@ class SettingsDialog(QDialog):
         return self.url_input.text(), self.token_input.text(), self.demo_checkbox.isChecked()
 
 class EntityTile(QFrame):
+    state_changed = Signal()
+
     def __init__(self, entity, api):
         super().__init__()
         self.entity = entity
@@ -169,8 +172,16 @@ class EntityTile(QFrame):
             self.state = "off" if self.state == "on" else "on"
             self.state_label.setText(self.state)
             self.update_style()
+            self.state_changed.emit()
 
 class HomeAssistantApp(QMainWindow):
+    """
+    Shows Home Assistant entities as tiles you can tap to toggle.
+
+    Emits `content_changed` whenever the tiles are reloaded or toggled.
+    """
+    content_changed = Signal()
+
     def __init__(self, language_manager=None):
         super().__init__()
         self.language_manager = language_manager
@@ -287,6 +298,14 @@ class HomeAssistantApp(QMainWindow):
             new_url, new_token, new_demo_mode = dialog.get_data()
             self.save_settings(new_url, new_token, new_demo_mode)
 
+    def save_state(self):
+        """Remembers how far the tiles were scrolled before the app is unloaded."""
+        return {"scroll": self.scroll_area.verticalScrollBar().value()}
+
+    def restore_state(self, state):
+        """Scrolls back to where we were before the app was unloaded."""
+        restore_scroll_position(self.scroll_area.verticalScrollBar(), state.get("scroll", 0))
+
     def refresh_data(self):
         if not self.api:
             return
@@ -322,9 +341,12 @@ class HomeAssistantApp(QMainWindow):
         
         for entity in filtered_states:
             tile = EntityTile(entity, self.api)
+            tile.state_changed.connect(self.content_changed.emit)
             self.grid_layout.addWidget(tile, row, col)
             
             col += 1
             if col >= max_cols:
                 col = 0
                 row += 1
+
+        self.content_changed.emit()
@@ -1,36 +1,83 @@
+import os
+
 from PySide6.QtWidgets import QWidget, QGridLayout
 from PySide6.QtCore import Signal, Qt
 from widgets.app_tile import AppTile
+from src.core.app_prewarmer import AppPrewarmer
+from src.core.paths import DATA_DIR
+from src.ui.preview_cache import PreviewCache
 
 class Dashboard(QWidget):
     """
     The dashboard widget displaying app tiles.
+
+    Tiles show up right away with the last known preview (or a placeholder).
+    The most used apps are then started in the background and their tiles get
+    a live preview. Previews are only captured again once an app's content
+    generation moves on, see `mark_dirty`.
+
+    Apps can take part by defining a `content_changed` signal and emitting it
+    whenever their visible state changes. Apps without it are assumed to
+    change whenever they are opened.
+
+    Changes to the app layout in the settings only add, remove or move the
+    affected tiles.
     """
     app_launched = Signal(str)
 
-    def __init__(self, settings_manager, app_registry, language_manager, res_manager, parent=None):
+    def __init__(self, settings_manager, app_registry, language_manager, res_manager, parent=None, preview_cache=None):
         super().__init__(parent)
         self.settings_manager = settings_manager
         self.app_registry = app_registry
         self.language_manager = language_manager
         self.res_manager = res_manager
-        
+        self.tiles = {}
+        self.generations = {}
+        self.watched_apps = {}
+        self.preview_cache = preview_cache or PreviewCache(os.path.join(DATA_DIR, "previews"))
+
         self.layout = QGridLayout(self)
         self.layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.layout.setSpacing(self.res_manager.scale(20))
-        
+
+        self.prewarmer = AppPrewarmer(self.app_registry, self.language_manager, self)
+        self.prewarmer.app_ready.connect(self.on_app_ready)
+
         self.populate()
+        self.settings_manager.setting_changed.connect(self.on_setting_changed)
+        self.language_manager.language_changed.connect(self.update_texts)
 
     def populate(self):
         """Fills the dashboard with app tiles."""
+        self.prewarmer.cancel()
+
         # Clear existing
         while self.layout.count():
             item = self.layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+        self.tiles = {}
+
+        all_apps_map = self.get_app_names()
+        for app_id, pos in self.get_positions().items():
+            app_name = all_apps_map.get(app_id)
+            if not app_name:
+                continue
+            self.add_tile(app_id, app_name, pos)
+
+        self.schedule_prewarm()
+
+    def get_app_names(self):
+        """Returns the display name of every known app, by ID."""
+        return {app["id"]: app["name"] for app in self.app_registry.get_app_list(self.language_manager)}
+
+    def get_positions(self):
+        """
+        Returns where each tile goes, laying all apps out in a 3-column grid if
+        nothing was arranged yet.
+        """
+        positions = dict(self.settings_manager.get_app_positions())
 
-        positions = self.settings_manager.get_app_positions()
-        
         if not positions:
             all_apps = self.app_registry.get_app_list(self.language_manager)
             row = 0
@@ -42,46 +89,185 @@ class Dashboard(QWidget):
                 if col >= max_cols:
                     col = 0
                     row += 1
-        
-        all_apps_map = {app["id"]: app["name"] for app in self.app_registry.get_app_list(self.language_manager)}
+        return positions
 
-        for app_id, pos in positions.items():
-            app_name = all_apps_map.get(app_id)
-            if not app_name:
+    def add_tile(self, app_id, app_name, pos):
+        """
+        Creates a tile for an app and places it in the grid.
+
+        Args:
+            app_id (str): The app.
+            app_name (str): Its display name.
+            pos (Dict[str, int]): The 'row' and 'col' to put it in.
+        """
+        tile = AppTile(app_id, app_name)
+        tile.launch_app.connect(self.app_launched.emit)
+        self.tiles[app_id] = tile
+
+        # Running apps get a current preview, the rest their last known one
+        app_instance = self.app_registry.get_loaded_instance(app_id)
+        if app_instance:
+            self.update_tile_preview(app_id, app_instance)
+        else:
+            cached = self.preview_cache.get_latest(app_id, tile.preview_target_size())
+            if cached:
+                tile.set_scaled_preview(cached)
+
+        self.layout.addWidget(tile, pos.get("row", 0), pos.get("col", 0))
+
+    def sync_tiles(self):
+        """
+        Brings the grid in line with the saved positions: tiles of removed apps
+        go away, new apps get a tile and moved tiles are re-placed. Tiles that
+        stay where they are aren't touched.
+        """
+        positions = self.get_positions()
+        all_apps_map = self.get_app_names()
+        wanted = {app_id: pos for app_id, pos in positions.items() if all_apps_map.get(app_id)}
+
+        for app_id in [app_id for app_id in self.tiles if app_id not in wanted]:
+            tile = self.tiles.pop(app_id)
+            self.layout.removeWidget(tile)
+            tile.deleteLater()
+
+        added = False
+        for app_id, pos in wanted.items():
+            tile = self.tiles.get(app_id)
+            if tile is None:
+                self.add_tile(app_id, all_apps_map[app_id], pos)
+                added = True
                 continue
-                
-            # Generate Preview
-            preview_pixmap = None
-            app_instance = self.app_registry.get_app_instance(app_id, self.language_manager)
-            if app_instance:
-                if not app_instance.isVisible():
-                    preview_w = self.res_manager.scale(800)
-                    preview_h = self.res_manager.scale(600)
-                    app_instance.resize(preview_w, preview_h)
-                preview_pixmap = app_instance.grab()
-            
-            tile = AppTile(app_id, app_name, preview_pixmap=preview_pixmap)
-            tile.launch_app.connect(self.app_launched.emit)
-            
-            row = pos.get("row", 0)
-            col = pos.get("col", 0)
-            self.layout.addWidget(tile, row, col)
+
+            row, col = self.layout.getItemPosition(self.layout.indexOf(tile))[:2]
+            if (row, col) != (pos.get("row", 0), pos.get("col", 0)):
+                self.layout.removeWidget(tile)
+                self.layout.addWidget(tile, pos.get("row", 0), pos.get("col", 0))
+
+        if added:
+            self.schedule_prewarm()
+
+    def schedule_prewarm(self):
+        """Queues the most used apps on the dashboard to be started in the background."""
+        self.prewarmer.schedule(
+            list(self.tiles),
+            self.settings_manager.get_app_launch_counts(),
+            self.settings_manager.get_prewarm_budget()
+        )
+
+    def on_setting_changed(self, key_path, old_value, new_value):
+        """Reacts to settings changes that affect the tiles."""
+        key = key_path.split(".")[0]
+        if key in ("app_positions", "enabled_apps"):
+            self.sync_tiles()
+        elif key == "prewarm_budget":
+            self.schedule_prewarm()
+
+    def update_texts(self, lang_code=None):
+        """Shows the app names in the current language."""
+        all_apps_map = self.get_app_names()
+        for app_id, tile in self.tiles.items():
+            if app_id in all_apps_map:
+                tile.set_name(all_apps_map[app_id])
+
+    def grab_preview(self, app_instance):
+        """
+        Renders a preview image of an app.
+
+        Args:
+            app_instance (QWidget): The running app.
+
+        Returns:
+            QPixmap: The rendered preview.
+        """
+        if not app_instance.isVisible() and app_instance.parentWidget() is None:
+            # Pages in the hub's stack already have the right size
+            preview_w = self.res_manager.scale(800)
+            preview_h = self.res_manager.scale(600)
+            app_instance.resize(preview_w, preview_h)
+        return app_instance.grab()
+
+    def update_tile_preview(self, app_id, app_instance):
+        """
+        Shows the app's preview on its tile, capturing it only if needed.
+
+        Args:
+            app_id (str): The app.
+            app_instance (QWidget): The running app.
+        """
+        tile = self.tiles.get(app_id)
+        if not tile:
+            return
+
+        self.watch_app(app_id, app_instance)
+
+        size = tile.preview_target_size()
+        generation = self.generations.get(app_id, 0)
+        pixmap = self.preview_cache.get(app_id, generation, size)
+        if pixmap is None:
+            pixmap = tile.scale_preview(self.grab_preview(app_instance))
+            self.preview_cache.put(app_id, generation, size, pixmap)
+        tile.set_scaled_preview(pixmap)
+
+    def mark_dirty(self, app_id):
+        """
+        Bumps an app's content generation so its preview gets captured again.
+
+        Args:
+            app_id (str): The app whose content may have changed.
+        """
+        self.generations[app_id] = self.generations.get(app_id, 0) + 1
+
+    @staticmethod
+    def reports_changes(app_instance):
+        """Whether the app implements the `content_changed` protocol."""
+        return getattr(app_instance, "content_changed", None) is not None
+
+    def watch_app(self, app_id, app_instance):
+        """
+        Subscribes to an app's `content_changed` signal (once per instance).
+
+        Args:
+            app_id (str): The app.
+            app_instance (QWidget): The running app.
+        """
+        if self.watched_apps.get(app_id) is app_instance:
+            return
+        self.watched_apps[app_id] = app_instance
+        if self.reports_changes(app_instance):
+            app_instance.content_changed.connect(lambda: self.mark_dirty(app_id))
+
+    def forget_app(self, app_id):
+        """
+        Drops our reference to an app that was unloaded. Its tile keeps the
+        last preview until the app runs again.
+
+        Args:
+            app_id (str): The unloaded app.
+        """
+        self.watched_apps.pop(app_id, None)
+
+    def on_app_launched(self, app_id, app_instance):
+        """
+        Called when the hub opens an app.
+
+        Apps that report their own changes are left alone; for all others we
+        have to assume that using them changed what they show.
+
+        Args:
+            app_id (str): The app.
+            app_instance (QWidget): The running app.
+        """
+        self.watch_app(app_id, app_instance)
+        if not self.reports_changes(app_instance):
+            self.mark_dirty(app_id)
+
+    def on_app_ready(self, app_id, app_instance):
+        """Swaps a tile's placeholder for a preview once its app was prewarmed."""
+        self.update_tile_preview(app_id, app_instance)
 
     def refresh_previews(self):
-        """Refreshes app previews."""
-        for i in range(self.layout.count()):
-            item = self.layout.itemAt(i)
-            widget = item.widget()
-            
-            if isinstance(widget, AppTile):
-                app_id = widget.app_id
-                app_instance = self.app_registry.get_app_instance(app_id, self.language_manager)
-                
-                if app_instance:
-                    if not app_instance.isVisible():
-                        preview_w = self.res_manager.scale(800)
-                        preview_h = self.res_manager.scale(600)
-                        app_instance.resize(preview_w, preview_h)
-                    
-                    preview_pixmap = app_instance.grab()
-                    widget.update_preview(preview_pixmap)
+        """Refreshes previews of the running apps marked dirty since their last capture."""
+        for app_id in self.tiles:
+            app_instance = self.app_registry.get_loaded_instance(app_id)
+            if app_instance:
+                self.update_tile_preview(app_id, app_instance)
@@ -6,22 +6,30 @@ from src.ui.volume_control import VolumeControlWidget
 class TopBar(QWidget):
     """
     The top bar widget containing widgets, volume control, and navigation buttons.
+
+    When the widget positions change in the settings, only the slots that now
+    show something different are rebuilt.
     """
     home_clicked = Signal()
     settings_clicked = Signal()
 
+    SLOT_COUNT = 5
+
     def __init__(self, settings_manager, widget_registry, language_manager, res_manager, parent=None):
         super().__init__(parent)
         self.settings_manager = settings_manager
         self.widget_registry = widget_registry
         self.language_manager = language_manager
         self.res_manager = res_manager
+        self.slots = {} # position -> (widget_id, instance)
+        self.slot_widgets = [] # what currently sits in each position (widget or spacer)
         
         self.layout = QHBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(self.res_manager.scale(20))
         
         self.setup_ui()
+        self.settings_manager.setting_changed.connect(self.on_setting_changed)
 
     def setup_ui(self):
         self.populate()
@@ -51,21 +59,13 @@ class TopBar(QWidget):
 
         # Load Widgets
         positions = self.settings_manager.get_widget_positions()
+        self.slots = {}
+        self.slot_widgets = []
         
-        for i in range(5):
-            if i in positions:
-                widget_id = positions[i]
-                widget_instance = self.widget_registry.get_widget_instance(widget_id, self.language_manager, self.res_manager)
-                if widget_instance:
-                    self.layout.addWidget(widget_instance)
-                else:
-                    self.layout.addSpacing(self.res_manager.scale(150))
-            else:
-                spacer = QWidget()
-                spacer.setFixedSize(self.res_manager.scale(150), self.res_manager.scale(10))
-                spacer.setStyleSheet("background: transparent;")
-                self.layout.addWidget(spacer)
-            
+        for i in range(self.SLOT_COUNT):
+            slot_widget = self.create_slot_widget(i, positions.get(i))
+            self.slot_widgets.append(slot_widget)
+            self.layout.addWidget(slot_widget)
             self.layout.addSpacing(self.res_manager.scale(20))
         
         self.layout.addStretch()
@@ -77,6 +77,82 @@ class TopBar(QWidget):
         self.layout.addWidget(self.home_btn)
         self.layout.addWidget(self.settings_btn)
 
+    def create_slot_widget(self, index, widget_id):
+        """
+        Builds what goes into a slot: the widget, or an empty spacer.
+
+        Args:
+            index (int): The slot position.
+            widget_id (str): The widget placed there, or None.
+
+        Returns:
+            QWidget: The widget instance or a spacer.
+        """
+        if widget_id:
+            widget_instance = self.widget_registry.get_widget_instance(widget_id, self.language_manager, self.res_manager)
+            if widget_instance:
+                self.slots[index] = (widget_id, widget_instance)
+                return widget_instance
+
+        spacer = QWidget()
+        spacer.setFixedSize(self.res_manager.scale(150), self.res_manager.scale(10))
+        spacer.setStyleSheet("background: transparent;")
+        return spacer
+
+    def set_slot(self, index, widget_id, carry_state=False):
+        """
+        Puts a (new instance of a) widget into one slot, leaving the others alone.
+
+        Args:
+            index (int): The slot position.
+            widget_id (str): The widget to show, or None to empty the slot.
+            carry_state (bool): Hand the old instance's `save_state()` to the
+                new one's `restore_state()`, if both support it.
+        """
+        old_widget = self.slot_widgets[index]
+        old_id = self.slots.pop(index, (None, None))[0]
+        new_widget = self.create_slot_widget(index, widget_id)
+
+        if carry_state and old_id == widget_id and hasattr(old_widget, "save_state") and hasattr(new_widget, "restore_state"):
+            try:
+                new_widget.restore_state(old_widget.save_state())
+            except Exception as e:
+                print(f"Error carrying over state of widget {widget_id}: {e}")
+
+        self.layout.replaceWidget(old_widget, new_widget)
+        old_widget.deleteLater()
+        self.slot_widgets[index] = new_widget
+
+    def sync_slots(self):
+        """Rebuilds the slots whose configured widget differs from what is shown."""
+        positions = self.settings_manager.get_widget_positions()
+        for index in range(self.SLOT_COUNT):
+            wanted = positions.get(index)
+            shown = self.slots.get(index, (None, None))[0]
+            if wanted != shown:
+                self.set_slot(index, wanted)
+
+    def on_setting_changed(self, key_path, old_value, new_value):
+        """Reacts to settings changes that affect the widget strip."""
+        if key_path.split(".")[0] == "widget_positions":
+            self.sync_slots()
+
+    def reload_widgets(self, widget_ids):
+        """
+        Replaces the instances of the given widgets with fresh ones (e.g. after
+        their code changed). All other slots keep their running widgets.
+
+        Widgets can carry state over by implementing `save_state()` and
+        `restore_state(state)`.
+
+        Args:
+            widget_ids (List[str]): The widgets that were reloaded.
+        """
+        positions = self.settings_manager.get_widget_positions()
+        for index in range(self.SLOT_COUNT):
+            if positions.get(index) in widget_ids:
+                self.set_slot(index, positions[index], carry_state=True)
+
     def set_home_visible(self, visible):
         self.home_btn.setVisible(visible)
         self.settings_btn.setVisible(not visible)
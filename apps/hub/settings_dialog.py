@@ -1,3 +1,4 @@
+import os
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, 
                              QPushButton, QTabWidget, QWidget, QLabel, QCheckBox, QGridLayout, QFrame, QComboBox, QSpinBox, QLineEdit, QFileDialog)
 from PySide6.QtCore import Qt, QMimeData, Signal, Signal
@@ -57,7 +58,8 @@ from PySide6.QtGui import QDrag, QPixmap, QPainter, QColor
 from src.ui.resolution_manager import ResolutionManager
 from src.ui.theme import Theme
 from src.core.data_manager import reset_application_data
-from PySide6.QtWidgets import QMessageBox
+from src.core.backup_manager import BackupManager
+from PySide6.QtWidgets import QMessageBox, QInputDialog, QProgressDialog
 
 """
 Settings Dialog Module.
@@ -419,7 +421,8 @@ class SettingsDialog(QDialog):
     """
     data_reset = Signal()
 
-    def __init__(self, settings_manager, app_registry, widget_registry, language_manager, parent=None):
+    def __init__(self, settings_manager, app_registry, widget_registry, language_manager, parent=None,
+                 backup_manager=None):
         super().__init__(parent)
         self.settings_manager = settings_manager
         self.app_registry = app_registry
@@ -430,6 +433,16 @@ class SettingsDialog(QDialog):
         self.setWindowTitle(self.language_manager.translate("settings_title"))
         self.resize(self.res_manager.scale(900), self.res_manager.scale(600))
         self.setStyleSheet(f"background-color: {Theme.BACKGROUND_COLOR}; color: {Theme.TEXT_PRIMARY};")
+
+        # The hub's manager outlives the dialog, so a restore still finishes if it is closed
+        self.owns_backup_manager = backup_manager is None
+        self.backup_manager = backup_manager or BackupManager(keep=self.settings_manager.get_backup_keep(),
+                                                              settings_manager=self.settings_manager, parent=self)
+        self.backup_manager.progress.connect(self.on_backup_progress)
+        self.backup_manager.backup_finished.connect(self.on_backup_finished)
+        self.backup_manager.restore_finished.connect(self.on_restore_finished)
+        self.backup_manager.failed.connect(self.on_backup_failed)
+        self.backup_progress = None
         
         self.setup_ui()
 
@@ -512,6 +525,16 @@ class SettingsDialog(QDialog):
         
         self.toggle_custom_resolution(self.res_combo.currentText())
 
+        # Background App Loading
+        prewarm_layout = QHBoxLayout()
+        prewarm_layout.addWidget(QLabel(f"{self.language_manager.translate('prewarm_budget')}:"))
+        self.prewarm_budget = QSpinBox()
+        self.prewarm_budget.setRange(0, 20)
+        self.prewarm_budget.setValue(self.settings_manager.get_prewarm_budget())
+        prewarm_layout.addWidget(self.prewarm_budget)
+        prewarm_layout.addStretch()
+        general_layout.addLayout(prewarm_layout)
+
         
         # Reset Data Button
         reset_layout = QHBoxLayout()
@@ -519,6 +542,16 @@ class SettingsDialog(QDialog):
         reset_btn.setStyleSheet("background-color: #ff5555; color: white; padding: 8px;")
         reset_btn.clicked.connect(self.reset_data)
         reset_layout.addWidget(reset_btn)
+
+        backup_btn = QPushButton(self.language_manager.translate("backup_now"))
+        backup_btn.setStyleSheet("padding: 8px;")
+        backup_btn.clicked.connect(self.create_backup)
+        reset_layout.addWidget(backup_btn)
+
+        restore_btn = QPushButton(self.language_manager.translate("restore_backup"))
+        restore_btn.setStyleSheet("padding: 8px;")
+        restore_btn.clicked.connect(self.restore_backup)
+        reset_layout.addWidget(restore_btn)
         reset_layout.addStretch()
         
         general_layout.addLayout(reset_layout)
@@ -606,57 +639,61 @@ class SettingsDialog(QDialog):
         """
         Saves all configuration changes to the settings manager.
         """
-        # General
-        selected_lang = self.lang_combo.currentText()
-        self.settings_manager.set_language(selected_lang)
-        self.language_manager.load_language(selected_lang)
-
-        # Resolution
-        selected_res = self.res_combo.currentText()
-        new_res_setting = "auto"
-        
-        if selected_res == "Custom":
-            new_res_setting = f"{self.res_width.value()}x{self.res_height.value()}"
-        elif selected_res == "Auto":
+        # Written to disk once, after everything is updated
+        with self.settings_manager.batch():
+            # General
+            selected_lang = self.lang_combo.currentText()
+            self.settings_manager.set_language(selected_lang)
+            self.language_manager.load_language(selected_lang)
+
+            # Resolution
+            selected_res = self.res_combo.currentText()
             new_res_setting = "auto"
-        else:
-            new_res_setting = selected_res
-            
-        old_res_setting = self.settings_manager.get_resolution()
-        if new_res_setting != old_res_setting:
-            self.settings_manager.set_resolution(new_res_setting)
-            QMessageBox.information(self, self.language_manager.translate("info"), 
-                                  self.language_manager.translate("restart_required"))
-
-            QMessageBox.information(self, self.language_manager.translate("info"), 
-                                  self.language_manager.translate("restart_required"))
-
-        # Screensaver
-        ss_settings = {
-            "enabled": self.ss_enabled.isChecked(),
-            "timeout": self.ss_timeout.value(),
-            "slide_duration": self.ss_duration.value(),
-            "image_path": self.ss_path.text()
-        }
-        self.settings_manager.set_screensaver_settings(ss_settings)
-
-        # Apps
-        positions = self.grid_editor.get_positions()
-        self.settings_manager.set_app_positions(positions)
-        
-        # Also update enabled apps based on what's in the grid
-        enabled_apps = list(positions.keys())
-        self.settings_manager.set_enabled_apps(enabled_apps)
-        
-        # Widgets
-        widget_positions = self.widget_editor.get_positions()
-        self.settings_manager.set_widget_positions(widget_positions)
-        
-        # Update enabled/order for backward compatibility or other uses
-        enabled_widgets = list(widget_positions.values())
-        self.settings_manager.set_enabled_widgets(enabled_widgets)
-        self.settings_manager.set_widget_order(enabled_widgets)
         
+            if selected_res == "Custom":
+                new_res_setting = f"{self.res_width.value()}x{self.res_height.value()}"
+            elif selected_res == "Auto":
+                new_res_setting = "auto"
+            else:
+                new_res_setting = selected_res
+            
+            old_res_setting = self.settings_manager.get_resolution()
+            if new_res_setting != old_res_setting:
+                self.settings_manager.set_resolution(new_res_setting)
+                QMessageBox.information(self, self.language_manager.translate("info"), 
+                                      self.language_manager.translate("restart_required"))
+
+                QMessageBox.information(self, self.language_manager.translate("info"), 
+                                      self.language_manager.translate("restart_required"))
+
+            self.settings_manager.set_prewarm_budget(self.prewarm_budget.value())
+
+            # Screensaver
+            ss_settings = {
+                "enabled": self.ss_enabled.isChecked(),
+                "timeout": self.ss_timeout.value(),
+                "slide_duration": self.ss_duration.value(),
+                "image_path": self.ss_path.text()
+            }
+            self.settings_manager.set_screensaver_settings(ss_settings)
+
+            # Apps
+            positions = self.grid_editor.get_positions()
+            self.settings_manager.set_app_positions(positions)
+        
+            # Also update enabled apps based on what's in the grid
+            enabled_apps = list(positions.keys())
+            self.settings_manager.set_enabled_apps(enabled_apps)
+        
+            # Widgets
+            widget_positions = self.widget_editor.get_positions()
+            self.settings_manager.set_widget_positions(widget_positions)
+        
+            # Update enabled/order for backward compatibility or other uses
+            enabled_widgets = list(widget_positions.values())
+            self.settings_manager.set_enabled_widgets(enabled_widgets)
+            self.settings_manager.set_widget_order(enabled_widgets)
+
         self.accept()
 
     def reset_data(self):
@@ -688,6 +725,69 @@ class SettingsDialog(QDialog):
                     self.data_reset.emit()
                     # Optional: Close app or restart? For now just notify.
 
+    def show_backup_progress(self, title):
+        """Keeps the dialog busy (and the user from closing it) while a backup job runs."""
+        self.backup_progress = QProgressDialog(title, None, 0, 0, self)
+        self.backup_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.backup_progress.setMinimumDuration(0)
+        self.backup_progress.show()
+
+    def hide_backup_progress(self):
+        if self.backup_progress:
+            self.backup_progress.close()
+            self.backup_progress = None
+
+    def create_backup(self):
+        """Snapshots all data and settings in the background."""
+        self.show_backup_progress(self.language_manager.translate("backup_running"))
+        self.backup_manager.start_backup()
+
+    def restore_backup(self):
+        """
+        Lets you pick a backup and, after confirmation, replaces all data and
+        settings with it.
+        """
+        backups = self.backup_manager.list_backups()
+        if not backups:
+            QMessageBox.information(self, self.language_manager.translate("info"),
+                                    self.language_manager.translate("no_backups"))
+            return
+
+        names = [os.path.basename(path) for path in backups]
+        name, ok = QInputDialog.getItem(self, self.language_manager.translate("restore_backup"),
+                                        self.language_manager.translate("select_backup"), names, 0, False)
+        if not ok:
+            return
+
+        reply = QMessageBox.question(self, self.language_manager.translate("warning"),
+                                     self.language_manager.translate("restore_confirm"),
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.show_backup_progress(self.language_manager.translate("restore_running"))
+            self.backup_manager.start_restore(backups[names.index(name)])
+
+    def on_backup_progress(self, text):
+        if self.backup_progress:
+            self.backup_progress.setLabelText(text)
+
+    def on_backup_finished(self, path):
+        self.hide_backup_progress()
+        QMessageBox.information(self, self.language_manager.translate("success"),
+                                self.language_manager.translate("backup_success").format(path=path))
+
+    def on_restore_finished(self, path):
+        """Lets the hub reload everything (the settings were already reloaded)."""
+        self.hide_backup_progress()
+        if self.owns_backup_manager:
+            self.data_reset.emit() # Otherwise the hub listens to the manager itself
+        QMessageBox.information(self, self.language_manager.translate("success"),
+                                self.language_manager.translate("restore_success"))
+
+    def on_backup_failed(self, message):
+        self.hide_backup_progress()
+        QMessageBox.critical(self, self.language_manager.translate("error"), message)
+
     def browse_screensaver_path(self):
         """Opens a directory picker for screensaver images."""
         directory = QFileDialog.getExistingDirectory(self, self.language_manager.translate("select_folder"), 
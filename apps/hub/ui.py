@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QStackedWidget, QGridLayout, QPushButton, QFrame)
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtGui import QPalette, QColor
 
 from widgets.app_tile import AppTile
@@ -23,6 +23,13 @@ and managing the top bar widget strip.
 """
 
 from src.core.screensaver_manager import ScreensaverManager
+from src.core.startup_profiler import startup_profiler
+from src.core.paint_latency import PaintLatencyTracker
+from src.core.hot_reloader import HotReloader
+from src.core.database import close_all_databases
+from src.core.query_runner import shutdown_worker_pool
+from src.core.db_maintenance import MaintenanceScheduler
+from src.core.backup_manager import BackupManager
 from .screensaver_ui import ScreensaverWindow
 from .components.top_bar import TopBar
 from .components.dashboard import Dashboard
@@ -32,8 +39,12 @@ class HubWindow(QMainWindow):
     The main window for the Hub.
 
     It manages the central dashboard, lets you switch between apps, and handles 
-    global stuff like the top bar and settings.
+    global stuff like the top bar and settings. Every app that was opened keeps
+    its own page in the stack, so switching back to it is just a page flip.
     """
+    EVICTION_CHECK_MS = 60 * 1000
+
+    @startup_profiler.phase("HubWindow.__init__")
     def __init__(self):
         """Sets up the window, loads settings, and gets everything ready."""
         super().__init__()
@@ -44,26 +55,45 @@ class HubWindow(QMainWindow):
 
         
         # Initialize Core Systems
-        from src.core.paths import CONFIG_DIR, ROOT_DIR, APPS_DIR, WIDGETS_DIR
+        from src.core.paths import CONFIG_DIR, ROOT_DIR, APPS_DIR, WIDGETS_DIR, get_db_path
         
-        self.settings_manager = SettingsManager(CONFIG_DIR)
-        self.language_manager = LanguageManager(ROOT_DIR)
-        self.language_manager.load_language(self.settings_manager.get_language())
+        with startup_profiler.phase("SettingsManager"):
+            self.settings_manager = SettingsManager(CONFIG_DIR)
+        with startup_profiler.phase("LanguageManager.load_language"):
+            self.language_manager = LanguageManager(ROOT_DIR, cache_path=get_db_path("translations.cache"))
+            self.language_manager.load_language(self.settings_manager.get_language())
         
         # Apply Resolution Setting
         resolution_setting = self.settings_manager.get_resolution()
         self.res_manager.update_screen_info(resolution_setting)
         
-        self.app_registry = AppRegistry(APPS_DIR)
-        self.widget_registry = WidgetRegistry(WIDGETS_DIR)
+        with startup_profiler.phase("AppRegistry"):
+            self.app_registry = AppRegistry(APPS_DIR, index_path=get_db_path("app_index.json"),
+                                            settings_manager=self.settings_manager)
+        self.apply_eviction_settings()
+        self.settings_manager.setting_changed.connect(self.on_setting_changed)
+        with startup_profiler.phase("WidgetRegistry"):
+            self.widget_registry = WidgetRegistry(WIDGETS_DIR)
         
         # Screensaver
-        self.screensaver_manager = ScreensaverManager(self.settings_manager)
-        self.screensaver_window = ScreensaverWindow(self.settings_manager)
+        with startup_profiler.phase("ScreensaverWindow"):
+            self.screensaver_manager = ScreensaverManager(self.settings_manager)
+            self.screensaver_window = ScreensaverWindow(self.settings_manager)
         
         self.screensaver_manager.activate_screensaver.connect(self.screensaver_window.start)
         self.screensaver_manager.deactivate_screensaver.connect(self.screensaver_window.stop)
         self.screensaver_window.activity_detected.connect(self.screensaver_manager.deactivate)
+
+        # Database housekeeping while the screensaver is on
+        self.db_maintenance = MaintenanceScheduler(parent=self)
+        self.screensaver_manager.activate_screensaver.connect(self.db_maintenance.start)
+        self.screensaver_manager.deactivate_screensaver.connect(self.db_maintenance.abort)
+
+        # Backups and restores run here rather than in the settings dialog, so
+        # closing the dialog doesn't stop a restore halfway
+        self.backup_manager = BackupManager(keep=self.settings_manager.get_backup_keep(),
+                                            settings_manager=self.settings_manager, parent=self)
+        self.backup_manager.restore_finished.connect(lambda archive: self.on_data_reset())
         
         # Apply Theme
         self.setStyleSheet(f"QMainWindow {{ background: {Theme.BACKGROUND_GRADIENT}; }}")
@@ -72,11 +102,41 @@ class HubWindow(QMainWindow):
         self.showFullScreen()
 
         self.active_app = None
+        self.active_app_id = None
+        self.app_pages = {}
+        self.launch_latency = PaintLatencyTracker(parent=self)
+        self.launch_latency.measured.connect(
+            lambda app_id, ms: print(f"{app_id} painted {ms:.1f} ms after launch"))
+
+        # Unload apps that haven't been used in a while
+        self.eviction_timer = QTimer(self)
+        self.eviction_timer.timeout.connect(self.evict_idle_apps)
+        self.eviction_timer.start(self.EVICTION_CHECK_MS)
 
         self.setup_ui()
         self.update_texts()
         self.language_manager.language_changed.connect(self.update_texts)
 
+        # Parse the other languages once the window is up, so switching is instant
+        QTimer.singleShot(0, self.language_manager.preload_languages)
+
+        # Pick up app and widget updates without a restart
+        self.hot_reloader = None
+        if self.settings_manager.get_hot_reload():
+            self.hot_reloader = HotReloader(APPS_DIR, WIDGETS_DIR, self)
+            self.hot_reloader.apps_changed.connect(self.on_apps_changed)
+            self.hot_reloader.widgets_changed.connect(self.on_widgets_changed)
+            self.hot_reloader.start()
+
+    def closeEvent(self, event):
+        """Writes any unsaved settings and closes the databases before the window goes away."""
+        self.settings_manager.flush()
+        self.db_maintenance.abort()
+        self.db_maintenance.wait()
+        shutdown_worker_pool()
+        close_all_databases()
+        super().closeEvent(event)
+
     def update_texts(self, lang_code=None):
         """Updates UI texts based on current language."""
         self.setWindowTitle(self.language_manager.translate("app_title"))
@@ -105,7 +165,8 @@ class HubWindow(QMainWindow):
         main_layout.setSpacing(self.res_manager.scale(20))
         
         # Top Bar
-        self.top_bar = TopBar(self.settings_manager, self.widget_registry, self.language_manager, self.res_manager)
+        with startup_profiler.phase("TopBar.populate"):
+            self.top_bar = TopBar(self.settings_manager, self.widget_registry, self.language_manager, self.res_manager)
         self.top_bar.home_clicked.connect(self.show_dashboard)
         self.top_bar.settings_clicked.connect(self.open_settings)
         main_layout.addWidget(self.top_bar)
@@ -115,17 +176,66 @@ class HubWindow(QMainWindow):
         main_layout.addWidget(self.stack)
         
         # 1. Dashboard View
-        self.dashboard = Dashboard(self.settings_manager, self.app_registry, self.language_manager, self.res_manager)
+        with startup_profiler.phase("Dashboard.populate"):
+            self.dashboard = Dashboard(self.settings_manager, self.app_registry, self.language_manager, self.res_manager)
         self.dashboard.app_launched.connect(self.launch_app)
         self.stack.addWidget(self.dashboard)
         
-        # 2. App View Container
-        self.app_container = QWidget()
-        self.app_layout = QVBoxLayout(self.app_container)
-        self.app_layout.setContentsMargins(0, 0, 0, 0)
-        self.stack.addWidget(self.app_container)
+        # 2. Apps get their own pages as they are launched
+        self.app_pages = {}
+
+    def apply_eviction_settings(self):
+        """Passes the app unloading limits from the settings on to the registry."""
+        eviction = self.settings_manager.get_app_eviction_settings()
+        max_instances = eviction.get("max_instances", 0)
+        idle_minutes = eviction.get("idle_minutes", 0)
+        self.app_registry.max_instances = max_instances if max_instances > 0 else None
+        self.app_registry.idle_timeout = idle_minutes * 60 if idle_minutes > 0 else None
 
+    def on_setting_changed(self, key_path, old_value, new_value):
+        """Applies settings that the hub itself is responsible for."""
+        if key_path.split(".")[0] == "app_eviction":
+            self.apply_eviction_settings()
 
+    def evict_idle_apps(self):
+        """
+        Unloads idle apps (never the one currently open) to keep memory in check.
+        """
+        protected = [self.active_app_id] if self.active_app_id else []
+        for app_id in self.app_registry.evict_idle(protected=protected):
+            self.remove_app_page(app_id)
+            self.dashboard.forget_app(app_id)
+            print(f"Unloaded idle app {app_id}")
+
+    def get_app_page(self, app_id, app_instance):
+        """
+        Returns the stack page of an app, adding it the first time.
+
+        Args:
+            app_id (str): The app.
+            app_instance (QWidget): The running app.
+
+        Returns:
+            int: The page index.
+        """
+        if self.app_pages.get(app_id) is not app_instance:
+            # New app, or it was unloaded and started again
+            self.remove_app_page(app_id)
+            app_instance.setWindowFlags(Qt.WindowType.Widget)
+            self.stack.addWidget(app_instance)
+            self.app_pages[app_id] = app_instance
+        return self.stack.indexOf(app_instance)
+
+    def remove_app_page(self, app_id):
+        """
+        Takes an app's page out of the stack (the app itself is not deleted).
+
+        Args:
+            app_id (str): The app.
+        """
+        page = self.app_pages.pop(app_id, None)
+        if page is not None and self.stack.indexOf(page) != -1:
+            self.stack.removeWidget(page)
 
     def launch_app(self, app_id):
         """
@@ -138,23 +248,21 @@ class HubWindow(QMainWindow):
         app_instance = self.app_registry.get_app_instance(app_id, self.language_manager)
         
         if app_instance:
-            # Clear previous app if any
-            if self.active_app:
-                self.app_layout.removeWidget(self.active_app)
-                self.active_app.setParent(None) 
-                self.active_app.hide()
-                self.active_app = None
+            self.settings_manager.record_app_launch(app_id)
+            self.dashboard.on_app_launched(app_id, app_instance)
 
             self.active_app = app_instance
-            self.active_app.setWindowFlags(Qt.WindowType.Widget)
-            
-            self.app_layout.addWidget(self.active_app)
-            self.active_app.show() 
-            
-            self.stack.setCurrentWidget(self.app_container)
+            self.active_app_id = app_id
+
+            index = self.get_app_page(app_id, app_instance)
+            self.launch_latency.start(app_id, app_instance)
+            self.stack.setCurrentIndex(index)
 
             self.top_bar.set_home_visible(True)
 
+            # Opening an app may have pushed us over the instance limit
+            self.evict_idle_apps()
+
     def show_dashboard(self):
         """
         Switches the view back to the main dashboard.
@@ -165,17 +273,55 @@ class HubWindow(QMainWindow):
 
 
 
+    def on_apps_changed(self, app_paths):
+        """
+        Reloads the apps whose folders changed on disk. Other apps keep running.
+
+        Args:
+            app_paths (List[str]): The changed app folders.
+        """
+        reopen = None
+        for app_path in app_paths:
+            app_id = self.app_registry.reload_app_dir(app_path)
+            if app_id is None:
+                continue
+            print(f"Reloaded app {app_id}")
+            if app_id == self.active_app_id:
+                reopen = app_id if self.stack.currentWidget() is self.active_app else None
+                self.active_app = None
+                self.active_app_id = None
+            self.remove_app_page(app_id)
+            self.dashboard.forget_app(app_id)
+            self.dashboard.mark_dirty(app_id)
+
+        self.dashboard.populate()
+        if reopen:
+            # The app was on screen, bring up the new version right away
+            self.launch_app(reopen)
+            if self.active_app_id != reopen:
+                self.show_dashboard()
+
+    def on_widgets_changed(self, widget_paths):
+        """
+        Reloads the widgets whose files changed and swaps them in the top bar.
+
+        Args:
+            widget_paths (List[str]): The changed widget files.
+        """
+        widget_ids = [self.widget_registry.reload_widget_file(path) for path in widget_paths]
+        print(f"Reloaded widgets {', '.join(widget_ids)}")
+        self.top_bar.reload_widgets(widget_ids)
+
     def open_settings(self):
         """
         Opens the settings dialog.
         """
-        dialog = SettingsDialog(self.settings_manager, self.app_registry, self.widget_registry, self.language_manager, self)
+        self.backup_manager.keep = self.settings_manager.get_backup_keep()
+        dialog = SettingsDialog(self.settings_manager, self.app_registry, self.widget_registry, self.language_manager, self,
+                                backup_manager=self.backup_manager)
         dialog.data_reset.connect(self.on_data_reset)
-        if dialog.exec():
-
-            # Refresh UI
-            self.top_bar.populate()
-            self.dashboard.populate()
+        # The top bar and dashboard follow the settings changes themselves
+        dialog.exec()
 
     def on_data_reset(self):
         """
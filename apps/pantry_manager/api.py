@@ -3,11 +3,36 @@ Product API Module.
 
 This module defines the interface and implementation for fetching product information
 from external APIs, specifically Open Food Facts.
+
+Answers are remembered, in memory and in the pantry database, so scanning a
+product again doesn't touch the network. Barcodes Open Food Facts doesn't
+know are remembered too, for a shorter time.
 """
 
+import time
+import threading
+from collections import OrderedDict
+
 import requests
 from .utils import extract_weight_or_volume
 
+HIT_TTL = 30 * 24 * 3600 # Seconds a found product is trusted
+MISS_TTL = 24 * 3600 # Seconds an unknown barcode stays unknown (it may get added)
+REQUEST_TIMEOUT = 5 # Seconds to wait for Open Food Facts
+
+NOT_FOUND = (None, None, None)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Returns the shared HTTP session, so lookups reuse one connection."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
 class ProductAPI:
     """
     Abstract base class for product information APIs.
@@ -27,10 +52,31 @@ class ProductAPI:
 class OpenFoodFactsAPI(ProductAPI):
     """
     Implementation of ProductAPI using the Open Food Facts API.
+
+    Looks in a small in-memory LRU first, then in the database's
+    'product_lookups' table, and only then asks Open Food Facts. Network
+    errors aren't remembered, so the next scan tries again.
+
+    Attributes:
+        db_manager (DatabaseManager, optional): Where answers are kept between runs.
+        hit_ttl (float): Seconds a found product is trusted.
+        miss_ttl (float): Seconds an unknown barcode stays unknown.
+        timeout (float): Seconds to wait for Open Food Facts.
     """
+    URL = "https://world.openfoodfacts.org/api/v0/product/{barcode}.json"
+    MEMORY_SIZE = 256 # Barcodes kept in memory
+
+    def __init__(self, db_manager=None, hit_ttl=HIT_TTL, miss_ttl=MISS_TTL, timeout=REQUEST_TIMEOUT):
+        self.db_manager = db_manager
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.timeout = timeout
+        self._memory = OrderedDict() # barcode -> (answer, expires at)
+        self._lock = threading.Lock() # Lookups run on worker threads
+
     def get_product_info(self, barcode):
         """
-        Fetches product details from Open Food Facts.
+        Fetches product details from Open Food Facts, or from what it answered before.
 
         Args:
             barcode (str): The product barcode.
@@ -39,17 +85,77 @@ class OpenFoodFactsAPI(ProductAPI):
             tuple: A tuple containing (name, category, weight_volume).
                    Returns (None, None, None) if not found or on error.
         """
-        url = f"https://world.openfoodfacts.org/api/v0/product/{barcode}.json"
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 1:  # Produkt gefunden
-                    product = data.get('product', {})
-                    name = product.get('product_name', 'Unbekannt')
-                    category = product.get('categories', 'Unbekannt').split(',')[0] if product.get('categories') else 'Unbekannt'
-                    gewicht_volumen = extract_weight_or_volume(product)
-                    return name, category, gewicht_volumen
-        except requests.RequestException:
-            pass
-        return None, None, None
+        answer = self._from_memory(barcode)
+        if answer is not None:
+            return answer
+
+        answer, fetched_at = self._from_database(barcode)
+        if answer is None:
+            try:
+                answer = self.fetch(barcode)
+            except (requests.RequestException, ValueError) as e:
+                print(f"Open Food Facts lookup failed for {barcode}: {e}")
+                return NOT_FOUND
+            fetched_at = time.time()
+            if self.db_manager:
+                self.db_manager.save_product_lookup(barcode, None if answer == NOT_FOUND else answer, fetched_at)
+
+        self._remember(barcode, answer, fetched_at)
+        return answer
+
+    def fetch(self, barcode):
+        """
+        Asks Open Food Facts, without looking at what it answered before.
+
+        Returns:
+            tuple: (name, category, weight_volume), or NOT_FOUND if the barcode is unknown.
+
+        Raises:
+            requests.RequestException: If Open Food Facts can't be reached or answers with an error.
+        """
+        response = get_session().get(self.URL.format(barcode=barcode), timeout=self.timeout)
+        if response.status_code == 404:
+            return NOT_FOUND
+        response.raise_for_status()
+        data = response.json()
+        if data.get('status') != 1:  # Produkt nicht gefunden
+            return NOT_FOUND
+        product = data.get('product', {})
+        name = product.get('product_name', 'Unbekannt')
+        category = product.get('categories', 'Unbekannt').split(',')[0] if product.get('categories') else 'Unbekannt'
+        gewicht_volumen = extract_weight_or_volume(product)
+        return name, category, gewicht_volumen
+
+    def _ttl(self, answer):
+        return self.miss_ttl if answer == NOT_FOUND else self.hit_ttl
+
+    def _from_memory(self, barcode):
+        with self._lock:
+            cached = self._memory.get(barcode)
+            if cached is None:
+                return None
+            answer, expires_at = cached
+            if time.time() >= expires_at:
+                del self._memory[barcode]
+                return None
+            self._memory.move_to_end(barcode)
+            return answer
+
+    def _from_database(self, barcode):
+        """Returns the remembered answer and when it was fetched, or (None, None) if there is none (or it is too old)."""
+        if not self.db_manager:
+            return None, None
+        lookup = self.db_manager.get_product_lookup(barcode)
+        if lookup is None:
+            return None, None
+        answer = (lookup.name, lookup.category, lookup.weight_volume) if lookup.found else NOT_FOUND
+        if time.time() >= lookup.fetched_at + self._ttl(answer):
+            return None, None
+        return answer, lookup.fetched_at
+
+    def _remember(self, barcode, answer, fetched_at):
+        with self._lock:
+            self._memory[barcode] = (answer, fetched_at + self._ttl(answer))
+            self._memory.move_to_end(barcode)
+            while len(self._memory) > self.MEMORY_SIZE:
+                self._memory.popitem(last=False)
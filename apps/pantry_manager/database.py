@@ -2,6 +2,11 @@ import sqlite3
 import shutil
 import os
 from datetime import datetime
+from typing import NamedTuple, Optional
+
+from src.core.database import Database, get_database
+from src.core.paths import get_db_path
+from src.core.migrations import run_migrations
 
 """
 Pantry Database Module.
@@ -11,115 +16,301 @@ It handles schema initialization, migrations, and all CRUD operations for
 products, inventory, and locations.
 """
 
+# Expiry status per entry
+STATUS_UNKNOWN, STATUS_OK, STATUS_WARNING, STATUS_EXPIRED = -1, 0, 1, 2
+WARNING_DAYS = 30 # Default for how soon an entry counts as expiring
+
+class InventoryEntry(NamedTuple):
+    """An inventory row joined with its product and location."""
+    id: int
+    barcode: str
+    name: str
+    category: str
+    expiry_date: str # YYYY-MM-DD
+    quantity: int
+    weight_volume: str
+    location_name: str
+    days_left: Optional[int] # Days until the expiry date, None if there is no valid date
+    status: int # One of the STATUS_ constants
+
+class Location(NamedTuple):
+    """A row of 'locations'."""
+    id: int
+    name: str
+
+class ProductInfo(NamedTuple):
+    """What we know about a product, used to auto-fill forms."""
+    name: str
+    category: str
+    weight_volume: str
+
+class ProductLookup(NamedTuple):
+    """A remembered Open Food Facts answer (a row of 'product_lookups')."""
+    found: int # 0 if Open Food Facts doesn't know the barcode
+    name: str
+    category: str
+    weight_volume: str
+    fetched_at: float # Unix time
+
+# Whole days from today (local time) to the expiry date. julianday() is NULL for a missing or invalid date.
+DAYS_LEFT = "CAST(julianday(i.expiry_date) - julianday('now', 'localtime', 'start of day') AS INTEGER)"
+
+# Takes one parameter: how many days ahead an entry counts as expiring (STATUS_WARNING)
+INVENTORY_QUERY = f'''
+    SELECT 
+        i.id, 
+        p.barcode, 
+        p.name, 
+        p.category, 
+        i.expiry_date, 
+        i.quantity, 
+        p.weight_volume,
+        l.name AS location_name,
+        {DAYS_LEFT} AS days_left,
+        CASE
+            WHEN julianday(i.expiry_date) IS NULL THEN {STATUS_UNKNOWN}
+            WHEN {DAYS_LEFT} < 0 THEN {STATUS_EXPIRED}
+            WHEN {DAYS_LEFT} <= ? THEN {STATUS_WARNING}
+            ELSE {STATUS_OK}
+        END AS status
+    FROM inventory i
+    JOIN products p ON i.barcode = p.barcode
+    JOIN locations l ON i.location_id = l.id
+'''
+
+def _create_tables(cursor):
+    """Creates the products/locations/inventory structure."""
+    # Products table: Static data about the item
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS products (
+            barcode TEXT PRIMARY KEY,
+            name TEXT,
+            category TEXT,
+            weight_volume TEXT
+        )
+    ''')
+
+    # Locations table: Where items are stored
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS locations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE,
+            description TEXT
+        )
+    ''')
+
+    # Inventory table: Specific instances of products
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            barcode TEXT,
+            location_id INTEGER,
+            expiry_date TEXT,
+            quantity INTEGER,
+            FOREIGN KEY(barcode) REFERENCES products(barcode),
+            FOREIGN KEY(location_id) REFERENCES locations(id)
+        )
+    ''')
+
+    # Ensure a default location exists
+    cursor.execute("INSERT OR IGNORE INTO locations (name, description) VALUES (?, ?)",
+                   ("Standard", "Standard Lagerort"))
+
+def _migrate_data(cursor):
+    """Migrates data from the old 'lebensmittel' table to the new structure."""
+    # 1. Create new tables
+    _create_tables(cursor)
+
+    # 2. Get default location ID
+    cursor.execute("SELECT id FROM locations WHERE name = 'Standard'")
+    default_location_id = cursor.fetchone()[0]
+
+    # 3. Fetch old data
+    cursor.execute("SELECT barcode, name, kategorie, ablaufdatum, anzahl, gewicht_volumen FROM lebensmittel")
+    old_items = cursor.fetchall()
+
+    for item in old_items:
+        barcode, name, category, expiry, quantity, weight = item
+
+        # Insert into products (ignore if already exists)
+        cursor.execute('''
+            INSERT OR IGNORE INTO products (barcode, name, category, weight_volume)
+            VALUES (?, ?, ?, ?)
+        ''', (barcode, name, category, weight))
+
+        # Insert into inventory
+        cursor.execute('''
+            INSERT INTO inventory (barcode, location_id, expiry_date, quantity)
+            VALUES (?, ?, ?, ?)
+        ''', (barcode, default_location_id, expiry, quantity))
+
+    # 4. Rename old table to backup (optional, but good for safety)
+    cursor.execute("ALTER TABLE lebensmittel RENAME TO lebensmittel_backup_v1")
+
+def migrate_v1_inventory_schema(conn):
+    """
+    Schema v1: products, locations and inventory.
+
+    Databases from before the split still have the flat 'lebensmittel' table,
+    which gets imported into the new tables here.
+    """
+    cursor = conn.cursor()
+
+    # Check if we need to migrate (if old table exists and new ones don't)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='lebensmittel'")
+    old_table_exists = cursor.fetchone() is not None
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='products'")
+    new_schema_exists = cursor.fetchone() is not None
+
+    if old_table_exists and not new_schema_exists:
+        print("Migrating database to new schema...")
+        _migrate_data(cursor)
+    else:
+        _create_tables(cursor)
+
+def migrate_v2_inventory_indexes(conn):
+    """
+    Schema v2: indexes for the inventory lookups.
+
+    An entry is identified by (barcode, location, expiry), which becomes a
+    unique key so adding stock is a single UPSERT. Entries that were stored
+    twice under the same key are merged first. Expiry and location get their
+    own indexes for the expiring list and the "is this location empty" check.
+    """
+    key_set = "barcode IS NOT NULL AND location_id IS NOT NULL AND expiry_date IS NOT NULL"
+    conn.execute(f'''
+        UPDATE inventory SET quantity = (
+            SELECT SUM(other.quantity) FROM inventory other
+            WHERE other.barcode = inventory.barcode
+            AND other.location_id = inventory.location_id
+            AND other.expiry_date = inventory.expiry_date
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM inventory WHERE {key_set}
+            GROUP BY barcode, location_id, expiry_date HAVING COUNT(*) > 1
+        )
+    ''')
+    conn.execute(f'''
+        DELETE FROM inventory
+        WHERE {key_set} AND id NOT IN (
+            SELECT MIN(id) FROM inventory WHERE {key_set}
+            GROUP BY barcode, location_id, expiry_date
+        )
+    ''')
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_item ON inventory (barcode, location_id, expiry_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_inventory_expiry ON inventory (expiry_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_inventory_location ON inventory (location_id)")
+
+def migrate_v3_product_search(conn):
+    """
+    Schema v3: a full text index over product name, category and barcode.
+
+    'products_fts' keeps its own copy of those columns (products has no
+    stable rowid to point to, VACUUM may renumber it), kept in sync by
+    triggers. The trigram tokenizer matches any part of a word and gives
+    `search_products` something to go on for typos. Without FTS5 (or the
+    trigram tokenizer, SQLite 3.34+) the index is left out and search falls
+    back to LIKE.
+    """
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(barcode, name, category, tokenize='trigram')")
+    except sqlite3.OperationalError as e:
+        print(f"Product search index not available, searching without it: {e}")
+        return
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts (barcode, name, category) VALUES (new.barcode, new.name, new.category);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+            DELETE FROM products_fts WHERE barcode = old.barcode;
+        END
+    ''')
+    # add_product rewrites the product every time; only touch the index if something changed
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF barcode, name, category ON products
+        WHEN old.barcode IS NOT new.barcode OR old.name IS NOT new.name OR old.category IS NOT new.category BEGIN
+            DELETE FROM products_fts WHERE barcode = old.barcode;
+            INSERT INTO products_fts (barcode, name, category) VALUES (new.barcode, new.name, new.category);
+        END
+    ''')
+    conn.execute("DELETE FROM products_fts")
+    conn.execute("INSERT INTO products_fts (barcode, name, category) SELECT barcode, name, category FROM products")
+
+def migrate_v4_product_lookups(conn):
+    """
+    Schema v4: remembers what Open Food Facts answered for a barcode,
+    including that it doesn't know it (found = 0), so scanning the same
+    product again doesn't need the network. See `OpenFoodFactsAPI`.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS product_lookups (
+            barcode TEXT PRIMARY KEY,
+            found INTEGER NOT NULL,
+            name TEXT,
+            category TEXT,
+            weight_volume TEXT,
+            fetched_at REAL NOT NULL
+        )
+    ''')
+
+# Schema migrations, oldest first. Never edit one that shipped; append a new one.
+MIGRATIONS = [
+    migrate_v1_inventory_schema,
+    migrate_v2_inventory_indexes,
+    migrate_v3_product_search,
+    migrate_v4_product_lookups,
+]
+
+def trigrams(text: str) -> set:
+    """The set of 3-character pieces of a text, ignoring case."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def fts_phrase(text: str) -> str:
+    """Quotes text as a single FTS5 string."""
+    return '"' + text.replace('"', '""') + '"'
+
 class DatabaseManager:
     """
     Manages database connections and operations for the Pantry Manager.
     """
-    def __init__(self, db_name=None):
+    def __init__(self, db_name=None, warning_days=WARNING_DAYS):
         """
         Initializes the DatabaseManager.
 
         Args:
             db_name (str, optional): Path to the database file. Defaults to 'lebensmittel.db'.
+            warning_days (int): Entries expiring within this many days get STATUS_WARNING.
         """
         if db_name is None:
-            # Go up 3 levels from apps/pantry_manager/database.py to root, then into data
-            db_name = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'lebensmittel.db')
+            db_name = get_db_path('lebensmittel.db')
         self.db_name = db_name
+        self.warning_days = warning_days
         self.initialize_database()
 
+    @property
+    def db(self) -> Database:
+        """
+        The shared pool for the pantry file, looked up on every use like `get_db()`
+        in the other apps. A reset or restore closes it; holding on to the old one
+        would quietly reopen the deleted or replaced file.
+        """
+        db = get_database(self.db_name)
+        run_migrations(db, MIGRATIONS) # Only checks the file once per pool
+        return db
+
     def get_connection(self):
-        """Creates and returns a new database connection."""
-        return sqlite3.connect(self.db_name)
+        """Returns this thread's pooled connection (autocommit; use `db.transaction()` to write)."""
+        return self.db.connection()
 
     def initialize_database(self):
-        """Initialize the database with the new schema. Handles migration if needed."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if we need to migrate (if old table exists and new ones don't)
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='lebensmittel'")
-            old_table_exists = cursor.fetchone() is not None
-            
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='products'")
-            new_schema_exists = cursor.fetchone() is not None
-
-            if old_table_exists and not new_schema_exists:
-                print("Migrating database to new schema...")
-                self._migrate_data(conn, cursor)
-            else:
-                self._create_tables(cursor)
-            
-            conn.commit()
-
-    def _create_tables(self, cursor):
-        """Creates the new table structure."""
-        # Products table: Static data about the item
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                barcode TEXT PRIMARY KEY,
-                name TEXT,
-                category TEXT,
-                weight_volume TEXT
-            )
-        ''')
-
-        # Locations table: Where items are stored
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS locations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE,
-                description TEXT
-            )
-        ''')
-
-        # Inventory table: Specific instances of products
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS inventory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                barcode TEXT,
-                location_id INTEGER,
-                expiry_date TEXT,
-                quantity INTEGER,
-                FOREIGN KEY(barcode) REFERENCES products(barcode),
-                FOREIGN KEY(location_id) REFERENCES locations(id)
-            )
-        ''')
-        
-        # Ensure a default location exists
-        cursor.execute("INSERT OR IGNORE INTO locations (name, description) VALUES (?, ?)", 
-                       ("Standard", "Standard Lagerort"))
-
-    def _migrate_data(self, conn, cursor):
-        """Migrates data from the old 'lebensmittel' table to the new structure."""
-        # 1. Create new tables
-        self._create_tables(cursor)
-        
-        # 2. Get default location ID
-        cursor.execute("SELECT id FROM locations WHERE name = 'Standard'")
-        default_location_id = cursor.fetchone()[0]
-
-        # 3. Fetch old data
-        cursor.execute("SELECT barcode, name, kategorie, ablaufdatum, anzahl, gewicht_volumen FROM lebensmittel")
-        old_items = cursor.fetchall()
-
-        for item in old_items:
-            barcode, name, category, expiry, quantity, weight = item
-            
-            # Insert into products (ignore if already exists)
-            cursor.execute('''
-                INSERT OR IGNORE INTO products (barcode, name, category, weight_volume)
-                VALUES (?, ?, ?, ?)
-            ''', (barcode, name, category, weight))
-            
-            # Insert into inventory
-            cursor.execute('''
-                INSERT INTO inventory (barcode, location_id, expiry_date, quantity)
-                VALUES (?, ?, ?, ?)
-            ''', (barcode, default_location_id, expiry, quantity))
-
-        # 4. Rename old table to backup (optional, but good for safety)
-        cursor.execute("ALTER TABLE lebensmittel RENAME TO lebensmittel_backup_v1")
+        """Brings the database up to the current schema (a no-op once it is)."""
+        self.db
 
     # --- Product & Inventory Management ---
 
@@ -139,9 +330,9 @@ class DatabaseManager:
         Returns:
             tuple: (bool, str) indicating success/failure and a message.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            try:
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
                 # 1. Ensure product exists
                 cursor.execute('''
                     INSERT INTO products (barcode, name, category, weight_volume)
@@ -151,58 +342,42 @@ class DatabaseManager:
                         category=excluded.category,
                         weight_volume=excluded.weight_volume
                 ''', (barcode, name, category, weight))
-
-                # 2. Add to inventory (or update if exactly same item in same location/expiry exists?)
-                # For now, let's just add a new row for every entry to allow distinct expiries.
-                # Or we could group by (barcode, location, expiry). Let's group.
-                
+                self.db.record_change('products', barcode, 'update')
+
+                # 2. Add to inventory. The same product in the same location with
+                # the same expiry is one entry (idx_inventory_item), so stock is added up.
+                # No RETURNING here, that needs SQLite 3.35; BEGIN IMMEDIATE holds the
+                # write lock, so the row can't change between the lookup and the upsert.
+                cursor.execute(
+                    "SELECT id FROM inventory WHERE barcode = ? AND location_id = ? AND expiry_date = ?",
+                    (barcode, location_id, expiry))
+                existing = cursor.fetchone()
                 cursor.execute('''
-                    SELECT id, quantity FROM inventory 
-                    WHERE barcode = ? AND location_id = ? AND expiry_date = ?
-                ''', (barcode, location_id, expiry))
-                existing_entry = cursor.fetchone()
-
-                if existing_entry:
-                    new_qty = existing_entry[1] + quantity
-                    cursor.execute('UPDATE inventory SET quantity = ? WHERE id = ?', (new_qty, existing_entry[0]))
+                    INSERT INTO inventory (barcode, location_id, expiry_date, quantity)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(barcode, location_id, expiry_date) DO UPDATE SET
+                        quantity = quantity + excluded.quantity
+                ''', (barcode, location_id, expiry, quantity))
+
+                if existing:
+                    self.db.record_change('inventory', existing[0], 'update')
                     msg = f"Anzahl für '{name}' erhöht."
                 else:
-                    cursor.execute('''
-                        INSERT INTO inventory (barcode, location_id, expiry_date, quantity)
-                        VALUES (?, ?, ?, ?)
-                    ''', (barcode, location_id, expiry, quantity))
+                    self.db.record_change('inventory', cursor.lastrowid, 'insert')
                     msg = f"'{name}' hinzugefügt."
 
-                conn.commit()
-                return True, msg
-            except Exception as e:
-                return False, str(e)
+            return True, msg
+        except Exception as e:
+            return False, str(e)
 
     def get_inventory_with_details(self):
         """
         Retrieves full inventory details joining products and locations.
 
         Returns:
-            list: A list of tuples containing inventory details.
+            List[InventoryEntry]: Every inventory entry, by product name.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT 
-                    i.id, 
-                    p.barcode, 
-                    p.name, 
-                    p.category, 
-                    i.expiry_date, 
-                    i.quantity, 
-                    p.weight_volume,
-                    l.name as location_name
-                FROM inventory i
-                JOIN products p ON i.barcode = p.barcode
-                JOIN locations l ON i.location_id = l.id
-                ORDER BY p.name
-            ''')
-            return cursor.fetchall()
+        return self.db.fetch_records(InventoryEntry, *self._inventory_query())
 
     def delete_inventory_item(self, inventory_id, quantity_to_remove):
         """
@@ -215,7 +390,7 @@ class DatabaseManager:
         Returns:
             bool: True if successful, False otherwise.
         """
-        with self.get_connection() as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT quantity FROM inventory WHERE id = ?", (inventory_id,))
             result = cursor.fetchone()
@@ -227,11 +402,12 @@ class DatabaseManager:
             
             if quantity_to_remove >= current_qty:
                 cursor.execute("DELETE FROM inventory WHERE id = ?", (inventory_id,))
+                self.db.record_change('inventory', inventory_id, 'delete')
             else:
                 cursor.execute("UPDATE inventory SET quantity = quantity - ? WHERE id = ?", 
                                (quantity_to_remove, inventory_id))
+                self.db.record_change('inventory', inventory_id, 'update')
             
-            conn.commit()
             return True
 
     def update_inventory_item(self, inventory_id, location_id, expiry_date, quantity):
@@ -247,59 +423,169 @@ class DatabaseManager:
         Returns:
             tuple: (bool, str) indicating success/failure and a message.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute('''
+        try:
+            with self.db.transaction() as conn:
+                # Moving onto an entry with the same product, location and expiry
+                # (idx_inventory_item) merges the two instead of failing
+                existing = conn.execute('''
+                    SELECT other.id FROM inventory AS edited
+                    JOIN inventory AS other ON other.barcode = edited.barcode
+                        AND other.location_id = ? AND other.expiry_date = ? AND other.id != edited.id
+                    WHERE edited.id = ?
+                ''', (location_id, expiry_date, inventory_id)).fetchone()
+                if existing:
+                    conn.execute("UPDATE inventory SET quantity = quantity + ? WHERE id = ?", (quantity, existing[0]))
+                    conn.execute("DELETE FROM inventory WHERE id = ?", (inventory_id,))
+                    self.db.record_change('inventory', existing[0], 'update')
+                    self.db.record_change('inventory', inventory_id, 'delete')
+                    return True, "Eintrag zusammengeführt."
+                conn.execute('''
                     UPDATE inventory 
                     SET location_id = ?, expiry_date = ?, quantity = ?
                     WHERE id = ?
                 ''', (location_id, expiry_date, quantity, inventory_id))
-                conn.commit()
-                return True, "Eintrag aktualisiert."
-            except Exception as e:
-                return False, str(e)
+                self.db.record_change('inventory', inventory_id, 'update')
+            return True, "Eintrag aktualisiert."
+        except Exception as e:
+            return False, str(e)
 
-    def get_expiring_inventory(self, days_threshold=30):
+    def get_expiring_inventory(self, days_threshold=None):
         """
         Retrieves inventory items expiring within the given number of days.
 
         Args:
-            days_threshold (int): The number of days to look ahead. Defaults to 30.
+            days_threshold (int, optional): The number of days to look ahead. Defaults to `warning_days`.
 
         Returns:
-            list: A list of tuples containing expiring inventory details.
+            List[InventoryEntry]: The expiring entries, soonest first.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            # Calculate the target date
-            # SQLite date('now', '+30 days')
-            cursor.execute(f'''
-                SELECT 
-                    i.id, 
-                    p.barcode, 
-                    p.name, 
-                    p.category, 
-                    i.expiry_date, 
-                    i.quantity, 
-                    p.weight_volume,
-                    l.name as location_name
-                FROM inventory i
-                JOIN products p ON i.barcode = p.barcode
-                JOIN locations l ON i.location_id = l.id
-                WHERE i.expiry_date <= date('now', '+{days_threshold} days')
-                ORDER BY i.expiry_date ASC
-            ''')
-            return cursor.fetchall()
+        if days_threshold is None:
+            days_threshold = self.warning_days
+        return self.db.fetch_records(InventoryEntry, *self._inventory_query(days_threshold))
+
+    def get_inventory_cursor(self, days_threshold=None):
+        """
+        Runs the inventory query and returns the cursor, so big inventories
+        can be read a page at a time.
+
+        Args:
+            days_threshold (int, optional): Only entries expiring within this many days.
+
+        Returns:
+            sqlite3.Cursor: Rows in `InventoryEntry` field order.
+        """
+        return self.get_connection().execute(*self._inventory_query(days_threshold))
+
+    def get_inventory_entries(self, inventory_id=None, barcode=None, days_threshold=None):
+        """
+        Retrieves single entries, to update a view without reloading everything.
+
+        Args:
+            inventory_id (int, optional): Just this entry.
+            barcode (str, optional): All entries of this product.
+            days_threshold (int, optional): Only if expiring within this many days.
+
+        Returns:
+            List[InventoryEntry]: The matching entries (none if deleted or filtered out).
+        """
+        conditions, params = [], []
+        if inventory_id is not None:
+            conditions.append("i.id = ?")
+            params.append(inventory_id)
+        if barcode is not None:
+            conditions.append("i.barcode = ?")
+            params.append(barcode)
+        return self.db.fetch_records(InventoryEntry, *self._inventory_query(days_threshold, conditions, params))
+
+    def _inventory_query(self, days_threshold=None, conditions=(), params=()):
+        """Builds the inventory query: everything by name, or what expires soon by expiry date."""
+        conditions, params = list(conditions), [self.warning_days] + list(params)
+        if days_threshold is not None:
+            conditions.append("i.expiry_date <= date('now', 'localtime', ?)")
+            params.append(f"+{int(days_threshold)} days")
+        sql = INVENTORY_QUERY
+        if conditions:
+            sql += "WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY i.expiry_date ASC" if days_threshold is not None else " ORDER BY p.name"
+        return sql, params
+
+    # --- Search ---
+
+    SEARCH_CANDIDATES = 200
+    TYPO_SIMILARITY = 0.5 # Share of a word's trigrams a product must contain to count as a typo match
+
+    def search_products(self, text):
+        """
+        Finds the products matching a search, for the search bar.
+
+        Every word has to appear in the name, category or barcode, at the
+        start or anywhere inside ("tom" finds "Tomato Sauce"). Words of three
+        or more letters may also be misspelt a little ("tomatoe", "milc"):
+        a product matches if it contains at least half of the word's trigrams.
+        Barcodes have to be typed exactly.
+
+        Args:
+            text (str): The search text.
+
+        Returns:
+            List[str]: Barcodes of the matching products.
+        """
+        words = text.lower().split()
+        if not words:
+            return []
+        if not self.has_search_index():
+            return self._search_like(words)
+
+        long_words = [w for w in words if len(w) >= 3]
+        short_words = [w for w in words if len(w) < 3]
+
+        # Exact substring matches
+        conditions, params = [], []
+        if long_words:
+            conditions.append("products_fts MATCH ?")
+            params.append(" AND ".join(fts_phrase(w) for w in long_words))
+        for word in short_words:
+            conditions.append("(name LIKE ? OR category LIKE ? OR barcode LIKE ?)")
+            params += [f"%{word}%"] * 3
+        matches = [row[0] for row in self.db.fetch_all(
+            f"SELECT barcode FROM products_fts WHERE {' AND '.join(conditions)}", params)]
+
+        # Typo tolerant matches: anything sharing trigrams, checked word by word.
+        # Numbers (barcodes) have to match exactly.
+        if long_words and not any(w.isdigit() for w in long_words):
+            query = " OR ".join(fts_phrase(t) for t in set().union(*(trigrams(w) for w in long_words)))
+            candidates = self.db.fetch_all(
+                "SELECT barcode, name, category FROM products_fts WHERE products_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, self.SEARCH_CANDIDATES))
+            seen = set(matches)
+            for barcode, name, category in candidates:
+                if barcode in seen:
+                    continue
+                haystack = " ".join(value or "" for value in (name, category, barcode)).lower()
+                found = trigrams(haystack)
+                if all(word in haystack for word in short_words) and all(
+                        len(trigrams(w) & found) >= self.TYPO_SIMILARITY * len(trigrams(w)) for w in long_words):
+                    matches.append(barcode)
+                    seen.add(barcode)
+        return matches
+
+    def has_search_index(self):
+        """Whether the full text index exists (see `migrate_v3_product_search`)."""
+        if getattr(self, "_has_search_index", None) is None:
+            self._has_search_index = self.db.fetch_one(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'") is not None
+        return self._has_search_index
+
+    def _search_like(self, words):
+        conditions = " AND ".join("(name LIKE ? OR category LIKE ? OR barcode LIKE ?)" for _ in words)
+        params = [f"%{word}%" for word in words for _ in range(3)]
+        return [row[0] for row in self.db.fetch_all(f"SELECT barcode FROM products WHERE {conditions}", params)]
 
     # --- Location Management ---
 
     def get_locations(self):
-        """Retrieves all storage locations."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM locations")
-            return cursor.fetchall()
+        """Retrieves all storage locations as `Location` records."""
+        return self.db.fetch_records(Location, "SELECT id, name FROM locations")
 
     def add_location(self, name):
         """
@@ -311,14 +597,12 @@ class DatabaseManager:
         Returns:
             tuple: (bool, str) indicating success/failure and a message.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute("INSERT INTO locations (name, description) VALUES (?, '')", (name,))
-                conn.commit()
-                return True, "Ort hinzugefügt."
-            except sqlite3.IntegrityError:
-                return False, "Ort existiert bereits."
+        try:
+            cursor = self.db.execute("INSERT INTO locations (name, description) VALUES (?, '')", (name,))
+            self.db.record_change('locations', cursor.lastrowid, 'insert')
+            return True, "Ort hinzugefügt."
+        except sqlite3.IntegrityError:
+            return False, "Ort existiert bereits."
 
     def delete_location(self, location_id):
         """
@@ -330,7 +614,7 @@ class DatabaseManager:
         Returns:
             tuple: (bool, str) indicating success/failure and a message.
         """
-        with self.get_connection() as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             # Check if used
             cursor.execute("SELECT COUNT(*) FROM inventory WHERE location_id = ?", (location_id,))
@@ -338,7 +622,7 @@ class DatabaseManager:
                 return False, "Ort ist nicht leer."
             
             cursor.execute("DELETE FROM locations WHERE id = ?", (location_id,))
-            conn.commit()
+            self.db.record_change('locations', location_id, 'delete')
             return True, "Ort gelöscht."
 
     def get_product_by_barcode(self, barcode):
@@ -349,9 +633,35 @@ class DatabaseManager:
             barcode (str): The product barcode.
 
         Returns:
-            tuple: (name, category, weight_volume) or None.
+            ProductInfo: The product's details, or None if it is unknown.
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, category, weight_volume FROM products WHERE barcode = ?", (barcode,))
-            return cursor.fetchone()
+        return self.db.fetch_record(ProductInfo, "SELECT name, category, weight_volume FROM products WHERE barcode = ?", (barcode,))
+
+    def get_product_lookup(self, barcode):
+        """
+        Retrieves what Open Food Facts answered for a barcode the last time.
+
+        Args:
+            barcode (str): The product barcode.
+
+        Returns:
+            ProductLookup: The remembered answer, or None if it was never looked up.
+        """
+        return self.db.fetch_record(ProductLookup, '''
+            SELECT found, name, category, weight_volume, fetched_at FROM product_lookups WHERE barcode = ?
+        ''', (barcode,))
+
+    def save_product_lookup(self, barcode, info, fetched_at):
+        """
+        Remembers an Open Food Facts answer, replacing an older one.
+
+        Args:
+            barcode (str): The product barcode.
+            info (ProductInfo): What was found, or None if the barcode is unknown.
+            fetched_at (float): When it was asked (Unix time).
+        """
+        name, category, weight = info if info else (None, None, None)
+        self.db.execute('''
+            INSERT OR REPLACE INTO product_lookups (barcode, found, name, category, weight_volume, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (barcode, int(info is not None), name, category, weight, fetched_at))
@@ -0,0 +1,309 @@
+"""
+Pantry Inventory Model Module.
+
+The data behind the pantry's inventory table. Entries are kept column by
+column instead of as one object (or one table item per cell) per row. The
+whole result is read on a worker thread; only handing rows to the view is
+paged, so the view creates them a page at a time as it scrolls down. After a
+change, single rows are patched in place instead of reloading everything.
+
+Sorting and the search results are applied by `InventoryFilterProxy` on top.
+Rows are colored by `ExpiryDelegate`, from the expiry status the query worked
+out (see `INVENTORY_QUERY`).
+"""
+
+from array import array
+from typing import List
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QStyledItemDelegate
+
+from .database import InventoryEntry, STATUS_UNKNOWN, STATUS_OK, STATUS_WARNING, STATUS_EXPIRED
+
+FIELDS = InventoryEntry._fields
+COLUMNS = FIELDS[:FIELDS.index("days_left")] # The fields shown in the table
+BARCODE_COLUMN = FIELDS.index("barcode")
+STATUS_COLUMN = FIELDS.index("status")
+
+STATUS_ROLE = Qt.ItemDataRole.UserRole + 1 # The row's expiry status, for the delegate
+
+STATUS_COLORS = {
+    STATUS_EXPIRED: QColor("#ff5555"), # Red for expired
+    STATUS_WARNING: QColor("#f1fa8c"), # Yellow for warning
+}
+
+class InventoryColumns:
+    """
+    Inventory entries stored column by column.
+
+    Ids and expiry states are packed into arrays. Columns with few distinct
+    values (category, expiry, weight, location) share one string object per
+    value instead of one per row.
+
+    Attributes:
+        columns (List): One sequence per `InventoryEntry` field.
+    """
+    SHARED_FIELDS = ("category", "expiry_date", "weight_volume", "location_name")
+    ARRAY_TYPES = {"id": "q", "status": "b"}
+
+    def __init__(self):
+        self.columns = [array(self.ARRAY_TYPES[field]) if field in self.ARRAY_TYPES else [] for field in FIELDS]
+        self._shared = {FIELDS.index(field): {} for field in self.SHARED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    @property
+    def status(self) -> array:
+        """The expiry status of each entry."""
+        return self.columns[STATUS_COLUMN]
+
+    def _values(self, entry) -> list:
+        values = list(entry)
+        for col, pool in self._shared.items():
+            values[col] = pool.setdefault(values[col], values[col])
+        return values
+
+    def extend(self, rows):
+        """Appends rows (tuples in `InventoryEntry` field order)."""
+        for row in rows:
+            for column, value in zip(self.columns, self._values(row)):
+                column.append(value)
+
+    def insert(self, row: int, entry: InventoryEntry):
+        for column, value in zip(self.columns, self._values(entry)):
+            column.insert(row, value)
+
+    def replace(self, row: int, entry: InventoryEntry):
+        for column, value in zip(self.columns, self._values(entry)):
+            column[row] = value
+
+    def remove(self, row: int):
+        for column in self.columns:
+            del column[row]
+
+    def entry(self, row: int) -> InventoryEntry:
+        return InventoryEntry._make(column[row] for column in self.columns)
+
+    def find(self, inventory_id: int) -> int:
+        """Returns the row of an entry, or -1."""
+        try:
+            return self.columns[0].index(inventory_id)
+        except ValueError:
+            return -1
+
+def load_inventory(db_manager, days_threshold: int = None, page_size: int = 500) -> InventoryColumns:
+    """
+    Reads the whole inventory into columns. Runs on a worker thread.
+
+    Every matching row is loaded; the cursor is only drained in batches so the
+    row tuples of one batch at a time are alive next to the compact columns.
+    The view's paging (`InventoryModel.fetchMore`) works on the loaded data,
+    since sorting and searching in the proxy need all rows anyway.
+
+    Args:
+        db_manager (DatabaseManager): The pantry database.
+        days_threshold (int, optional): Only entries expiring within this many days.
+        page_size (int): Rows taken from the cursor per batch.
+    """
+    data = InventoryColumns()
+    cursor = db_manager.get_inventory_cursor(days_threshold)
+    while True:
+        rows = cursor.fetchmany(page_size)
+        if not rows:
+            break
+        data.extend(rows)
+    return data
+
+class InventoryModel(QAbstractTableModel):
+    """
+    Table model over `InventoryColumns`, showing the `COLUMNS` fields.
+
+    Rows are handed to the view in pages of `PAGE_SIZE` through
+    `canFetchMore`/`fetchMore`. That pages the view, not the database:
+    `data_store` already holds every entry.
+
+    Attributes:
+        data_store (InventoryColumns): All loaded entries, fetched or not.
+        fetched (int): How many of them the view knows about.
+        order_field (str): The field the entries are sorted by (as the query sorts them).
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data_store = InventoryColumns()
+        self.fetched = 0
+        self.order_field = "name"
+        self.headers = list(COLUMNS)
+
+    # --- Loading ---
+
+    def set_data(self, data: InventoryColumns, order_field: str = "name"):
+        """Replaces everything with freshly loaded entries."""
+        self.beginResetModel()
+        self.data_store = data
+        self.order_field = order_field
+        self.fetched = min(len(data), self.PAGE_SIZE)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.fetched < len(self.data_store)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._fetch(self.PAGE_SIZE)
+
+    def fetch_all(self):
+        """Hands every remaining entry to the view (needed to sort or search all of them)."""
+        self._fetch(len(self.data_store) - self.fetched)
+
+    def _fetch(self, count):
+        count = min(count, len(self.data_store) - self.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.fetched
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.data_store.columns[col][row]
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            # Raw value, for sorting numbers as numbers
+            value = self.data_store.columns[col][row]
+            return "" if value is None else value
+        if role == STATUS_ROLE:
+            return self.data_store.status[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole and section < len(self.headers):
+            return self.headers[section]
+        return None
+
+    def set_headers(self, headers: List[str]):
+        self.headers = list(headers)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(COLUMNS) - 1)
+
+    # --- Entries ---
+
+    def entry(self, row: int) -> InventoryEntry:
+        return self.data_store.entry(row)
+
+    def put_entry(self, entry: InventoryEntry):
+        """Updates an entry in place, or inserts it where the sort order puts it."""
+        row = self.data_store.find(entry.id)
+        if row >= 0:
+            old_key = self.data_store.columns[FIELDS.index(self.order_field)][row]
+            if old_key == getattr(entry, self.order_field):
+                self.data_store.replace(row, entry)
+                if row < self.fetched:
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+                return
+            self.remove_entry(entry.id) # Its place in the order changed
+
+        row = self._insert_position(getattr(entry, self.order_field))
+        visible = row < self.fetched or self.fetched == len(self.data_store)
+        if visible:
+            self.beginInsertRows(QModelIndex(), row, row)
+        self.data_store.insert(row, entry)
+        if visible:
+            self.fetched += 1
+            self.endInsertRows()
+
+    def remove_entry(self, inventory_id: int):
+        row = self.data_store.find(inventory_id)
+        if row < 0:
+            return
+        visible = row < self.fetched
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        self.data_store.remove(row)
+        if visible:
+            self.fetched -= 1
+            self.endRemoveRows()
+
+    def patch(self, entries: List[InventoryEntry], inventory_id: int = None, barcode: str = None):
+        """
+        Applies freshly read entries for one id or one product. Rows for that
+        id or product that didn't come back were deleted (or no longer match).
+        """
+        keep = {entry.id for entry in entries}
+        if inventory_id is not None and inventory_id not in keep:
+            self.remove_entry(inventory_id)
+        if barcode is not None:
+            barcodes = self.data_store.columns[FIELDS.index("barcode")]
+            gone = [self.data_store.columns[0][row] for row, value in enumerate(barcodes) if value == barcode]
+            for entry_id in gone:
+                if entry_id not in keep:
+                    self.remove_entry(entry_id)
+        for entry in entries:
+            self.put_entry(entry)
+
+    def _insert_position(self, key) -> int:
+        # The order the query returned (SQLite puts NULL first)
+        column = self.data_store.columns[FIELDS.index(self.order_field)]
+        key = (key is not None, key or "")
+        low, high = 0, len(column)
+        while low < high:
+            middle = (low + high) // 2
+            value = column[middle]
+            if (value is not None, value or "") <= key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class InventoryFilterProxy(QSortFilterProxyModel):
+    """
+    Sorts the inventory by any column and shows only the products a search
+    found (see `DatabaseManager.search_products`).
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches = None # Barcodes to show, or None for everything
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+
+    def set_matches(self, barcodes):
+        """
+        Shows only entries of these products.
+
+        Args:
+            barcodes (Iterable[str], optional): The products to show. None shows everything.
+        """
+        matches = None if barcodes is None else set(barcodes)
+        if hasattr(self, "beginFilterChange"): # Qt 6.10+
+            self.beginFilterChange()
+            self.matches = matches
+            self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+        else:
+            self.matches = matches
+            self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent) -> bool:
+        if self.matches is None:
+            return True
+        return self.sourceModel().data_store.columns[BARCODE_COLUMN][source_row] in self.matches
+
+class ExpiryDelegate(QStyledItemDelegate):
+    """Colors the text of expired (red) and soon expiring (yellow) entries."""
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        color = STATUS_COLORS.get(index.data(STATUS_ROLE))
+        if color is not None:
+            option.palette.setColor(QPalette.ColorRole.Text, color)
@@ -1,16 +1,20 @@
 import sys
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QTableView, QHeaderView,
     QLabel, QLineEdit, QDialog, QFormLayout, QMessageBox, QComboBox,
     QAbstractItemView, QInputDialog, QFileDialog, QListWidget, QListWidgetItem
 )
 import csv
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QColor
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QIcon
 
-from .database import DatabaseManager
+from .database import DatabaseManager, ProductInfo, WARNING_DAYS
+from .inventory_model import InventoryModel, InventoryFilterProxy, ExpiryDelegate, load_inventory, COLUMNS
 from .api import OpenFoodFactsAPI
+from src.ui.scroll_state import restore_scroll_position
+from src.core.query_runner import QueryRunner, get_network_pool
+from src.core.change_bus import get_change_bus
 
 """
 Pantry Manager UI Module.
@@ -39,7 +43,7 @@ STYLESHEET = f"""
         font-family: 'Segoe UI', sans-serif;
         font-size: 14px;
     }}
-    QTableWidget {{
+    QTableView {{
         background-color: {Theme.BACKGROUND_COLOR};
         alternate-background-color: {Theme.GLASS_COLOR};
         gridline-color: {Theme.GLASS_BORDER};
@@ -49,7 +53,7 @@ STYLESHEET = f"""
         selection-color: {Theme.TEXT_PRIMARY};
         outline: 0;
     }}
-    QTableWidget::item {{
+    QTableView::item {{
         color: {Theme.TEXT_PRIMARY};
         padding: 5px;
     }}
@@ -92,6 +96,8 @@ class AddEntryDialog(QDialog):
         self.api = api
         self.db_manager = db_manager
         self.language_manager = language_manager
+        self.queries = QueryRunner(self)
+        self.lookups = QueryRunner(self, pool=get_network_pool)
         
         title = "Neuen Eintrag hinzufügen"
         if self.language_manager:
@@ -175,26 +181,37 @@ class AddEntryDialog(QDialog):
             self.location_combo.addItem(name, loc_id)
 
     def lookup_product(self):
+        """Fills in what's known about the scanned barcode, without blocking the dialog."""
         barcode = self.barcode_input.text()
         if not barcode:
             return
-            
-        # 1. Check local DB first
-        local_data = self.db_manager.get_product_by_barcode(barcode)
+        self.lookups.cancel("lookup")
+        self.queries.run("lookup", self.db_manager.get_product_by_barcode, barcode,
+                         on_result=lambda local_data: self.fill_local_product(barcode, local_data))
+
+    def fill_local_product(self, barcode, local_data):
+        """Uses the local DB hit, or asks Open Food Facts on the network pool."""
         if local_data:
-            self.name_input.setText(local_data[0])
-            self.category_input.setText(local_data[1])
-            self.weight_input.setText(local_data[2])
-            return
+            self.fill_product(local_data)
+        elif barcode == self.barcode_input.text():
+            self.lookups.run("lookup", self.find_online_product, barcode, on_result=self.fill_product)
 
-        # 2. Check API
-        name, category, weight = self.api.get_product_info(barcode)
-        if name:
-            self.name_input.setText(name)
-        if category:
-            self.category_input.setText(category)
-        if weight:
-            self.weight_input.setText(weight)
+    def find_online_product(self, barcode):
+        """
+        Looks a barcode up on Open Food Facts. Runs on a network worker thread.
+
+        Returns:
+            ProductInfo: What was found (fields may be None).
+        """
+        return ProductInfo(*self.api.get_product_info(barcode))
+
+    def fill_product(self, info):
+        if info.name:
+            self.name_input.setText(info.name)
+        if info.category:
+            self.category_input.setText(info.category)
+        if info.weight_volume:
+            self.weight_input.setText(info.weight_volume)
 
     def get_data(self):
         return (
@@ -213,10 +230,11 @@ class EditEntryDialog(QDialog):
     """
     Dialog for editing an existing inventory entry.
     """
-    def __init__(self, db_manager, entry_data, parent=None, language_manager=None):
+    def __init__(self, db_manager, entry, location_id, parent=None, language_manager=None):
         super().__init__(parent)
         self.db_manager = db_manager
-        self.entry_data = entry_data # (id, barcode, name, category, expiry, quantity, weight, location_name, location_id)
+        self.entry = entry # InventoryEntry
+        self.location_id = location_id
         self.language_manager = language_manager
         
         title = "Eintrag bearbeiten"
@@ -231,22 +249,22 @@ class EditEntryDialog(QDialog):
         form_layout = QFormLayout()
         
         # Read-only fields
-        self.name_label = QLabel(self.entry_data[2])
-        self.category_label = QLabel(self.entry_data[3])
-        self.barcode_label = QLabel(self.entry_data[1])
+        self.name_label = QLabel(self.entry.name)
+        self.category_label = QLabel(self.entry.category)
+        self.barcode_label = QLabel(self.entry.barcode)
         
         # Editable fields
-        self.expiry_input = QLineEdit(self.entry_data[4])
+        self.expiry_input = QLineEdit(self.entry.expiry_date)
         self.expiry_input.setPlaceholderText("YYYY-MM-DD")
         
-        self.quantity_input = QLineEdit(str(self.entry_data[5]))
+        self.quantity_input = QLineEdit(str(self.entry.quantity))
         
         # Location Dropdown
         self.location_combo = QComboBox()
         self.load_locations() # Call load_locations to populate the combo box
         
         # Set current location
-        index = self.location_combo.findData(self.entry_data[8])
+        index = self.location_combo.findData(self.location_id)
         if index >= 0:
             self.location_combo.setCurrentIndex(index)
 
@@ -383,18 +401,31 @@ class LebensmittelManagerApp(QMainWindow):
     Main application window for the Pantry Manager.
 
     This shows the big table of all your food and gives you buttons to 
-    manage items and locations.
+    manage items and locations. Emits `content_changed` whenever the visible
+    table changes.
     """
-    def __init__(self, language_manager=None):
+    content_changed = Signal()
+
+    def __init__(self, language_manager=None, settings_manager=None):
         super().__init__()
         self.language_manager = language_manager
+        self.settings_manager = settings_manager
         self.setWindowTitle("Lebensmittel Manager Pro")
         if self.language_manager:
             self.setWindowTitle(self.language_manager.translate("pantry_manager", "Lebensmittel Manager Pro"))
         self.resize(1100, 650)
         
-        self.db_manager = DatabaseManager()
-        self.api = OpenFoodFactsAPI()
+        # The hub's settings, so changes made in the settings dialog apply right away
+        warning_days = WARNING_DAYS
+        if self.settings_manager:
+            warning_days = self.settings_manager.get_pantry_settings()["warning_days"]
+            self.settings_manager.setting_changed.connect(self.on_setting_changed)
+        self.db_manager = DatabaseManager(warning_days=warning_days)
+        self.queries = QueryRunner(self)
+        bus = get_change_bus()
+        bus.watch(self.db_manager.db)
+        bus.changed.connect(self.on_data_changed)
+        self.api = OpenFoodFactsAPI(self.db_manager)
         
         self.show_expiring_only = False
         
@@ -438,12 +469,21 @@ class LebensmittelManagerApp(QMainWindow):
         main_layout.addLayout(search_layout)
         
         # Table
-        self.table = QTableWidget()
+        self.model = InventoryModel(self)
+        self.proxy = InventoryFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setItemDelegate(ExpiryDelegate(self.table))
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Unsorted (database order) until a column header is clicked
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.model.fetch_all)
         
         main_layout.addWidget(self.table)
         
@@ -537,55 +577,92 @@ class LebensmittelManagerApp(QMainWindow):
         self.export_full_btn.setText(export_full_text)
         self.export_selected_btn.setText(export_sel_text)
         
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
+        self.model.set_headers(columns)
         
         header_view = self.table.horizontalHeader()
         header_view.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         header_view.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header_view.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
+        self.content_changed.emit()
+
+    def on_setting_changed(self, key_path, old_value, new_value):
+        """Picks up a new expiry warning window and recolours the table."""
+        if key_path.split(".")[0] != "pantry":
+            return
+        warning_days = self.settings_manager.get_pantry_settings()["warning_days"]
+        if warning_days != self.db_manager.warning_days:
+            self.db_manager.warning_days = warning_days
+            self.refresh_table()
 
     def refresh_table(self):
         """
         Reloads the table data from the database.
         
-        Also handles the "expiring soon" filter and colors rows red/yellow 
-        if they are about to go bad.
+        Also handles the "expiring soon" filter. Rows are colored red/yellow
+        by the delegate if they are about to go bad.
         """
-        self.table.setRowCount(0)
-        
-        if self.show_expiring_only:
-            entries = self.db_manager.get_expiring_inventory(30)
+        self.queries.run("inventory", load_inventory, self.db_manager, self.days_threshold(), on_result=self.show_entries)
+
+    def days_threshold(self):
+        """The expiry window of the "expiring soon" filter, or None when it is off."""
+        return self.db_manager.warning_days if self.show_expiring_only else None
+
+    def on_data_changed(self, change):
+        """
+        Updates the table when the inventory was changed, here or anywhere else.
+
+        A change to one entry or one product only reloads those rows; anything
+        else reloads the whole table.
+        """
+        if not change.affects(self.db_manager.db.path, ("inventory", "products", "locations")):
+            return
+        if change.table in ("products", None) and self.search_input.text().strip():
+            self.filter_table(self.search_input.text()) # A product may (no longer) match
+        if change.table == "inventory" and change.row_id is not None:
+            self.queries.run(f"entry-{change.row_id}", self.db_manager.get_inventory_entries,
+                             inventory_id=change.row_id, days_threshold=self.days_threshold(),
+                             on_result=lambda entries, entry_id=change.row_id: self.patch_rows(entries, inventory_id=entry_id))
+        elif change.table == "products" and change.row_id is not None:
+            self.queries.run(f"product-{change.row_id}", self.db_manager.get_inventory_entries,
+                             barcode=change.row_id, days_threshold=self.days_threshold(),
+                             on_result=lambda entries, barcode=change.row_id: self.patch_rows(entries, barcode=barcode))
+        elif change.table == "locations" and change.op in ("insert", "delete"):
+            return # Only empty locations can be deleted, so no row changes
         else:
-            entries = self.db_manager.get_inventory_with_details()
-            
-        from datetime import datetime, timedelta
-        today = datetime.now().date()
-        warning_date = today + timedelta(days=30)
-        
-        for row_idx, entry in enumerate(entries):
-            self.table.insertRow(row_idx)
-            # entry: id, barcode, name, category, expiry, quantity, weight, location
-            # Map to columns: ID, Barcode, Name, Kategorie, Ablaufdatum, Anzahl, Gewicht, Lagerort
-            
-            mapping = [0, 1, 2, 3, 4, 5, 6, 7]
-            
-            for col_idx, map_idx in enumerate(mapping):
-                val = entry[map_idx]
-                item = QTableWidgetItem(str(val))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                
-                # Color coding for expiry
-                try:
-                    expiry_date = datetime.strptime(entry[4], "%Y-%m-%d").date()
-                    if expiry_date < today:
-                        item.setForeground(QColor("#ff5555")) # Red for expired
-                    elif expiry_date <= warning_date:
-                        item.setForeground(QColor("#f1fa8c")) # Yellow for warning
-                except ValueError:
-                    pass
-                    
-                self.table.setItem(row_idx, col_idx, item)
+            self.refresh_table()
+
+    def show_entries(self, data):
+        """
+        Shows freshly loaded inventory entries and applies the current search.
+
+        Args:
+            data (InventoryColumns): The entries.
+        """
+        self.model.set_data(data, "expiry_date" if self.show_expiring_only else "name")
+        if self.search_input.text() or self.proxy.sortColumn() >= 0:
+            self.model.fetch_all()
+        self.content_changed.emit()
+
+    def patch_rows(self, entries, inventory_id=None, barcode=None):
+        """Puts reloaded entries for one id or product into the table."""
+        self.model.patch(entries, inventory_id=inventory_id, barcode=barcode)
+        self.content_changed.emit()
+
+    def save_state(self):
+        """Remembers the search, filter and scroll position before the app is unloaded."""
+        return {
+            "search": self.search_input.text(),
+            "expiring_only": self.show_expiring_only,
+            "scroll": self.table.verticalScrollBar().value()
+        }
+
+    def restore_state(self, state):
+        """Brings back the search, filter and scroll position after the app was unloaded."""
+        self.show_expiring_only = state.get("expiring_only", False)
+        self.expiring_btn.setChecked(self.show_expiring_only)
+        self.search_input.setText(state.get("search", ""))
+        self.refresh_table()
+        restore_scroll_position(self.table.verticalScrollBar(), state.get("scroll", 0))
 
     def toggle_expiring_filter(self):
         self.show_expiring_only = self.expiring_btn.isChecked()
@@ -595,20 +672,28 @@ class LebensmittelManagerApp(QMainWindow):
         """
         Filters rows based on what you type in the search bar.
 
+        The search runs on a worker thread (a newer keystroke replaces it);
+        only the matching products are handed to the table.
+
         Args:
-            text (str): What you're looking for (name or barcode).
+            text (str): What you're looking for (name, category or barcode).
         """
-        text = text.lower()
-        for row in range(self.table.rowCount()):
-            match = False
-            # Check Name (col 2) and Barcode (col 1)
-            name = self.table.item(row, 2).text().lower()
-            barcode = self.table.item(row, 1).text().lower()
-            
-            if text in name or text in barcode:
-                match = True
-            
-            self.table.setRowHidden(row, not match)
+        if not text.strip():
+            self.queries.cancel("search")
+            self.show_matches(None)
+            return
+        self.model.fetch_all() # Search everything, not just the rows shown so far
+        self.queries.run("search", self.db_manager.search_products, text, on_result=self.show_matches)
+
+    def show_matches(self, barcodes):
+        """Shows only the entries of the products a search found (all of them for None)."""
+        self.proxy.set_matches(barcodes)
+        self.content_changed.emit()
+
+    def selected_entries(self):
+        """Returns the selected inventory entries, in table order."""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.model.entry(self.proxy.mapToSource(self.proxy.index(row, 0)).row()) for row in rows]
 
     def export_full_inventory(self):
         """
@@ -620,7 +705,7 @@ class LebensmittelManagerApp(QMainWindow):
             
         try:
             entries = self.db_manager.get_inventory_with_details()
-            # entries structure: id, barcode, name, category, expiry, quantity, weight, location_name
+            # The table's columns: id, barcode, name, category, expiry, quantity, weight, location_name
             
             with open(path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
@@ -629,7 +714,7 @@ class LebensmittelManagerApp(QMainWindow):
                 writer.writerow(headers)
                 
                 for entry in entries:
-                    writer.writerow(entry)
+                    writer.writerow(entry[:len(COLUMNS)])
             
             QMessageBox.information(self, "Success", "Full inventory exported successfully!")
         except Exception as e:
@@ -639,9 +724,9 @@ class LebensmittelManagerApp(QMainWindow):
         """
         Exports currently selected items to a CSV file (e.g., for a shopping list).
         """
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
+        selected_entries = self.selected_entries()
         
-        if not selected_rows:
+        if not selected_entries:
             QMessageBox.warning(self, "Warning", "Please select items to export for your grocery list!")
             return
 
@@ -653,20 +738,11 @@ class LebensmittelManagerApp(QMainWindow):
             with open(path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 # Write headers from table
-                headers = []
-                for col in range(self.table.columnCount()):
-                    headers.append(self.table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
+                writer.writerow(self.model.headers)
                 
                 # Write data from selected rows
-                for row in selected_rows:
-                    if self.table.isRowHidden(row):
-                        continue
-                    row_data = []
-                    for col in range(self.table.columnCount()):
-                        item = self.table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                for entry in selected_entries:
+                    writer.writerow(["" if value is None else value for value in entry[:len(COLUMNS)]])
             
             QMessageBox.information(self, "Success", "Selected items exported successfully!")
         except Exception as e:
@@ -697,25 +773,23 @@ class LebensmittelManagerApp(QMainWindow):
 
             success, message = self.db_manager.add_product(barcode, name, category, expiry, qty, weight, location_id)
             
-            if success:
-                self.refresh_table()
-            else:
+            # On success the table refreshes itself, see on_data_changed
+            if not success:
                 QMessageBox.critical(self, self.language_manager.translate("error", "Error") if self.language_manager else "Fehler", message)
 
     def delete_entry(self):
         """
         Deletes or reduces the quantity of the selected inventory item.
         """
-        selected_rows = self.table.selectionModel().selectedRows()
-        if not selected_rows:
+        selected_entries = self.selected_entries()
+        if not selected_entries:
             msg = "Please select an entry!"
             if self.language_manager:
                 msg = self.language_manager.translate("select_entry_warning", msg)
             QMessageBox.warning(self, self.language_manager.translate("warning", "Warning") if self.language_manager else "Warnung", msg)
             return
             
-        row = selected_rows[0].row()
-        inv_id = int(self.table.item(row, 0).text())
+        inv_id = selected_entries[0].id
         
         title = "Remove Quantity"
         label = "How many units to remove?"
@@ -725,9 +799,7 @@ class LebensmittelManagerApp(QMainWindow):
 
         qty, ok = QInputDialog.getInt(self, title, label, 1, 1, 1000)
         if ok:
-            if self.db_manager.delete_inventory_item(inv_id, qty):
-                self.refresh_table()
-            else:
+            if not self.db_manager.delete_inventory_item(inv_id, qty):
                 msg = "Could not update entry."
                 if self.language_manager:
                     msg = self.language_manager.translate("error_update_entry", msg)
@@ -737,19 +809,19 @@ class LebensmittelManagerApp(QMainWindow):
         """
         Opens the dialog to edit the selected inventory item.
         """
-        selected_rows = self.table.selectionModel().selectedRows()
-        if not selected_rows:
+        selected_entries = self.selected_entries()
+        if not selected_entries:
             msg = "Please select an entry!"
             if self.language_manager:
                 msg = self.language_manager.translate("select_entry_warning", msg)
             QMessageBox.warning(self, self.language_manager.translate("warning", "Warning") if self.language_manager else "Warnung", msg)
             return
             
-        row = selected_rows[0].row()
-        inv_id = int(self.table.item(row, 0).text())
+        entry = selected_entries[0]
+        inv_id = entry.id
         
         # Get location ID from name
-        loc_name = self.table.item(row, 7).text()
+        loc_name = entry.location_name
         locations = self.db_manager.get_locations()
         location_id = next((id for id, name in locations if name == loc_name), None)
         
@@ -760,19 +832,7 @@ class LebensmittelManagerApp(QMainWindow):
              QMessageBox.warning(self, self.language_manager.translate("error", "Error") if self.language_manager else "Fehler", msg)
              return
 
-        entry_data = (
-            inv_id,
-            self.table.item(row, 1).text(), # barcode
-            self.table.item(row, 2).text(), # name
-            self.table.item(row, 3).text(), # category
-            self.table.item(row, 4).text(), # expiry
-            self.table.item(row, 5).text(), # quantity
-            self.table.item(row, 6).text(), # weight
-            loc_name,
-            location_id
-        )
-        
-        dialog = EditEntryDialog(self.db_manager, entry_data, self, language_manager=self.language_manager)
+        dialog = EditEntryDialog(self.db_manager, entry, location_id, self, language_manager=self.language_manager)
         if dialog.exec():
             new_loc_id, new_expiry, new_qty = dialog.get_data()
             try:
@@ -785,9 +845,7 @@ class LebensmittelManagerApp(QMainWindow):
                 return
                 
             success, msg = self.db_manager.update_inventory_item(inv_id, new_loc_id, new_expiry, qty)
-            if success:
-                self.refresh_table()
-            else:
+            if not success:
                 QMessageBox.critical(self, self.language_manager.translate("error", "Error") if self.language_manager else "Fehler", msg)
 
     def manage_locations(self):
@@ -2,12 +2,15 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QListWidget, QListWidgetItem, QDialog, 
                              QLineEdit, QComboBox, QMessageBox, QFrame,
                              QCheckBox, QSpinBox)
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QFont
 
-from .database import init_db, add_task, get_due_tasks, complete_task, get_completed_tasks, delete_task, update_task, add_person, get_people, delete_person
+from .database import get_db, init_db, add_task, get_due_tasks, complete_task, get_completed_tasks, delete_task, update_task, add_person, get_people, delete_person, get_task
 from src.ui.resolution_manager import ResolutionManager
 from src.ui.theme import Theme
+from src.ui.scroll_state import restore_scroll_position
+from src.core.query_runner import QueryRunner
+from src.core.change_bus import get_change_bus
 
 """
 Task Board Application Module.
@@ -15,17 +18,35 @@ Task Board Application Module.
 This module handles the Task Board. It helps you track what needs to be done.
 """
 
+TASK_TABLES = ("tasks", "people", "task_completions")
+
+def load_task_lists(include_completed):
+    """Loads due (and optionally completed) tasks. Runs on a database worker."""
+    return get_due_tasks(), get_completed_tasks() if include_completed else []
+
+def load_completion(task_id):
+    """Loads a task and the people who could have done it. Runs on a database worker."""
+    return get_task(task_id), get_people()
+
 class TaskBoardApp(QWidget):
     """
     The main view for the Task Board.
 
     It shows your tasks and lets you add new ones.
+
+    Emits `content_changed` whenever the visible task list changes.
     """
+    content_changed = Signal()
+
     def __init__(self, language_manager=None):
         """Sets up the task board, loads your tasks, and gets the UI ready."""
         super().__init__()
         self.language_manager = language_manager
         init_db()
+        self.queries = QueryRunner(self)
+        bus = get_change_bus()
+        bus.watch(get_db())
+        bus.changed.connect(self.on_data_changed)
         self.res_manager = ResolutionManager()
         self.show_completed = False
         self.setup_ui()
@@ -174,28 +195,40 @@ class TaskBoardApp(QWidget):
 
     def refresh_tasks(self):
         """
-        Reloads tasks from the database. It separates them into 'due' and 
-        'completed'.
+        Reloads tasks from the database in the background. It separates them
+        into 'due' and 'completed'; the list is filled once they arrive.
+        """
+        self.queries.run("tasks", load_task_lists, self.show_completed, on_result=self.show_tasks)
+
+    def on_data_changed(self, change):
+        """Reloads the list when tasks or people were changed, here or anywhere else."""
+        if change.affects(get_db().path, TASK_TABLES):
+            self.refresh_tasks()
+
+    def show_tasks(self, task_lists):
+        """
+        Fills the list with freshly loaded tasks.
+
+        Args:
+            task_lists (tuple): The due tasks and the completed tasks.
         """
+        due_tasks, completed_tasks = task_lists
         self.task_list.clear()
-        
-        # Due Tasks
-        tasks = get_due_tasks()
-        for task in tasks:
+
+        for task in due_tasks:
             self.add_task_item(task, is_completed=False)
 
-        # Completed Tasks
-        if self.show_completed:
-            completed_tasks = get_completed_tasks()
-            for task in completed_tasks:
-                self.add_task_item(task, is_completed=True)
+        for task in completed_tasks:
+            self.add_task_item(task, is_completed=True)
+
+        self.content_changed.emit()
 
     def add_task_item(self, task, is_completed):
         """
         Creates a widget for a single task and adds it to the list.
 
         Args:
-            task (dict): The task data.
+            task (Task): The task data.
             is_completed (bool): Whether the task is done.
         """
         item = QListWidgetItem(self.task_list)
@@ -216,9 +249,9 @@ class TaskBoardApp(QWidget):
         dialog.exec()
 
     def on_task_edit(self, task):
+        # The list refreshes itself once the dialog saved, see on_data_changed
         dialog = AddTaskDialog(self, task, self.language_manager)
-        if dialog.exec():
-            self.refresh_tasks()
+        dialog.exec()
 
     def on_task_delete(self, task_id):
         title = "Delete Task"
@@ -233,8 +266,22 @@ class TaskBoardApp(QWidget):
             QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            delete_task(task_id)
-            self.refresh_tasks()
+            # The list refreshes itself after the commit, see on_data_changed
+            self.queries.run(None, delete_task, task_id)
+
+    def save_state(self):
+        """Remembers the list filter and scroll position before the app is unloaded."""
+        return {
+            "show_completed": self.show_completed,
+            "scroll": self.task_list.verticalScrollBar().value()
+        }
+
+    def restore_state(self, state):
+        """Puts the list back the way it was before the app was unloaded."""
+        self.show_completed = state.get("show_completed", False)
+        self.completed_btn.setChecked(self.show_completed)
+        self.refresh_tasks()
+        restore_scroll_position(self.task_list.verticalScrollBar(), state.get("scroll", 0))
 
     def toggle_completed_tasks(self):
         self.show_completed = self.completed_btn.isChecked()
@@ -242,40 +289,36 @@ class TaskBoardApp(QWidget):
 
     def on_task_complete(self, task_id):
         # Fetch task details to check assignment
-        from .database import get_task
-        task = get_task(task_id)
-        
+        self.queries.run(f"complete-{task_id}", load_completion, task_id,
+                         on_result=lambda result: self.finish_task_complete(task_id, *result))
+
+    def finish_task_complete(self, task_id, task, people):
         if not task:
             return
 
         # Check if assigned to a specific single person
-        if task['assignment_type'] == 'specific':
+        if task.assignment_type == 'specific':
             # assignment_value is a comma-separated string of IDs
-            ids = str(task['assignment_value']).split(',')
+            ids = str(task.assignment_value).split(',')
             if len(ids) == 1 and ids[0]:
                 # Single person, auto-complete
-                complete_task(task_id, int(ids[0]))
-                self.refresh_tasks()
+                self.queries.run(None, complete_task, task_id, int(ids[0]))
                 return
 
-        people = get_people()
         if not people:
             # No people defined, just complete it
-            complete_task(task_id)
-            self.refresh_tasks()
+            self.queries.run(None, complete_task, task_id)
             return
 
         # Ask who is completing it
         dialog = WhoAreYouDialog(self, people, self.language_manager)
         if dialog.exec():
             person_id = dialog.get_selected_person_id()
-            complete_task(task_id, person_id)
-            self.refresh_tasks()
+            self.queries.run(None, complete_task, task_id, person_id)
 
     def open_add_task_dialog(self, checked=False):
         dialog = AddTaskDialog(self, task=None, language_manager=self.language_manager)
-        if dialog.exec():
-            self.refresh_tasks()
+        dialog.exec()
 
 class TaskItemWidget(QFrame):
     """
@@ -320,7 +363,7 @@ class TaskItemWidget(QFrame):
         info_layout.setSpacing(self.res_manager.scale(5))
         
         name_font = self.res_manager.scale(18)
-        name_label = QLabel(task['name'])
+        name_label = QLabel(task.name)
         if self.is_completed:
             # Improved readability for completed tasks
             name_label.setStyleSheet(f"font-size: {name_font}px; font-weight: bold; text-decoration: line-through; color: #888;")
@@ -332,8 +375,8 @@ class TaskItemWidget(QFrame):
         
         # Assignment Text
         assign_text = ""
-        atype = task.get('assignment_type', 'specific')
-        aval = task.get('assignment_value')
+        atype = task.assignment_type
+        aval = task.assignment_value
         
         if atype == 'all':
             assign_text = "All People"
@@ -358,12 +401,12 @@ class TaskItemWidget(QFrame):
         # Completion Status
         status_text = ""
         if not is_completed:
-            req = task.get('required_completions', 1)
-            curr = task.get('current_completions', 0)
+            req = task.required_completions
+            curr = task.current_completions
             if req > 1:
                 status_text = f" | {curr}/{req}"
         
-        details_label = QLabel(f"{assign_text} | {freq_lbl}: {task['frequency']}{status_text}")
+        details_label = QLabel(f"{assign_text} | {freq_lbl}: {task.frequency}{status_text}")
         details_label.setStyleSheet(f"color: {Theme.TEXT_SECONDARY}; font-size: {details_font}px;")
         
         info_layout.addWidget(name_label)
@@ -414,7 +457,7 @@ class TaskItemWidget(QFrame):
                 background-color: #D32F2F;
             }}
         """)
-        delete_btn.clicked.connect(lambda _: self.delete_callback(task['id']))
+        delete_btn.clicked.connect(lambda _: self.delete_callback(task.id))
         btn_layout.addWidget(delete_btn)
 
         # Complete Button
@@ -436,7 +479,7 @@ class TaskItemWidget(QFrame):
                     background-color: #1976D2;
                 }}
             """)
-            done_btn.clicked.connect(lambda _: self.complete_callback(task['id']))
+            done_btn.clicked.connect(lambda _: self.complete_callback(task.id))
             btn_layout.addWidget(done_btn)
         
         layout.addLayout(btn_layout)
@@ -450,6 +493,9 @@ class AddTaskDialog(QDialog):
         self.language_manager = language_manager
         self.res_manager = ResolutionManager()
         self.task = task
+        self.people = []
+        self.people_checks = []
+        self.queries = QueryRunner(self)
         
         title = "Edit Task" if task else "Add New Task"
         if self.language_manager:
@@ -520,10 +566,10 @@ class AddTaskDialog(QDialog):
 
         # Pre-fill if editing
         if self.task:
-            self.name_input.setText(self.task['name'])
-            self.freq_input.setCurrentText(self.task['frequency'])
+            self.name_input.setText(self.task.name)
+            self.freq_input.setCurrentText(self.task.frequency)
             
-            atype = self.task.get('assignment_type', 'specific')
+            atype = self.task.assignment_type
             index = self.assign_type_combo.findData(atype)
             if index >= 0:
                 self.assign_type_combo.setCurrentIndex(index)
@@ -552,6 +598,12 @@ class AddTaskDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
 
+        self.queries.run("people", get_people, on_result=self.set_people)
+
+    def set_people(self, people):
+        self.people = people
+        self.update_assignment_ui()
+
     def update_assignment_ui(self):
         # Clear existing
         while self.assign_layout.count():
@@ -560,22 +612,22 @@ class AddTaskDialog(QDialog):
                 item.widget().deleteLater()
                 
         atype = self.assign_type_combo.currentData()
-        people = get_people()
+        people = self.people
         
         if atype == 'specific':
             # Checkboxes for each person
             self.people_checks = []
             for person in people:
-                chk = QCheckBox(person['name'])
-                chk.setProperty('person_id', person['id'])
+                chk = QCheckBox(person.name)
+                chk.setProperty('person_id', person.id)
                 self.assign_layout.addWidget(chk)
                 self.people_checks.append(chk)
                 
                 # Pre-check if editing
-                if self.task and self.task.get('assignment_type') == 'specific':
+                if self.task and self.task.assignment_type == 'specific':
                     # assignment_value is string of IDs like "1,2"
-                    ids = str(self.task.get('assignment_value', '')).split(',')
-                    if str(person['id']) in ids:
+                    ids = str(self.task.assignment_value).split(',')
+                    if str(person.id) in ids:
                         chk.setChecked(True)
                         
         elif atype == 'any_n':
@@ -590,9 +642,9 @@ class AddTaskDialog(QDialog):
             self.n_spinner.setMaximum(len(people) if people else 1)
             self.assign_layout.addWidget(self.n_spinner)
             
-            if self.task and self.task.get('assignment_type') == 'any_n':
+            if self.task and self.task.assignment_type == 'any_n':
                 try:
-                    self.n_spinner.setValue(int(self.task.get('assignment_value', 1)))
+                    self.n_spinner.setValue(int(self.task.assignment_value))
                 except:
                     pass
 
@@ -616,11 +668,13 @@ class AddTaskDialog(QDialog):
             
         frequency = self.freq_input.currentText()
         
+        # Closes once the task is saved
         if self.task:
-            update_task(self.task['id'], name, atype, aval, frequency)
+            self.queries.run("save", update_task, self.task.id, name, atype, aval, frequency,
+                             on_result=lambda _: self.accept())
         else:
-            add_task(name, atype, aval, frequency)
-        self.accept()
+            self.queries.run("save", add_task, name, atype, aval, frequency,
+                             on_result=lambda _: self.accept())
 
 class ManagePeopleDialog(QDialog):
     def __init__(self, parent=None, language_manager=None):
@@ -632,6 +686,7 @@ class ManagePeopleDialog(QDialog):
         if self.language_manager:
             title = self.language_manager.translate("people_management", "Manage People")
         self.setWindowTitle(title)
+        self.queries = QueryRunner(self)
         
         self.setFixedSize(self.res_manager.scale(400), self.res_manager.scale(500))
         self.setStyleSheet(f"background-color: #2b2b2b; color: {Theme.TEXT_PRIMARY}; font-size: {self.res_manager.scale(16)}px;")
@@ -668,26 +723,26 @@ class ManagePeopleDialog(QDialog):
         self.refresh_list()
         
     def refresh_list(self):
+        self.queries.run("people", get_people, on_result=self.show_people)
+
+    def show_people(self, people):
         self.people_list.clear()
-        people = get_people()
         for p in people:
-            item = QListWidgetItem(p['name'])
-            item.setData(Qt.ItemDataRole.UserRole, p['id'])
+            item = QListWidgetItem(p.name)
+            item.setData(Qt.ItemDataRole.UserRole, p.id)
             self.people_list.addItem(item)
             
     def add_person(self):
         name = self.name_input.text().strip()
         if name:
-            add_person(name)
+            self.queries.run(None, add_person, name, on_result=lambda _: self.refresh_list())
             self.name_input.clear()
-            self.refresh_list()
             
     def delete_person(self):
         item = self.people_list.currentItem()
         if item:
             pid = item.data(Qt.ItemDataRole.UserRole)
-            delete_person(pid)
-            self.refresh_list()
+            self.queries.run(None, delete_person, pid, on_result=lambda _: self.refresh_list())
 
 class WhoAreYouDialog(QDialog):
     def __init__(self, parent=None, people=None, language_manager=None):
@@ -712,7 +767,7 @@ class WhoAreYouDialog(QDialog):
         
         self.combo = QComboBox()
         for p in self.people:
-            self.combo.addItem(p['name'], p['id'])
+            self.combo.addItem(p.name, p.id)
         layout.addWidget(self.combo)
         
         btn = QPushButton("OK")
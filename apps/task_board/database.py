@@ -1,8 +1,11 @@
 import sqlite3
 import os
 from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
 
 from src.core.paths import get_db_path
+from src.core.database import get_database
+from src.core.migrations import run_migrations
 
 """
 Task Board Database Module.
@@ -13,15 +16,39 @@ It manages the storage, retrieval, completion, and deletion of tasks using SQLit
 
 DB_PATH = get_db_path('tasks.db')
 
-def init_db():
+def get_db():
+    """Returns the shared connection pool for the task database."""
+    return get_database(DB_PATH)
+
+class Person(NamedTuple):
+    """A row of 'people'."""
+    id: int
+    name: str
+
+class Task(NamedTuple):
+    """A row of 'tasks'."""
+    id: int
+    name: str
+    assignment_type: str # 'specific', 'any_n' or 'all'
+    assignment_value: Optional[str] # Comma separated person IDs for 'specific', a count for 'any_n'
+    frequency: str
+    last_completed: Optional[str]
+    next_due: Optional[str]
+    required_completions: int
+    current_completions: int
+    last_reset_date: Optional[str]
+
+TASK_COLUMNS = ", ".join(Task._fields)
+
+def migrate_v1_tasks(conn):
     """
-    Initializes the database schema.
+    Schema v1: people, tasks and task_completions.
 
-    Creates the 'tasks' and 'people' tables if they do not already exist.
+    Early development databases had a single 'assignee' column on tasks; that
+    table is dropped and recreated with the assignment columns.
     """
-    conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
-    
+
     # People Table
     c.execute('''
         CREATE TABLE IF NOT EXISTS people (
@@ -29,21 +56,14 @@ def init_db():
             name TEXT NOT NULL UNIQUE
         )
     ''')
-    
-    # Tasks Table - Updated Schema
-    # We need to handle migration if table exists but has old schema. 
-    # For simplicity in this "release mode" setup, we will check if 'assignee' column exists.
-    # If it does, we might want to drop and recreate or alter. 
-    # Given the user asked to "put into release mode", wiping old dev data is likely acceptable 
-    # or we can try to migrate. Let's try to be safe and check columns.
-    
+
     c.execute("PRAGMA table_info(tasks)")
     columns = [info[1] for info in c.fetchall()]
-    
+
     if 'assignee' in columns and 'assignment_type' not in columns:
         # Old schema detected. Let's drop and recreate for a clean slate as requested.
         c.execute("DROP TABLE tasks")
-        
+
     c.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -58,7 +78,7 @@ def init_db():
             last_reset_date TEXT
         )
     ''')
-    
+
     # Task Completions Tracking (who completed what today)
     c.execute('''
         CREATE TABLE IF NOT EXISTS task_completions (
@@ -70,92 +90,86 @@ def init_db():
             FOREIGN KEY(person_id) REFERENCES people(id)
         )
     ''')
-    
-    conn.commit()
-    conn.close()
+
+# Schema migrations, oldest first. Never edit one that shipped; append a new one.
+MIGRATIONS = [
+    migrate_v1_tasks,
+]
+
+def init_db():
+    """
+    Brings the database up to the current schema.
+
+    Cheap to call from every constructor: once the schema is current this
+    doesn't touch the database again.
+    """
+    run_migrations(get_db(), MIGRATIONS)
 
 # --- People Management ---
 
 def add_person(name):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    db = get_db()
     try:
-        c.execute('INSERT INTO people (name) VALUES (?)', (name,))
-        conn.commit()
+        cursor = db.execute('INSERT INTO people (name) VALUES (?)', (name,))
     except sqlite3.IntegrityError:
-        pass # Already exists
-    conn.close()
+        return # Already exists
+    db.record_change('people', cursor.lastrowid, 'insert')
 
 def get_people():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute('SELECT * FROM people ORDER BY name')
-    rows = c.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    return get_db().fetch_records(Person, 'SELECT id, name FROM people ORDER BY name')
 
 def delete_person(person_id):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('DELETE FROM people WHERE id = ?', (person_id,))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    db.execute('DELETE FROM people WHERE id = ?', (person_id,))
+    db.record_change('people', person_id, 'delete')
 
 # --- Task Management ---
 
 def add_task(name, assignment_type, assignment_value, frequency):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    next_due = datetime.now().strftime('%Y-%m-%d')
-    
-    # Determine required completions
-    required = 1
-    if assignment_type == 'all':
-        c.execute('SELECT COUNT(*) FROM people')
-        required = c.fetchone()[0]
-    elif assignment_type == 'any_n':
-        required = int(assignment_value)
-    elif assignment_type == 'specific':
-        # assignment_value is comma separated IDs or names? Let's store IDs as comma separated string
-        required = len(str(assignment_value).split(',')) if assignment_value else 1
-        
-    c.execute('''
-        INSERT INTO tasks (name, assignment_type, assignment_value, frequency, next_due, required_completions) 
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (name, assignment_type, str(assignment_value), frequency, next_due, required))
-    
-    conn.commit()
-    conn.close()
+    db = get_db()
+    with db.transaction() as conn:
+        c = conn.cursor()
+        next_due = datetime.now().strftime('%Y-%m-%d')
+
+        # Determine required completions
+        required = 1
+        if assignment_type == 'all':
+            c.execute('SELECT COUNT(*) FROM people')
+            required = c.fetchone()[0]
+        elif assignment_type == 'any_n':
+            required = int(assignment_value)
+        elif assignment_type == 'specific':
+            # assignment_value is comma separated IDs or names? Let's store IDs as comma separated string
+            required = len(str(assignment_value).split(',')) if assignment_value else 1
+
+        c.execute('''
+            INSERT INTO tasks (name, assignment_type, assignment_value, frequency, next_due, required_completions) 
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (name, assignment_type, str(assignment_value), frequency, next_due, required))
+        db.record_change('tasks', c.lastrowid, 'insert')
 
 def update_task(task_id, name, assignment_type, assignment_value, frequency):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # Recalculate required completions
-    required = 1
-    if assignment_type == 'all':
-        c.execute('SELECT COUNT(*) FROM people')
-        required = c.fetchone()[0]
-    elif assignment_type == 'any_n':
-        required = int(assignment_value)
-    elif assignment_type == 'specific':
-        required = len(str(assignment_value).split(',')) if assignment_value else 1
+    db = get_db()
+    with db.transaction() as conn:
+        c = conn.cursor()
+        # Recalculate required completions
+        required = 1
+        if assignment_type == 'all':
+            c.execute('SELECT COUNT(*) FROM people')
+            required = c.fetchone()[0]
+        elif assignment_type == 'any_n':
+            required = int(assignment_value)
+        elif assignment_type == 'specific':
+            required = len(str(assignment_value).split(',')) if assignment_value else 1
 
-    c.execute('''
-        UPDATE tasks 
-        SET name = ?, assignment_type = ?, assignment_value = ?, frequency = ?, required_completions = ? 
-        WHERE id = ?
-    ''', (name, assignment_type, str(assignment_value), frequency, required, task_id))
-    conn.commit()
-    conn.close()
+        c.execute('''
+            UPDATE tasks 
+            SET name = ?, assignment_type = ?, assignment_value = ?, frequency = ?, required_completions = ? 
+            WHERE id = ?
+        ''', (name, assignment_type, str(assignment_value), frequency, required, task_id))
+        db.record_change('tasks', task_id, 'update')
 
 def get_due_tasks():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
     today = datetime.now().strftime('%Y-%m-%d')
     
     # Check for daily reset of completion counts
@@ -167,33 +181,21 @@ def get_due_tasks():
     # Simplified: We just look at next_due. If next_due is today, we show it.
     # If current_completions >= required_completions, it's "done" for this period, so we don't show it in "Due".
     
-    c.execute('''
-        SELECT * FROM tasks 
+    return get_db().fetch_records(Task, f'''
+        SELECT {TASK_COLUMNS} FROM tasks 
         WHERE (next_due <= ? OR next_due IS NULL) 
         AND current_completions < required_completions
     ''', (today,))
-    
-    rows = c.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
 
 def get_completed_tasks():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
     today = datetime.now().strftime('%Y-%m-%d')
     
     # Tasks where we have met the requirement OR next_due is in future
-    c.execute('''
-        SELECT * FROM tasks 
+    return get_db().fetch_records(Task, f'''
+        SELECT {TASK_COLUMNS} FROM tasks 
         WHERE next_due > ? OR current_completions >= required_completions
         ORDER BY next_due ASC
     ''', (today,))
-    
-    rows = c.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
 
 def complete_task(task_id, person_id=None):
     """
@@ -202,79 +204,68 @@ def complete_task(task_id, person_id=None):
     Updates current_completions.
     If requirements met, advances next_due.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
-    c.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
-    task = c.fetchone()
-    
-    if task:
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Record completion
-        if person_id:
-            # Check if this person already completed it today?
-            c.execute('SELECT * FROM task_completions WHERE task_id = ? AND person_id = ? AND completion_date = ?', 
-                      (task_id, person_id, today))
-            if c.fetchone():
-                conn.close()
-                return # Already did it
-            
-            c.execute('INSERT INTO task_completions (task_id, person_id, completion_date) VALUES (?, ?, ?)',
-                      (task_id, person_id, today))
-        
-        # Increment count
-        new_count = task['current_completions'] + 1
-        c.execute('UPDATE tasks SET current_completions = ? WHERE id = ?', (new_count, task_id))
-        
-        # Check if fully complete
-        if new_count >= task['required_completions']:
-            # Advance Date
-            now = datetime.now()
-            last_completed = now.strftime('%Y-%m-%d')
-            
-            frequency = task['frequency']
-            days_to_add = 1
-            
-            if frequency == 'Daily':
+    db = get_db()
+    with db.transaction() as conn:
+        c = conn.cursor()
+        task = get_task(task_id)
+
+        if task:
+            today = datetime.now().strftime('%Y-%m-%d')
+
+            # Record completion
+            if person_id:
+                # Check if this person already completed it today?
+                c.execute('SELECT * FROM task_completions WHERE task_id = ? AND person_id = ? AND completion_date = ?', 
+                          (task_id, person_id, today))
+                if c.fetchone():
+                    return # Already did it
+
+                c.execute('INSERT INTO task_completions (task_id, person_id, completion_date) VALUES (?, ?, ?)',
+                          (task_id, person_id, today))
+                db.record_change('task_completions', c.lastrowid, 'insert')
+
+            # Increment count
+            new_count = task.current_completions + 1
+            c.execute('UPDATE tasks SET current_completions = ? WHERE id = ?', (new_count, task_id))
+            db.record_change('tasks', task_id, 'update')
+
+            # Check if fully complete
+            if new_count >= task.required_completions:
+                # Advance Date
+                now = datetime.now()
+                last_completed = now.strftime('%Y-%m-%d')
+
+                frequency = task.frequency
                 days_to_add = 1
-            elif frequency == 'Weekly':
-                days_to_add = 7
-            elif frequency.startswith('Every '):
-                try:
-                    parts = frequency.split(' ')
-                    if len(parts) >= 2 and parts[1].isdigit():
-                        days_to_add = int(parts[1])
-                except:
-                    pass
-            
-            next_due = (now + timedelta(days=days_to_add)).strftime('%Y-%m-%d')
-            
-            # Reset completions for next cycle
-            c.execute('''
-                UPDATE tasks 
-                SET last_completed = ?, next_due = ?, current_completions = 0 
-                WHERE id = ?
-            ''', (last_completed, next_due, task_id))
-            
-        conn.commit()
-        
-    conn.close()
+
+                if frequency == 'Daily':
+                    days_to_add = 1
+                elif frequency == 'Weekly':
+                    days_to_add = 7
+                elif frequency.startswith('Every '):
+                    try:
+                        parts = frequency.split(' ')
+                        if len(parts) >= 2 and parts[1].isdigit():
+                            days_to_add = int(parts[1])
+                    except:
+                        pass
+
+                next_due = (now + timedelta(days=days_to_add)).strftime('%Y-%m-%d')
+
+                # Reset completions for next cycle
+                c.execute('''
+                    UPDATE tasks 
+                    SET last_completed = ?, next_due = ?, current_completions = 0 
+                    WHERE id = ?
+                ''', (last_completed, next_due, task_id))
 
 def delete_task(task_id):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-    c.execute('DELETE FROM task_completions WHERE task_id = ?', (task_id,))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    with db.transaction() as conn:
+        conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
+        conn.execute('DELETE FROM task_completions WHERE task_id = ?', (task_id,))
+        db.record_change('tasks', task_id, 'delete')
+        db.record_change('task_completions', None, 'delete')
 
 def get_task(task_id):
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
-    row = c.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    return get_db().fetch_record(Task, f'SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?', (task_id,))
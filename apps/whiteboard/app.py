@@ -1,13 +1,14 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QGraphicsView, QGraphicsScene, QGraphicsPathItem, 
                              QMessageBox, QFrame, QGraphicsPixmapItem)
-from PySide6.QtCore import Qt, QPointF, QRectF, QTimer
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer, Signal
 from PySide6.QtGui import QPen, QPainter, QPainterPath, QColor, QBrush, QPixmap, QImage
 import os
 import threading
 
 from src.ui.resolution_manager import ResolutionManager
 from src.ui.theme import Theme
+from src.ui.scroll_state import restore_scroll_position
 
 """
 Whiteboard Application Module.
@@ -22,8 +23,11 @@ class WhiteboardApp(QWidget):
     The main view for the Whiteboard application.
 
     This widget hosts the drawing area and the toolbar for selecting tools
-    and clearing the board.
+    and clearing the board. Emits `content_changed` after every stroke and
+    whenever the board is cleared or loaded.
     """
+    content_changed = Signal()
+
     def __init__(self, language_manager=None):
         """
         Initializes the Whiteboard application.
@@ -170,6 +174,7 @@ class WhiteboardApp(QWidget):
         self.pen_btn.setText(pen_text)
         self.eraser_btn.setText(eraser_text)
         self.clear_btn.setText(clear_text)
+        self.content_changed.emit()
 
     def select_pen(self):
         """Switches the active tool to the Pen."""
@@ -207,6 +212,7 @@ class WhiteboardApp(QWidget):
         
         self.pen_btn.setStyleSheet(active_style if self.current_tool == 'pen' else inactive_style)
         self.eraser_btn.setStyleSheet(active_style if self.current_tool == 'eraser' else inactive_style)
+        self.content_changed.emit()
 
     def confirm_clear(self):
         """Prompts the user for confirmation before clearing the board."""
@@ -226,16 +232,45 @@ class WhiteboardApp(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             self.scene.clear()
             self.save_canvas()
+            self.content_changed.emit()
 
     def trigger_save(self):
         """
         Restarts the debounce timer for auto-saving.
         """
         self.save_timer.start()
+        self.content_changed.emit()
 
-    def save_canvas(self):
+    def save_state(self):
+        """
+        Writes any pending strokes to disk and remembers the tool and view
+        position before the app is unloaded.
+        """
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            # The next instance loads the file right away, so don't leave it half written
+            self.save_canvas(blocking=True)
+        return {
+            "tool": self.current_tool,
+            "scroll": [self.view.horizontalScrollBar().value(), self.view.verticalScrollBar().value()]
+        }
+
+    def restore_state(self, state):
+        """Picks the previous tool again and scrolls back to where we were."""
+        if state.get("tool") == 'eraser':
+            self.select_eraser()
+        else:
+            self.select_pen()
+        scroll = state.get("scroll", [0, 0])
+        restore_scroll_position(self.view.horizontalScrollBar(), scroll[0])
+        restore_scroll_position(self.view.verticalScrollBar(), scroll[1])
+
+    def save_canvas(self, blocking=False):
         """
         Saves the current state of the canvas to a PNG file in a background thread.
+
+        Args:
+            blocking (bool): Wait until the file is written.
         """
         # Create a pixmap large enough to hold the scene content
         rect = self.scene.sceneRect()
@@ -257,6 +292,8 @@ class WhiteboardApp(QWidget):
         # Run in a separate thread to avoid blocking the UI
         thread = threading.Thread(target=save_task, args=(image, self.save_file))
         thread.start()
+        if blocking:
+            thread.join()
 
     def load_canvas(self):
         """
@@ -266,6 +303,7 @@ class WhiteboardApp(QWidget):
             pixmap = QPixmap(self.save_file)
             if not pixmap.isNull():
                 self.scene.addPixmap(pixmap)
+                self.content_changed.emit()
 
 class DrawingView(QGraphicsView):
     """
@@ -1,23 +1,68 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication
+import time
 
 # Ensure the project root is in the Python path for module resolution
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from apps.hub.ui import HubWindow
+from src.core.startup_profiler import startup_profiler
+from src.core.query_profiler import query_profiler
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_SQL_FLAG = "--profile-sql"
+
+def enable_startup_profiling(argv):
+    """
+    Turns on the startup profiler if `--profile-startup[=path]` was passed.
+
+    The flag is removed from argv so Qt never sees it. This has to run before
+    the hub modules are imported, otherwise their import time isn't captured.
+    """
+    for arg in list(argv):
+        if arg == PROFILE_FLAG or arg.startswith(PROFILE_FLAG + "="):
+            argv.remove(arg)
+            output_path = arg.partition("=")[2]
+            if not output_path:
+                from src.core.paths import DATA_DIR
+                output_path = os.path.join(DATA_DIR, "startup_trace.json")
+            startup_profiler.enable(output_path)
+
+def enable_sql_profiling(argv):
+    """
+    Turns on the query profiler if `--profile-sql[=path]` was passed.
+
+    The stats are written when the hub exits.
+    """
+    for arg in list(argv):
+        if arg == PROFILE_SQL_FLAG or arg.startswith(PROFILE_SQL_FLAG + "="):
+            argv.remove(arg)
+            output_path = arg.partition("=")[2]
+            if not output_path:
+                from src.core.paths import DATA_DIR
+                output_path = os.path.join(DATA_DIR, "query_stats.json")
+            query_profiler.enable(output_path)
+
+enable_startup_profiling(sys.argv)
+enable_sql_profiling(sys.argv)
+
+with startup_profiler.phase("import hub modules"):
+    from PySide6.QtWidgets import QApplication
+    from apps.hub.ui import HubWindow
 
 def main():
     """
-    Starts up the whole application, sets up the main window, and gets the 
+    Starts up the whole application, sets up the main window, and gets the
     event loop running.
     """
-    app = QApplication(sys.argv)
-    
+    with startup_profiler.phase("QApplication"):
+        app = QApplication(sys.argv)
+
     # Create and display the main hub window
     window = HubWindow()
+    show_start_ns = time.perf_counter_ns()
     window.show()
-    
+    startup_profiler.watch_first_paint(window, show_start_ns)
+
     # Start the event loop
     sys.exit(app.exec())
 
@@ -0,0 +1,124 @@
+"""
+Measures the pantry's inventory lookups with and without the schema v2
+indexes, on an inventory of 200k rows.
+
+    python scripts/bench_pantry_indexes.py [--rows 200000] [--ops 500]
+
+Both databases get the same data; one stays at schema v1 (no indexes) and
+uses the old select-then-insert/update way of adding stock, the other is
+migrated to v2 and uses the single UPSERT. Prints the average time per call
+and the query plan of each lookup.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# Ensure we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import Database
+from src.core.migrations import run_migrations
+from apps.pantry_manager.database import MIGRATIONS, INVENTORY_QUERY, WARNING_DAYS
+
+LOCATIONS = 8
+
+def fill(db, rows):
+    with db.transaction() as conn:
+        conn.executemany("INSERT OR IGNORE INTO locations (name, description) VALUES (?, '')",
+                         ((f"Location {i}",) for i in range(LOCATIONS)))
+        conn.executemany("INSERT INTO products (barcode, name, category, weight_volume) VALUES (?, ?, 'Bench', '1kg')",
+                         ((f"{i:08d}", f"Product {i}") for i in range(rows // 10)))
+        # Expiry dates spread over about two years, one row per (product, location, expiry)
+        conn.executemany("INSERT INTO inventory (barcode, location_id, expiry_date, quantity) VALUES (?, ?, date('2025-01-01', ?), 1)",
+                         ((f"{i % (rows // 10):08d}", 1 + i % LOCATIONS, f"+{(i // (rows // 10)) * 73 + i % 73} days")
+                          for i in range(rows)))
+
+def add_old(conn, barcode, location_id, expiry):
+    existing = conn.execute("SELECT id, quantity FROM inventory WHERE barcode = ? AND location_id = ? AND expiry_date = ?",
+                            (barcode, location_id, expiry)).fetchone()
+    if existing:
+        conn.execute("UPDATE inventory SET quantity = ? WHERE id = ?", (existing[1] + 1, existing[0]))
+    else:
+        conn.execute("INSERT INTO inventory (barcode, location_id, expiry_date, quantity) VALUES (?, ?, ?, 1)",
+                     (barcode, location_id, expiry))
+
+def add_upsert(conn, barcode, location_id, expiry):
+    # Same steps as DatabaseManager.add_product
+    conn.execute("SELECT id FROM inventory WHERE barcode = ? AND location_id = ? AND expiry_date = ?",
+                 (barcode, location_id, expiry)).fetchone()
+    conn.execute('''
+        INSERT INTO inventory (barcode, location_id, expiry_date, quantity) VALUES (?, ?, ?, 1)
+        ON CONFLICT(barcode, location_id, expiry_date) DO UPDATE SET quantity = quantity + excluded.quantity
+    ''', (barcode, location_id, expiry))
+
+def count_location(conn, location_id):
+    conn.execute("SELECT COUNT(*) FROM inventory WHERE location_id = ?", (location_id,)).fetchone()
+
+def expiring(conn, _):
+    conn.execute(INVENTORY_QUERY + "WHERE i.expiry_date <= date('2025-01-01', '+30 days') ORDER BY i.expiry_date ASC",
+                 (WARNING_DAYS,)).fetchall()
+
+def time_calls(db, func, args, per_call_transaction=False):
+    conn = db.connection()
+    start = time.perf_counter()
+    for call_args in args:
+        if per_call_transaction:
+            with db.transaction():
+                func(conn, *call_args)
+        else:
+            func(conn, call_args)
+    return (time.perf_counter() - start) / len(args) * 1000
+
+def plan(db, sql, params=()):
+    return "; ".join(row[3] for row in db.fetch_all(f"EXPLAIN QUERY PLAN {sql}", params))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    products = args.rows // 10
+    adds = [(f"{rng.randrange(products):08d}", 1 + rng.randrange(LOCATIONS), f"2025-01-{1 + rng.randrange(28):02d}")
+            for _ in range(args.ops)]
+    locations = [1 + rng.randrange(LOCATIONS) for _ in range(min(args.ops, 50))]
+
+    with tempfile.TemporaryDirectory() as folder:
+        old = Database(os.path.join(folder, "v1.db"))
+        run_migrations(old, MIGRATIONS[:1])
+        fill(old, args.rows)
+
+        new = Database(os.path.join(folder, "v2.db"))
+        run_migrations(new, MIGRATIONS[:1])
+        fill(new, args.rows)
+        start = time.perf_counter()
+        run_migrations(new, MIGRATIONS)
+        print(f"{args.rows} inventory rows; migrating to v2 took {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+        results = [
+            ("add_product", time_calls(old, add_old, adds, True), time_calls(new, add_upsert, adds, True)),
+            ("delete_location check", time_calls(old, count_location, locations), time_calls(new, count_location, locations)),
+            ("expiring inventory", time_calls(old, expiring, locations[:10]), time_calls(new, expiring, locations[:10])),
+        ]
+        print(f"{'Operation':<24}{'v1 (ms/call)':>14}{'v2 (ms/call)':>14}{'Speedup':>10}")
+        for name, before, after in results:
+            print(f"{name:<24}{before:>14.3f}{after:>14.3f}{before / after:>9.0f}x")
+
+        print("\nQuery plans (v1 -> v2):")
+        lookups = [
+            ("SELECT id, quantity FROM inventory WHERE barcode = ? AND location_id = ? AND expiry_date = ?", adds[0]),
+            ("SELECT COUNT(*) FROM inventory WHERE location_id = ?", (1,)),
+            (INVENTORY_QUERY + "WHERE i.expiry_date <= ? ORDER BY i.expiry_date ASC", (WARNING_DAYS, "2025-01-31")),
+        ]
+        for sql, params in lookups:
+            print(f"  {' '.join(sql.split())[:100]}\n    {plan(old, sql, params)}\n    {plan(new, sql, params)}")
+        old.close()
+        new.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares the ways query results used to be built with the typed records of
+`Database.fetch_records`, on a table with 100k rows.
+
+    python scripts/bench_records.py [--rows 100000] [--repeat 5]
+
+For each approach it prints the best time to fetch all rows and the memory
+the resulting list holds (measured with tracemalloc).
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+
+# Ensure we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import Database
+from apps.pantry_manager.database import InventoryEntry
+
+COLUMNS = ", ".join(InventoryEntry._fields)
+
+def fill(db, rows):
+    db.execute(f"CREATE TABLE entries ({COLUMNS})")
+    with db.transaction() as conn:
+        conn.executemany(f"INSERT INTO entries VALUES ({', '.join('?' * len(InventoryEntry._fields))})", (
+            (i, f"400{i:010d}", f"Product {i}", "Category", "2026-01-01", i % 7, "500g", "Fridge", i % 365, 0)
+            for i in range(rows)))
+
+def dicts_by_hand(db):
+    # What get_all_events did: build each dict from row indexes
+    return [{"id": r[0], "barcode": r[1], "name": r[2], "category": r[3], "expiry_date": r[4],
+             "quantity": r[5], "weight_volume": r[6], "location_name": r[7], "days_left": r[8], "status": r[9]}
+            for r in db.fetch_all(f"SELECT {COLUMNS} FROM entries")]
+
+def fetch_dicts(db):
+    # What the task board did
+    return db.fetch_dicts(f"SELECT {COLUMNS} FROM entries")
+
+def sqlite_rows(db):
+    # dict(row) over sqlite3.Row
+    cursor = db.connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    return [dict(row) for row in cursor.execute(f"SELECT {COLUMNS} FROM entries")]
+
+def plain_tuples(db):
+    # What the pantry did (fields by magic index)
+    return db.fetch_all(f"SELECT {COLUMNS} FROM entries")
+
+def records(db):
+    return db.fetch_records(InventoryEntry, f"SELECT {COLUMNS} FROM entries")
+
+APPROACHES = [
+    ("dict built by hand", dicts_by_hand),
+    ("fetch_dicts", fetch_dicts),
+    ("dict(sqlite3.Row)", sqlite_rows),
+    ("plain tuples", plain_tuples),
+    ("fetch_records", records),
+]
+
+def measure(db, func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(db)
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = func(db)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, held
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = Database(os.path.join(folder, "bench.db"))
+        fill(db, args.rows)
+
+        print(f"{args.rows} rows, best of {args.repeat}")
+        print(f"{'Approach':<22}{'Time (ms)':>12}{'Memory (MB)':>14}")
+        for name, func in APPROACHES:
+            seconds, held = measure(db, func, args.repeat)
+            print(f"{name:<22}{seconds * 1000:>12.1f}{held / 1e6:>14.1f}")
+        db.close()
+
+if __name__ == "__main__":
+    main()
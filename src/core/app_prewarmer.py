@@ -0,0 +1,97 @@
+"""
+App Prewarmer Module.
+
+Starting an app can be slow (databases, big scenes, network clients), so the
+dashboard no longer builds every app up front. Instead the most used apps are
+started one at a time in the background, whenever the event loop is idle.
+"""
+
+from collections import deque
+from typing import Dict, List
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+class AppPrewarmer(QObject):
+    """
+    Instantiates apps from a queue, one per event-loop pass.
+
+    Attributes:
+        app_ready (Signal): Emitted with (app_id, instance) after an app was started.
+        queue (deque): App IDs still waiting to be started.
+    """
+    app_ready = Signal(str, object)
+
+    # Give the dashboard a moment to paint before the first app is built
+    START_DELAY_MS = 100
+
+    def __init__(self, app_registry, language_manager=None, parent=None):
+        """
+        Sets up the prewarmer.
+
+        Args:
+            app_registry (AppRegistry): Where the apps come from.
+            language_manager (LanguageManager, optional): Passed on to the apps.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.app_registry = app_registry
+        self.language_manager = language_manager
+        self.queue = deque()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.process_next)
+
+    @staticmethod
+    def rank_apps(app_ids: List[str], launch_counts: Dict[str, int]) -> List[str]:
+        """
+        Orders apps by how often they were launched, most used first.
+
+        Apps with the same count keep their original order.
+
+        Args:
+            app_ids (List[str]): The candidate apps.
+            launch_counts (Dict[str, int]): Recorded launches per app.
+
+        Returns:
+            List[str]: The ranked app IDs.
+        """
+        return sorted(app_ids, key=lambda app_id: -launch_counts.get(app_id, 0))
+
+    def schedule(self, app_ids: List[str], launch_counts: Dict[str, int], budget: int):
+        """
+        Replaces the queue with the top `budget` apps by launch count.
+
+        Args:
+            app_ids (List[str]): Apps placed on the dashboard.
+            launch_counts (Dict[str, int]): Recorded launches per app.
+            budget (int): How many apps to keep warm. 0 turns prewarming off.
+        """
+        self.cancel()
+        ranked = self.rank_apps(app_ids, launch_counts)
+        self.queue.extend(ranked[:max(budget, 0)])
+        if self.queue:
+            self.timer.start(self.START_DELAY_MS)
+
+    def cancel(self):
+        """Drops everything that hasn't been started yet."""
+        self.timer.stop()
+        self.queue.clear()
+
+    def process_next(self):
+        """
+        Starts the next app in the queue and schedules the one after it.
+        """
+        while self.queue:
+            app_id = self.queue.popleft()
+            if self.app_registry.get_loaded_instance(app_id) is not None:
+                continue # Already running, nothing to do
+
+            instance = self.app_registry.get_app_instance(app_id, self.language_manager)
+            if instance is not None:
+                self.app_ready.emit(app_id, instance)
+            break
+
+        if self.queue:
+            # A zero timeout runs once pending events (input, paints) are handled
+            self.timer.start(0)
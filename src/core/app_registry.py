@@ -7,10 +7,14 @@ and makes sure everything is loaded correctly.
 
 import os
 import json
+import time
 import importlib
+import inspect
 import sys
 from typing import List, Dict, Any, Optional
 
+from src.core.manifest_index import ManifestIndex
+
 class AppRegistry:
     """
     Finds all the apps in the 'apps' folder and loads them up.
@@ -18,48 +22,194 @@ class AppRegistry:
     Attributes:
         apps_dir (str): Where we look for apps.
         apps (Dict): Keeps track of all the apps we found.
+        index (ManifestIndex): Optional on-disk cache of parsed manifests.
+        max_instances (int): How many apps may run at once (None for no limit).
+        idle_timeout (float): Seconds after which an unused app is unloaded (None to keep it).
+        metrics (Dict[str, int]): Counters for evictions and state restores.
+        settings_manager (SettingsManager): Handed to apps that take a `settings_manager` argument.
+
+    Apps can optionally implement `save_state()` (returning something we can
+    hold on to) and `restore_state(state)`. When an app is unloaded to free
+    memory, its state is saved and handed back after it is started again.
     """
 
-    def __init__(self, apps_dir: str):
+    def __init__(self, apps_dir: str, index_path: Optional[str] = None,
+                 max_instances: Optional[int] = None, idle_timeout: Optional[float] = None,
+                 settings_manager=None):
         """
         Sets up the registry and scans for apps.
 
         Args:
             apps_dir (str): The folder where apps live.
+            index_path (str, optional): Where to keep the manifest index. If not
+                given, every manifest is parsed on each scan.
+            max_instances (int, optional): Upper bound for running apps.
+            idle_timeout (float, optional): Idle seconds before an app is unloaded.
+            settings_manager (SettingsManager, optional): The hub's settings, shared with apps
+                so they don't each read their own copy of the file.
         """
         self.apps_dir = apps_dir
         self.apps: Dict[str, Dict[str, Any]] = {}
+        self.index = ManifestIndex(index_path) if index_path else None
+        self.max_instances = max_instances
+        self.idle_timeout = idle_timeout
+        self.metrics = {"evictions": 0, "restores": 0}
+        self.settings_manager = settings_manager
         self.scan_apps()
 
-    def scan_apps(self):
+    def scan_apps(self, force_rescan: bool = False):
         """
         Looks through the 'apps' folder to find valid apps with a manifest.
+
+        Unchanged apps are served from the manifest index when one is set up.
+
+        Args:
+            force_rescan (bool): Ignore the index and parse every manifest again.
         """
         self.apps = {}
         if not os.path.exists(self.apps_dir):
             return
 
+        use_index = self.index is not None and self.index.loaded and not force_rescan
+        seen_paths = []
+
         for entry in os.scandir(self.apps_dir):
-            if entry.is_dir():
+            if not entry.is_dir():
+                continue
+
+            stamp = ManifestIndex.get_stamp(entry.path)
+            if stamp is None:
+                continue
+
+            manifest = self.index.lookup(entry.path, stamp) if use_index else None
+            if manifest is None:
                 manifest_path = os.path.join(entry.path, "manifest.json")
-                if os.path.exists(manifest_path):
-                    try:
-                        with open(manifest_path, 'r') as f:
-                            manifest = json.load(f)
-                            
-                        app_id = manifest.get("id")
-                        if not app_id:
-                            continue
-                            
-                        self.apps[app_id] = {
-                            "name": manifest.get("name", "Unknown App"),
-                            "entry_point": manifest.get("entry_point"),
-                            "path": entry.path,
-                            "instance": None,
-                            "class": None
-                        }
-                    except Exception as e:
-                        print(f"Error loading manifest for {entry.name}: {e}")
+                try:
+                    with open(manifest_path, 'r') as f:
+                        manifest = json.load(f)
+                except Exception as e:
+                    print(f"Error loading manifest for {entry.name}: {e}")
+                    continue
+
+                if self.index is not None:
+                    self.index.store(entry.path, stamp, manifest)
+
+            seen_paths.append(entry.path)
+            self.register_manifest(entry.path, manifest)
+
+        if self.index is not None:
+            self.index.prune(seen_paths)
+            self.index.loaded = True
+            self.index.save()
+
+    def register_manifest(self, app_path: str, manifest: Dict[str, Any]):
+        """
+        Adds an app from its parsed manifest.
+
+        Args:
+            app_path (str): The app folder.
+            manifest (Dict): The parsed manifest.
+        """
+        if not isinstance(manifest, dict):
+            return
+
+        app_id = manifest.get("id")
+        if not app_id:
+            return
+
+        self.apps[app_id] = {
+            "name": manifest.get("name", "Unknown App"),
+            "entry_point": manifest.get("entry_point"),
+            "path": app_path,
+            "instance": None,
+            "class": None,
+            "last_used": None,
+            "saved_state": None
+        }
+
+    def reload_app_dir(self, app_path: str) -> Optional[str]:
+        """
+        Picks up changes to a single app folder without touching the others.
+
+        The app's running instance (if any) is unloaded with its state saved,
+        its modules are dropped from `sys.modules` and the manifest is read
+        again, so the next launch runs the new code and gets its state back.
+        A folder that was deleted or lost its manifest is unregistered.
+
+        Args:
+            app_path (str): The app folder that changed.
+
+        Returns:
+            str: The ID of the affected app, or None if nothing was registered there.
+        """
+        app_path = os.path.abspath(app_path)
+        old_id = next((app_id for app_id, data in self.apps.items()
+                       if os.path.abspath(data["path"]) == app_path), None)
+
+        saved_state = None
+        if old_id is not None:
+            self.evict_app(old_id)
+            saved_state = self.apps.pop(old_id).get("saved_state")
+            self.unload_modules(old_id)
+
+        manifest = None
+        stamp = ManifestIndex.get_stamp(app_path)
+        if stamp is not None:
+            try:
+                with open(os.path.join(app_path, "manifest.json"), 'r') as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                print(f"Error loading manifest for {os.path.basename(app_path)}: {e}")
+
+        if self.index is not None:
+            if isinstance(manifest, dict):
+                self.index.store(app_path, stamp, manifest)
+            self.index.prune([data["path"] for data in self.apps.values()] + ([app_path] if manifest else []))
+            self.index.save()
+
+        if not isinstance(manifest, dict) or not manifest.get("id"):
+            return old_id
+
+        self.register_manifest(app_path, manifest)
+        new_id = manifest["id"]
+        if new_id == old_id:
+            self.apps[new_id]["saved_state"] = saved_state
+        return new_id
+
+    @staticmethod
+    def unload_modules(app_id: str):
+        """
+        Forgets the imported modules of an app so they are executed again on next use.
+
+        Args:
+            app_id (str): The ID of the app.
+        """
+        package = f"apps.{app_id}"
+        for module_name in [name for name in sys.modules if name == package or name.startswith(package + ".")]:
+            del sys.modules[module_name]
+        importlib.invalidate_caches()
+
+    def validate_index(self) -> List[Dict[str, str]]:
+        """
+        Reports manifest index entries that no longer match the disk.
+
+        This doesn't touch the index or the loaded apps; call
+        `scan_apps` afterwards to pick up the changes.
+
+        Returns:
+            List[Dict[str, str]]: Stale entries with 'path' and 'reason'. Apps
+            on disk that aren't indexed yet are reported as 'unindexed'.
+        """
+        if self.index is None:
+            return []
+
+        stale = self.index.find_stale()
+        if os.path.exists(self.apps_dir):
+            for entry in os.scandir(self.apps_dir):
+                if (entry.is_dir() and entry.path not in self.index.entries
+                        and ManifestIndex.get_stamp(entry.path) is not None):
+                    stale.append({"path": entry.path, "reason": "unindexed"})
+        return stale
 
     def get_app_list(self, language_manager=None) -> List[Dict[str, Any]]:
         """
@@ -75,14 +225,26 @@ class AppRegistry:
         for k, v in self.apps.items():
             name = v["name"]
             if isinstance(name, dict) and language_manager:
-                lang = language_manager.current_language
-                name = name.get(lang, name.get("en", "Unknown App"))
+                name = language_manager.localize(name, "Unknown App")
             elif isinstance(name, dict):
                 name = name.get("en", "Unknown App")
                 
             apps_list.append({"id": k, "name": name})
         return apps_list
 
+    def get_loaded_instance(self, app_id: str) -> Optional[Any]:
+        """
+        Gets the app's instance only if it is already running.
+
+        Args:
+            app_id (str): The ID of the app.
+
+        Returns:
+            The running instance, or None if the app hasn't been started.
+        """
+        app_data = self.apps.get(app_id)
+        return app_data["instance"] if app_data else None
+
     def get_app_instance(self, app_id: str, language_manager=None) -> Optional[Any]:
         """
         Gets the running instance of an app, or starts it if it's not running.
@@ -99,6 +261,7 @@ class AppRegistry:
             
         app_data = self.apps[app_id]
         if app_data["instance"]:
+            self.touch(app_id)
             return app_data["instance"]
             
         # Load class if not loaded
@@ -122,17 +285,145 @@ class AppRegistry:
         if app_data["class"]:
             try:
                 # Try passing language_manager if available
+                kwargs = {}
                 if language_manager:
+                    kwargs["language_manager"] = language_manager
+                if self.settings_manager and self.takes_argument(app_data["class"], "settings_manager"):
+                    kwargs["settings_manager"] = self.settings_manager
+                if kwargs:
                     try:
-                        app_data["instance"] = app_data["class"](language_manager=language_manager)
+                        app_data["instance"] = app_data["class"](**kwargs)
                     except TypeError:
                         # Fallback to no args
                         app_data["instance"] = app_data["class"]()
                 else:
                     app_data["instance"] = app_data["class"]()
-                    
-                return app_data["instance"]
             except Exception as e:
                 print(f"Error instantiating app {app_id}: {e}")
+                return None
+
+            self.touch(app_id)
+            self.restore_app_state(app_id)
+            return app_data["instance"]
                 
         return None
+
+    @staticmethod
+    def takes_argument(app_class, name: str) -> bool:
+        """Whether the app's constructor has a parameter with that name."""
+        try:
+            return name in inspect.signature(app_class).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def touch(self, app_id: str, now: Optional[float] = None):
+        """
+        Marks an app as just used, so it isn't unloaded any time soon.
+
+        Args:
+            app_id (str): The ID of the app.
+            now (float, optional): The time to record (monotonic seconds).
+        """
+        if app_id in self.apps:
+            self.apps[app_id]["last_used"] = time.monotonic() if now is None else now
+
+    def restore_app_state(self, app_id: str):
+        """
+        Hands a freshly started app the state it had when it was unloaded.
+
+        Args:
+            app_id (str): The ID of the app.
+        """
+        app_data = self.apps[app_id]
+        state = app_data.get("saved_state")
+        instance = app_data["instance"]
+        if state is None or not hasattr(instance, "restore_state"):
+            return
+
+        app_data["saved_state"] = None
+        try:
+            instance.restore_state(state)
+            self.metrics["restores"] += 1
+        except Exception as e:
+            print(f"Error restoring state of app {app_id}: {e}")
+
+    def evict_app(self, app_id: str) -> bool:
+        """
+        Unloads a running app, saving its state first if it supports that.
+
+        Args:
+            app_id (str): The ID of the app.
+
+        Returns:
+            bool: True if an instance was unloaded.
+        """
+        app_data = self.apps.get(app_id)
+        if not app_data or not app_data["instance"]:
+            return False
+
+        instance = app_data["instance"]
+        if hasattr(instance, "save_state"):
+            try:
+                app_data["saved_state"] = instance.save_state()
+            except Exception as e:
+                print(f"Error saving state of app {app_id}: {e}")
+
+        app_data["instance"] = None
+        app_data["last_used"] = None
+        if hasattr(instance, "close"):
+            instance.close()
+        if hasattr(instance, "deleteLater"):
+            instance.deleteLater()
+
+        self.metrics["evictions"] += 1
+        return True
+
+    def evict_idle(self, now: Optional[float] = None, protected=()) -> List[str]:
+        """
+        Unloads apps that have been idle too long, then the least recently used
+        ones until we are within `max_instances`.
+
+        Args:
+            now (float, optional): Current monotonic time (for tests).
+            protected (Iterable[str]): Apps that must stay loaded, e.g. the one on screen.
+
+        Returns:
+            List[str]: The IDs of the apps that were unloaded.
+        """
+        now = time.monotonic() if now is None else now
+        protected = set(protected)
+        running = [
+            (data.get("last_used") or 0, app_id)
+            for app_id, data in self.apps.items()
+            if data["instance"] and app_id not in protected
+        ]
+        running.sort() # Least recently used first
+
+        evicted = []
+        if self.idle_timeout is not None:
+            for last_used, app_id in running:
+                if now - last_used > self.idle_timeout:
+                    evicted.append(app_id)
+
+        if self.max_instances is not None:
+            loaded = sum(1 for data in self.apps.values() if data["instance"]) - len(evicted)
+            for last_used, app_id in running:
+                if loaded <= self.max_instances:
+                    break
+                if app_id not in evicted:
+                    evicted.append(app_id)
+                    loaded -= 1
+
+        for app_id in evicted:
+            self.evict_app(app_id)
+        return evicted
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Returns eviction statistics.
+
+        Returns:
+            Dict[str, int]: 'evictions', 'restores' and the current number of 'loaded' apps.
+        """
+        loaded = sum(1 for data in self.apps.values() if data["instance"])
+        return dict(self.metrics, loaded=loaded)
@@ -0,0 +1,362 @@
+"""
+Backup Manager Module.
+
+Snapshots everything `reset_application_data` would delete (the app
+databases, the whiteboard and the config files) into a single zip archive,
+and puts such a snapshot back.
+
+Databases are copied with SQLite's online backup API a few pages at a time,
+so apps can keep writing while a backup runs. All the work happens on a
+background thread; only the final swap of the restored files runs on the GUI
+thread, after everything was unpacked and checked.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import zipfile
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from src.core.paths import CONFIG_DIR, DATA_DIR
+from src.core.data_manager import APP_DATABASES, APP_DATA_FILES
+from src.core.database import close_database
+from src.core.query_runner import shutdown_worker_pool
+from src.core.settings_manager import SettingsManager
+from src.ui.preview_cache import clear_preview_caches
+
+class BackupManager(QObject):
+    """
+    Creates, rotates and restores backup archives.
+
+    Attributes:
+        progress (Signal): Emitted with a short status text while a job runs.
+        backup_finished (Signal): Emitted with the path of the new archive.
+        restore_finished (Signal): Emitted with the archive that was restored.
+        failed (Signal): Emitted with an error message if a job fails.
+        backup_dir (str): Where archives are kept.
+        keep (int): How many archives to keep; older ones are deleted.
+        PAGES_PER_STEP (int): Database pages copied per backup step.
+        FORMAT_VERSION (int): Written to the archive's manifest.
+    """
+    progress = Signal(str)
+    backup_finished = Signal(str)
+    restore_finished = Signal(str)
+    failed = Signal(str)
+    _restore_staged = Signal(str, str)
+
+    PAGES_PER_STEP = 64
+    STEP_PAUSE = 0.005 # seconds between steps, lets writers in
+    FORMAT_VERSION = 1
+    ARCHIVE_PREFIX = "hub-backup-"
+
+    def __init__(self, backup_dir: str = None, keep: int = 5, data_dir: str = DATA_DIR,
+                 config_dir: str = CONFIG_DIR, settings_manager: SettingsManager = None, parent=None):
+        """
+        Sets up the manager.
+
+        Args:
+            backup_dir (str, optional): Where archives go. Defaults to 'data/backups'.
+            keep (int): How many archives to keep.
+            data_dir (str): The data folder (databases and whiteboard).
+            config_dir (str): The config folder.
+            settings_manager (SettingsManager, optional): Reloaded after a restore, so
+                its pending writes don't end up over the restored settings file.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self.config_dir = config_dir
+        self.backup_dir = backup_dir or os.path.join(data_dir, "backups")
+        self.keep = keep
+        self.settings_manager = settings_manager
+        self.thread: Optional[threading.Thread] = None
+        self._restore_staged.connect(self.finish_restore)
+
+    # --- Archive contents ---
+
+    def data_files(self) -> List[Tuple[str, str]]:
+        """Returns (archive name, path) of every file that belongs in a backup."""
+        files = [(f"data/{name}", os.path.join(self.data_dir, name)) for name in APP_DATABASES + APP_DATA_FILES]
+        if os.path.isdir(self.config_dir):
+            for name in sorted(os.listdir(self.config_dir)):
+                if name.endswith(".json"):
+                    files.append((f"config/{name}", os.path.join(self.config_dir, name)))
+        return files
+
+    def target_path(self, arcname: str) -> Optional[str]:
+        """
+        Maps an archive member back to where it belongs, or None if it doesn't
+        belong anywhere (so a crafted archive can't write outside our folders).
+        """
+        folder, _, name = arcname.partition("/")
+        if not name or "/" in name or "\\" in name or name in (".", ".."):
+            return None
+        if folder == "data" and name in APP_DATABASES + APP_DATA_FILES:
+            return os.path.join(self.data_dir, name)
+        if folder == "config" and name.endswith(".json"):
+            return os.path.join(self.config_dir, name)
+        return None
+
+    def list_backups(self) -> List[str]:
+        """Returns the archives in the backup folder, newest first."""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        names = [n for n in os.listdir(self.backup_dir) if n.startswith(self.ARCHIVE_PREFIX) and n.endswith(".zip")]
+        return [os.path.join(self.backup_dir, n) for n in sorted(names, reverse=True)]
+
+    # --- Backup ---
+
+    def copy_database(self, source_path: str, target_path: str, report: Callable[[int, int], None] = None):
+        """
+        Copies a live database with the online backup API, page batch by page batch.
+
+        Args:
+            source_path (str): The database to copy.
+            target_path (str): Where the copy goes.
+            report (Callable, optional): Gets (pages left, total pages) after each step.
+        """
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            progress = (lambda status, remaining, total: report(remaining, total)) if report else None
+            source.backup(target, pages=self.PAGES_PER_STEP, progress=progress, sleep=self.STEP_PAUSE)
+        finally:
+            target.close()
+            source.close()
+
+    def create_backup(self) -> str:
+        """
+        Writes a new archive and drops the oldest ones beyond `keep`.
+
+        Blocks until done; use `start_backup` from the UI.
+
+        Returns:
+            str: The new archive.
+        """
+        SettingsManager.flush_pending() # The file on disk should match what's on screen
+        os.makedirs(self.backup_dir, exist_ok=True)
+
+        now = datetime.now()
+        archive_path = os.path.join(self.backup_dir, f"{self.ARCHIVE_PREFIX}{now.strftime('%Y%m%d-%H%M%S-%f')}.zip")
+        tmp_path = f"{archive_path}.tmp"
+        manifest = {"format": self.FORMAT_VERSION, "created": now.isoformat(), "files": []}
+
+        with tempfile.TemporaryDirectory(dir=self.backup_dir) as scratch:
+            try:
+                with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                    for arcname, path in self.data_files():
+                        if not os.path.exists(path):
+                            continue
+                        self.progress.emit(arcname)
+                        if path.endswith(".db"):
+                            snapshot = os.path.join(scratch, os.path.basename(path))
+                            self.copy_database(path, snapshot, lambda remaining, total, name=arcname:
+                                               self.progress.emit(f"{name} {100 * (total - remaining) // max(total, 1)}%"))
+                            archive.write(snapshot, arcname)
+                            os.remove(snapshot)
+                        else:
+                            archive.write(path, arcname)
+                        manifest["files"].append(arcname)
+                    archive.writestr("manifest.json", json.dumps(manifest, indent=4))
+                os.replace(tmp_path, archive_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        self.rotate()
+        return archive_path
+
+    def rotate(self):
+        """Deletes the oldest archives so only `keep` remain."""
+        for path in self.list_backups()[max(self.keep, 1):]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error removing old backup {path}: {e}")
+
+    # --- Restore ---
+
+    def stage_restore(self, archive_path: str) -> str:
+        """
+        Unpacks an archive next to the live files and checks it.
+
+        Nothing live is touched yet, so a broken archive can't do any harm.
+
+        Args:
+            archive_path (str): The archive to restore.
+
+        Returns:
+            str: The staging folder to hand to `apply_restore`.
+
+        Raises:
+            ValueError: If the archive isn't a valid backup.
+        """
+        staging = tempfile.mkdtemp(prefix=".restore-", dir=self.data_dir)
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                try:
+                    manifest = json.loads(archive.read("manifest.json"))
+                except KeyError:
+                    raise ValueError("Not a hub backup (no manifest)")
+                if manifest.get("format") != self.FORMAT_VERSION:
+                    raise ValueError(f"Unsupported backup format {manifest.get('format')}")
+                if archive.testzip() is not None:
+                    raise ValueError("Backup archive is damaged")
+
+                for arcname in manifest.get("files", []):
+                    if self.target_path(arcname) is None:
+                        raise ValueError(f"Unexpected file in backup: {arcname}")
+                    self.progress.emit(arcname)
+                    staged = os.path.join(staging, arcname.replace("/", "__"))
+                    with archive.open(arcname) as src, open(staged, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    if arcname.endswith(".db"):
+                        self.check_database(staged)
+
+            with open(os.path.join(staging, "manifest.json"), "w") as f:
+                json.dump(manifest, f)
+            return staging
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def check_database(path: str):
+        """Raises ValueError unless the file is an intact SQLite database."""
+        try:
+            conn = sqlite3.connect(path)
+            try:
+                result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            raise ValueError(f"{os.path.basename(path)} is not a valid database: {e}")
+        if result != "ok":
+            raise ValueError(f"{os.path.basename(path)} is damaged: {result}")
+
+    def apply_restore(self, staging: str):
+        """
+        Swaps the staged files in for the live ones, all or nothing.
+
+        Every live file that is about to be replaced or removed (including
+        database WAL/SHM files) is first moved into a rollback folder, then the
+        staged files are moved into place. If any step fails, the restored files
+        are taken out again and the old ones moved back. App data missing from
+        the backup ends up removed, so the result matches the snapshot.
+        Run on the GUI thread: the database connections are closed first.
+
+        Args:
+            staging (str): A folder prepared by `stage_restore`.
+        """
+        with open(os.path.join(staging, "manifest.json")) as f:
+            restored = set(json.load(f).get("files", []))
+
+        # Nothing may hold a connection to a file we are about to replace
+        shutdown_worker_pool()
+        for name in APP_DATABASES:
+            close_database(os.path.join(self.data_dir, name))
+
+        targets = dict(self.data_files())
+        targets.update((arcname, self.target_path(arcname)) for arcname in restored)
+
+        rollback = tempfile.mkdtemp(prefix=".rollback-", dir=self.data_dir)
+        moved = [] # (live path, where it was put aside)
+        placed = [] # Restored files now in place
+        try:
+            for arcname, path in targets.items():
+                if arcname not in restored and not arcname.startswith("data/"):
+                    continue # Config files the backup doesn't have stay as they are
+                paths = [path]
+                if arcname.startswith("data/") and path.endswith(".db"):
+                    # A leftover WAL would be replayed onto the restored file
+                    paths += [path + "-wal", path + "-shm"]
+                for live in paths:
+                    if os.path.exists(live):
+                        aside = os.path.join(rollback, str(len(moved)))
+                        os.replace(live, aside)
+                        moved.append((live, aside))
+
+            for arcname in restored:
+                staged = os.path.join(staging, arcname.replace("/", "__"))
+                if os.path.exists(staged):
+                    path = targets[arcname]
+                    os.replace(staged, path)
+                    placed.append(path)
+        except Exception:
+            for path in placed:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing restored file {path}: {e}")
+            for live, aside in reversed(moved):
+                try:
+                    os.replace(aside, live)
+                except OSError as e:
+                    print(f"Error putting back {live} (a copy is in {rollback}): {e}")
+                    raise
+            shutil.rmtree(rollback, ignore_errors=True)
+            raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        shutil.rmtree(rollback, ignore_errors=True)
+        # Cached dashboard previews show the old data
+        clear_preview_caches()
+        shutil.rmtree(os.path.join(self.data_dir, "previews"), ignore_errors=True)
+
+    # --- Background jobs ---
+
+    def is_busy(self) -> bool:
+        """Whether a backup or restore is running."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def start_backup(self):
+        """Creates a backup in the background. Emits `backup_finished` or `failed`."""
+        def job():
+            try:
+                self.backup_finished.emit(self.create_backup())
+            except Exception as e:
+                self.failed.emit(str(e))
+        self._start(job)
+
+    def start_restore(self, archive_path: str):
+        """
+        Restores an archive. It is unpacked and checked in the background, then
+        swapped in on the GUI thread. Emits `restore_finished` or `failed`.
+
+        Args:
+            archive_path (str): The archive to restore.
+        """
+        def job():
+            try:
+                self._restore_staged.emit(self.stage_restore(archive_path), archive_path)
+            except Exception as e:
+                self.failed.emit(str(e))
+        self._start(job)
+
+    def finish_restore(self, staging: str, archive_path: str):
+        """Swaps the staged files in and picks up the restored settings. Runs on the GUI thread."""
+        # A debounced settings write must not land on top of the restored file
+        SettingsManager.flush_pending()
+        try:
+            self.apply_restore(staging)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            if self.settings_manager:
+                self.settings_manager.reload()
+        self.restore_finished.emit(archive_path)
+
+    def _start(self, job):
+        if self.is_busy():
+            self.failed.emit("A backup or restore is already running")
+            return
+        self.thread = threading.Thread(target=job, daemon=True)
+        self.thread.start()
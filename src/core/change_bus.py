@@ -0,0 +1,131 @@
+"""
+Change Bus Module.
+
+Tells apps, widgets and the dashboard when stored data actually changed, so
+they can refresh then instead of polling. The database layer publishes a
+`DataChange` for every committed write (see `Database.record_change`).
+
+Writes from other processes (e.g. `scripts/seed_data.py`) can't publish, so
+watched databases are also checked with `PRAGMA data_version`, which moves
+whenever another connection committed. Those show up as a change without a
+table, meaning "anything in this file may have changed".
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+class DataChange(NamedTuple):
+    """
+    One committed write.
+
+    Attributes:
+        database (str): Absolute path of the database file.
+        table (str): The table written to, or None for an external change.
+        row_id: The affected row's id (or primary key), None if unknown or several.
+        op (str): 'insert', 'update', 'delete' or 'external'.
+    """
+    database: str
+    table: Optional[str]
+    row_id: Optional[object]
+    op: str
+
+    def affects(self, database: str, tables: Iterable[str] = ()) -> bool:
+        """
+        Whether this change may affect data read from the given tables.
+
+        Args:
+            database (str): The database file the reader uses.
+            tables (Iterable[str]): The tables it reads. Empty means any.
+        """
+        if self.database != database:
+            return False
+        tables = tuple(tables)
+        return self.table is None or not tables or self.table in tables
+
+class ChangeBus(QObject):
+    """
+    Publishes data changes to whoever is interested.
+
+    Attributes:
+        changed (Signal): Emitted with a `DataChange`. Changes published from
+            worker threads are delivered on the GUI thread.
+        POLL_MS (int): How often watched databases are checked for external writes.
+    """
+    changed = Signal(object)
+
+    POLL_MS = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watched: Dict[str, Tuple[object, int, int]] = {} # path -> (db, data_version, commit_count)
+        self.timer = None
+
+    def publish(self, change: DataChange):
+        """Announces a committed write. Safe to call from any thread."""
+        self.changed.emit(change)
+
+    def watch(self, db):
+        """
+        Starts checking a database for writes from other processes.
+
+        Call this from the GUI thread. Watching the same database again does nothing.
+
+        Args:
+            db (Database): The database to watch.
+        """
+        if db.path in self.watched:
+            return
+        self.watched[db.path] = (db, self.read_data_version(db), db.commit_count)
+
+        if self.timer is None:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.check_external_changes)
+            self.timer.start(self.POLL_MS)
+
+    @staticmethod
+    def read_data_version(db) -> int:
+        return db.fetch_one("PRAGMA data_version")[0]
+
+    def check_external_changes(self):
+        """
+        Publishes a change for every watched database that someone else wrote to.
+
+        `data_version` also moves for commits from our own worker threads
+        (they use other connections), which were announced already. If we
+        committed since the last check, the move is put down to us.
+        """
+        from src.core.database import get_database
+
+        for path, (old_db, old_version, old_commits) in list(self.watched.items()):
+            if not os.path.exists(path):
+                continue # Deleted by a data reset; don't recreate it
+            db = get_database(path)
+            try:
+                version = self.read_data_version(db)
+            except Exception as e:
+                print(f"Error checking {path} for changes: {e}")
+                continue
+            commits = db.commit_count
+            self.watched[path] = (db, version, commits)
+            if db is not old_db:
+                continue # Reopened since the last check, nothing to compare with
+            if version != old_version and commits == old_commits:
+                self.publish(DataChange(path, None, None, "external"))
+
+_bus: Optional[ChangeBus] = None
+_bus_lock = threading.Lock()
+
+def get_change_bus() -> ChangeBus:
+    """Returns the application-wide change bus."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = ChangeBus()
+            # Writes on worker threads may get here first; the bus belongs to the GUI thread
+            app = QCoreApplication.instance()
+            if app is not None and _bus.thread() is not app.thread():
+                _bus.moveToThread(app.thread())
+        return _bus
@@ -1,16 +1,31 @@
+import os
+import shutil
+
 from src.core.paths import get_db_path, get_config_path
+from src.core.database import close_database
+from src.core.query_runner import shutdown_worker_pool
+from src.ui.preview_cache import clear_preview_caches
+
+# User data in the data folder, shared with the backup manager
+APP_DATABASES = ["tasks.db", "lebensmittel.db", "events.db"]
+APP_DATA_FILES = ["whiteboard.png"]
 
 def reset_application_data():
     """
     Deletes all application data databases and configuration files to reset the app to a clean state.
     """
+    databases = [get_db_path(name) for name in APP_DATABASES]
+
     files_to_delete = [
-        get_db_path("tasks.db"),
-        get_db_path("lebensmittel.db"),
-        get_db_path("events.db"),
-        get_config_path("weather_config.json"),
-        get_db_path("whiteboard.png")
-    ]
+        get_config_path("weather_config.json")
+    ] + [get_db_path(name) for name in APP_DATA_FILES]
+
+    # Let background queries finish before their connections are closed
+    shutdown_worker_pool()
+    for db_path in databases:
+        # Pooled connections would keep writing to the deleted files
+        close_database(db_path)
+        files_to_delete += [db_path, f"{db_path}-wal", f"{db_path}-shm"]
     
     deleted_files = []
     errors = []
@@ -22,5 +37,15 @@ def reset_application_data():
                 deleted_files.append(file_path)
             except Exception as e:
                 errors.append(f"Failed to delete {file_path}: {e}")
+
+    # Cached dashboard previews show the old data, so they go too
+    clear_preview_caches()
+    previews_dir = get_db_path("previews")
+    if os.path.isdir(previews_dir):
+        try:
+            shutil.rmtree(previews_dir)
+            deleted_files.append(previews_dir)
+        except Exception as e:
+            errors.append(f"Failed to delete {previews_dir}: {e}")
                 
     return deleted_files, errors
@@ -0,0 +1,276 @@
+"""
+Database Module.
+
+Shared SQLite access for the built-in apps. Instead of opening a new
+connection for every query, each database file gets one `Database` object
+that hands out a single long-lived connection per thread. Connections run in
+WAL mode with `synchronous=NORMAL`, keep their prepared statements cached and
+only write inside explicit `transaction()` blocks.
+
+Query results can come back as typed records: `fetch_records` builds one
+`NamedTuple` per row straight from the cursor (see `record_factory`), which
+is cheaper than a dict per row and spells out what a query returns.
+"""
+
+import os
+import sqlite3
+import threading
+import contextlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+
+from src.core.change_bus import DataChange, get_change_bus
+from src.core.query_profiler import ProfiledConnection, query_profiler
+
+R = TypeVar("R", bound=tuple)
+
+def record_factory(record_type: Type[R]) -> Callable[[sqlite3.Cursor, tuple], R]:
+    """
+    Returns a `row_factory` that turns each row into a `record_type`.
+
+    The record is built directly from the row tuple, so there is no
+    intermediate dict and no name lookup per row.
+
+    Args:
+        record_type (Type[NamedTuple]): The record class; its fields must
+            match the query's columns, in order.
+    """
+    new = tuple.__new__
+    return lambda cursor, row: new(record_type, row)
+
+class Database:
+    """
+    A pool of per-thread connections to one SQLite file.
+
+    Attributes:
+        path (str): The database file.
+        synchronous (str): The `PRAGMA synchronous` level. NORMAL is safe in
+            WAL mode; only the last transactions can be lost on power failure.
+        commit_count (int): Write transactions committed through this pool.
+        schema_version (int): The schema version `run_migrations` confirmed
+            for this file, or None if it wasn't checked yet.
+        STATEMENT_CACHE_SIZE (int): Prepared statements kept per connection.
+    """
+    STATEMENT_CACHE_SIZE = 128
+
+    def __init__(self, path: str, synchronous: str = "NORMAL"):
+        """
+        Sets up the pool. Connections are opened lazily.
+
+        Args:
+            path (str): The database file.
+            synchronous (str): 'OFF', 'NORMAL' or 'FULL'.
+        """
+        self.path = path
+        self.synchronous = synchronous
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.schema_version: Optional[int] = None
+        self.commit_count = 0
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening it on first use.
+
+        Returns:
+            sqlite3.Connection: A connection in autocommit mode.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.changes = []
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves in transaction().
+        # check_same_thread=False only so close() can run from the GUI thread;
+        # each connection is still used by a single thread.
+        # With --profile-sql every statement is timed (see query_profiler)
+        factory = ProfiledConnection if query_profiler.enabled else sqlite3.Connection
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                               cached_statements=self.STATEMENT_CACHE_SIZE, factory=factory)
+        if factory is ProfiledConnection:
+            conn.db_name = os.path.basename(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Runs the block in a single write transaction on this thread's connection.
+
+        Nested blocks join the outer transaction. The transaction is committed
+        when the outermost block finishes and rolled back if it raises.
+
+        Usage:
+            with db.transaction() as conn:
+                conn.execute("INSERT ...")
+                conn.execute("UPDATE ...")
+        """
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+            self.commit_count += 1
+            for change in self._local.changes:
+                self.publish(change)
+        finally:
+            self._local.depth = 0
+            self._local.changes = []
+
+    def record_change(self, table: str, row_id: Any = None, op: str = "update"):
+        """
+        Announces a write on the change bus.
+
+        Inside `transaction()` the change is held back until the commit (and
+        dropped on rollback); otherwise it goes out right away.
+
+        Args:
+            table (str): The table written to.
+            row_id (optional): The affected row's id or primary key, if it's a single one.
+            op (str): 'insert', 'update' or 'delete'.
+        """
+        change = DataChange(self.path, table, row_id, op)
+        if getattr(self._local, "depth", 0):
+            self._local.changes.append(change)
+        else:
+            self.commit_count += 1
+            self.publish(change)
+
+    def publish(self, change: DataChange):
+        try:
+            get_change_bus().publish(change)
+        except Exception as e:
+            print(f"Error publishing change to {change.table}: {e}")
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        """
+        Runs a single statement (its own transaction unless inside `transaction()`).
+
+        Returns:
+            sqlite3.Cursor: The cursor, e.g. for `lastrowid` or `rowcount`.
+        """
+        return self.connection().execute(sql, params)
+
+    def fetch_all(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        """Runs a query and returns all rows as tuples."""
+        return self.connection().execute(sql, params).fetchall()
+
+    def fetch_one(self, sql: str, params: Iterable[Any] = ()) -> Optional[tuple]:
+        """Runs a query and returns the first row, or None."""
+        return self.connection().execute(sql, params).fetchone()
+
+    def fetch_dicts(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        """Runs a query and returns the rows as dicts keyed by column name."""
+        cursor = self.connection().execute(sql, params)
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def fetch_records(self, record_type: Type[R], sql: str, params: Iterable[Any] = ()) -> List[R]:
+        """
+        Runs a query and returns the rows as `record_type` records.
+
+        Raises:
+            ValueError: If the query's columns don't match the record's fields.
+        """
+        return self._record_cursor(record_type, sql, params).fetchall()
+
+    def fetch_record(self, record_type: Type[R], sql: str, params: Iterable[Any] = ()) -> Optional[R]:
+        """Runs a query and returns the first row as a `record_type` record, or None."""
+        return self._record_cursor(record_type, sql, params).fetchone()
+
+    def _record_cursor(self, record_type, sql, params) -> sqlite3.Cursor:
+        cursor = self.connection().cursor()
+        cursor.row_factory = record_factory(record_type)
+        cursor.execute(sql, params)
+        columns = tuple(description[0] for description in cursor.description)
+        if columns != record_type._fields:
+            raise ValueError(f"Query returns {columns}, {record_type.__name__} expects {record_type._fields}")
+        return cursor
+
+    def close(self):
+        """
+        Closes every pooled connection (from all threads).
+
+        Only call this when no other thread is using the database, e.g. before
+        the file gets deleted or replaced.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database {self.path}: {e}")
+        self._local = threading.local()
+        self.schema_version = None # The file may be replaced before we reopen it
+
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+_absolute_paths: Dict[str, str] = {} # Path as given -> abspath, so lookups need no syscalls
+
+def get_database(path: str) -> Database:
+    """
+    Returns the shared `Database` for a file, creating it on first use.
+
+    This runs for every query, so it doesn't touch the disk. Code that
+    deletes or replaces a database file has to call `close_database` first
+    (see `reset_application_data` and `BackupManager.apply_restore`).
+
+    Args:
+        path (str): The database file.
+
+    Returns:
+        Database: The pool for that file.
+    """
+    absolute = _absolute_paths.get(path)
+    if absolute is None:
+        absolute = _absolute_paths[path] = os.path.abspath(path)
+    with _databases_lock:
+        db = _databases.get(absolute)
+        if db is None:
+            db = _databases[absolute] = Database(absolute)
+        return db
+
+def close_database(path: str):
+    """
+    Closes the pooled connections of one file, if it was opened.
+
+    Args:
+        path (str): The database file.
+    """
+    with _databases_lock:
+        db = _databases.pop(os.path.abspath(path), None)
+    if db is not None:
+        db.close()
+
+def close_all_databases():
+    """Closes every pooled connection, e.g. on shutdown."""
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for db in databases:
+        db.close()
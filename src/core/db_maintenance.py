@@ -0,0 +1,216 @@
+"""
+Database Maintenance Module.
+
+Housekeeping for the app databases while nobody is using the hub. When the
+screensaver comes on, the scheduler works through VACUUM (only if enough
+pages are free), ANALYZE, `PRAGMA optimize` and a WAL checkpoint for each
+database, one step at a time on a background thread. As soon as the
+screensaver goes off, the running step is interrupted and the rest waits for
+the next idle period.
+
+Every run is logged with the duration of each step and the file sizes before
+and after it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from src.core.paths import get_db_path
+from src.core.data_manager import APP_DATABASES
+
+class MaintenanceScheduler(QObject):
+    """
+    Runs database maintenance in idle time.
+
+    Attributes:
+        run_finished (Signal): Emitted with the log entry when a run ends (done or aborted).
+        queue (List[Tuple[str, str]]): (database, step) pairs still to do.
+        STEPS (Tuple[str]): The steps, in the order they run per database.
+        MIN_INTERVAL (int): Seconds between full rounds; idle periods in
+            between only finish an interrupted round.
+        VACUUM_FREE_RATIO (float): VACUUM only if this share of pages is free.
+        LOG_LIMIT (int): Runs kept in the log file.
+    """
+    run_finished = Signal(dict)
+
+    STEPS = ("vacuum", "analyze", "optimize", "checkpoint")
+    MIN_INTERVAL = 24 * 60 * 60
+    VACUUM_FREE_RATIO = 0.1
+    BUSY_TIMEOUT_MS = 200 # Give up on a step rather than wait for an app's write
+    LOG_LIMIT = 50
+
+    def __init__(self, databases: List[str] = None, log_path: str = None, parent=None):
+        """
+        Sets up the scheduler.
+
+        Args:
+            databases (List[str], optional): Database files to look after. Defaults to the app databases.
+            log_path (str, optional): Where runs are logged. Defaults to 'data/maintenance_log.json'.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.databases = databases if databases is not None else [get_db_path(name) for name in APP_DATABASES]
+        self.log_path = log_path or get_db_path("maintenance_log.json")
+        self.queue: List[Tuple[str, str]] = []
+        self.last_round = self.load_last_round()
+        self.abort_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+    # --- Log ---
+
+    def load_log(self) -> List[Dict[str, Any]]:
+        """Returns the logged runs, oldest first."""
+        try:
+            with open(self.log_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def append_log(self, entry: Dict[str, Any]):
+        log = (self.load_log() + [entry])[-self.LOG_LIMIT:]
+        tmp_path = f"{self.log_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(log, f, indent=4)
+            os.replace(tmp_path, self.log_path)
+        except OSError as e:
+            print(f"Error writing maintenance log: {e}")
+
+    def load_last_round(self) -> float:
+        """Returns when the last full round was started, as a timestamp (0 if never)."""
+        for entry in reversed(self.load_log()):
+            if entry.get("round_started"):
+                return entry["round_started"]
+        return 0
+
+    @staticmethod
+    def file_size(path: str) -> int:
+        """Size of a database including its WAL."""
+        return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+    # --- Scheduling ---
+
+    def start(self):
+        """
+        Starts (or continues) maintenance. Connected to the screensaver coming on.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        round_started = None
+        if not self.queue and time.time() - self.last_round >= self.MIN_INTERVAL:
+            self.queue = [(path, step) for path in self.databases if os.path.exists(path) for step in self.STEPS]
+            round_started = self.last_round = time.time()
+        if not self.queue:
+            return
+
+        self.abort_event.clear()
+        self.thread = threading.Thread(target=self.run_queue, args=(round_started,), daemon=True)
+        self.thread.start()
+
+    def abort(self):
+        """
+        Stops right away, interrupting the running step. Connected to the
+        screensaver going off.
+        """
+        self.abort_event.set()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def wait(self, timeout: float = None):
+        """Waits for the background thread to finish."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    # --- Work ---
+
+    def run_queue(self, round_started: float = None) -> Dict[str, Any]:
+        """
+        Works through the queue until it is empty or `abort` is called.
+
+        Args:
+            round_started (float, optional): Set when this run starts a new full round.
+
+        Returns:
+            Dict: The log entry of this run.
+        """
+        entry = {"started": datetime.now().isoformat(timespec="seconds"), "round_started": round_started,
+                 "steps": [], "aborted": False}
+        run_start = time.perf_counter()
+
+        while self.queue:
+            if self.abort_event.is_set():
+                entry["aborted"] = True
+                break
+            path, step = self.queue[0]
+            record = {"database": os.path.basename(path), "step": step, "size_before": self.file_size(path)}
+            step_start = time.perf_counter()
+            try:
+                record["result"] = self.run_step(path, step)
+            except sqlite3.Error as e:
+                if self.abort_event.is_set():
+                    entry["aborted"] = True
+                    break # Interrupted; try again next time
+                record["result"] = f"error: {e}"
+            record["seconds"] = round(time.perf_counter() - step_start, 4)
+            record["size_after"] = self.file_size(path)
+            entry["steps"].append(record)
+            self.queue.pop(0)
+
+        entry["seconds"] = round(time.perf_counter() - run_start, 4)
+        self.append_log(entry)
+        done = [f"{s['database']}:{s['step']}" for s in entry["steps"]]
+        print(f"Database maintenance {'aborted' if entry['aborted'] else 'finished'} after {entry['seconds']}s: {', '.join(done) or 'nothing done'}")
+        try:
+            self.run_finished.emit(entry)
+        except RuntimeError:
+            pass # The scheduler was deleted while we ran
+        return entry
+
+    def run_step(self, path: str, step: str) -> str:
+        """
+        Runs one maintenance step on its own connection.
+
+        Args:
+            path (str): The database.
+            step (str): One of `STEPS`.
+
+        Returns:
+            str: What happened, for the log.
+        """
+        conn = sqlite3.connect(path, isolation_level=None, timeout=self.BUSY_TIMEOUT_MS / 1000)
+        with self._conn_lock:
+            self._conn = conn
+        try:
+            if self.abort_event.is_set():
+                raise sqlite3.OperationalError("interrupted")
+
+            if step == "vacuum":
+                pages = conn.execute("PRAGMA page_count").fetchone()[0]
+                free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not pages or free / pages < self.VACUUM_FREE_RATIO:
+                    return f"skipped ({free}/{pages} pages free)"
+                conn.execute("VACUUM")
+                return f"reclaimed {free} pages"
+            if step == "analyze":
+                conn.execute("ANALYZE")
+            elif step == "optimize":
+                conn.execute("PRAGMA optimize")
+            elif step == "checkpoint":
+                busy, wal_pages, done = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+                return "busy" if busy else f"checkpointed {done} pages"
+            return "ok"
+        finally:
+            with self._conn_lock:
+                self._conn = None
+            conn.close()
@@ -0,0 +1,151 @@
+"""
+Hot Reloader Module.
+
+Watches the 'apps' and 'widgets' folders while the hub is running and reports
+which app folders or widget files changed, so only those get reloaded. Only
+Python sources and manifests count as changes; data files that apps write into
+their own folder (settings, caches, '__pycache__') are ignored.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+class HotReloader(QObject):
+    """
+    Turns file system events into lists of changed apps and widgets.
+
+    Attributes:
+        apps_changed (Signal): Emitted with the app folders that were added, changed or removed.
+        widgets_changed (Signal): Emitted with the widget files that were added, changed or removed.
+        DEBOUNCE_MS (int): How long to wait for an editor or deployment to finish writing.
+    """
+    apps_changed = Signal(list)
+    widgets_changed = Signal(list)
+
+    DEBOUNCE_MS = 500
+    SOURCE_FILES = (".py", "manifest.json")
+
+    def __init__(self, apps_dir: str, widgets_dir: str, parent=None):
+        """
+        Sets up the reloader. Call `start` to begin watching.
+
+        Args:
+            apps_dir (str): The apps folder.
+            widgets_dir (str): The widgets folder.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.apps_dir = apps_dir
+        self.widgets_dir = widgets_dir
+        self.app_snapshots: Dict[str, Snapshot] = {}
+        self.widget_snapshot: Snapshot = {}
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule_check)
+        self.watcher.fileChanged.connect(self.schedule_check)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.check_for_changes)
+
+    @classmethod
+    def snapshot_dir(cls, path: str, recursive: bool = True) -> Snapshot:
+        """
+        Records the modification time and size of all source files in a folder.
+
+        Args:
+            path (str): The folder.
+            recursive (bool): Include subfolders (except '__pycache__').
+
+        Returns:
+            Snapshot: Relative file path -> (mtime_ns, size).
+        """
+        snapshot = {}
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d != "__pycache__"] if recursive else []
+            for file_name in files:
+                if not file_name.endswith(cls.SOURCE_FILES):
+                    continue
+                file_path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                snapshot[os.path.relpath(file_path, path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def list_app_dirs(self) -> List[str]:
+        """Returns all folders inside the apps folder."""
+        if not os.path.exists(self.apps_dir):
+            return []
+        return [entry.path for entry in os.scandir(self.apps_dir)
+                if entry.is_dir() and entry.name != "__pycache__"]
+
+    def take_snapshots(self):
+        """Remembers the current state of every app folder and widget file."""
+        self.app_snapshots = {path: self.snapshot_dir(path) for path in self.list_app_dirs()}
+        self.widget_snapshot = self.snapshot_dir(self.widgets_dir, recursive=False) if os.path.exists(self.widgets_dir) else {}
+
+    def update_watches(self):
+        """
+        (Re)registers every folder and source file with the watcher.
+
+        Editors and deployments often replace files instead of writing them in
+        place, which makes the watcher lose track of them, so this runs after
+        every check.
+        """
+        paths = [self.apps_dir, self.widgets_dir]
+        for app_path, snapshot in self.app_snapshots.items():
+            paths.append(app_path)
+            paths.extend(os.path.join(app_path, rel) for rel in snapshot)
+            paths.extend({os.path.join(app_path, os.path.dirname(rel)) for rel in snapshot if os.path.dirname(rel)})
+        paths.extend(os.path.join(self.widgets_dir, rel) for rel in self.widget_snapshot)
+
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        missing = [path for path in paths if path not in watched and os.path.exists(path)]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def start(self):
+        """Starts watching."""
+        self.take_snapshots()
+        self.update_watches()
+
+    def stop(self):
+        """Stops watching."""
+        self.timer.stop()
+        watched = self.watcher.files() + self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+
+    def schedule_check(self, path=None):
+        """Waits for things to settle before comparing, restarting on every new event."""
+        self.timer.start()
+
+    def check_for_changes(self):
+        """
+        Compares the folders against the last snapshots and reports what changed.
+        """
+        old_apps, old_widgets = self.app_snapshots, self.widget_snapshot
+        self.take_snapshots()
+
+        changed_apps = sorted(
+            path for path in set(old_apps) | set(self.app_snapshots)
+            if old_apps.get(path) != self.app_snapshots.get(path)
+        )
+        changed_widgets = sorted(
+            os.path.join(self.widgets_dir, rel) for rel in set(old_widgets) | set(self.widget_snapshot)
+            if old_widgets.get(rel) != self.widget_snapshot.get(rel)
+        )
+
+        self.update_watches()
+
+        if changed_apps:
+            self.apps_changed.emit(changed_apps)
+        if changed_widgets:
+            self.widgets_changed.emit(changed_widgets)
@@ -1,14 +1,18 @@
-import json
 import os
 from PySide6.QtCore import QObject, Signal
 
+from .translation_catalog import TranslationCatalog
+
 class LanguageManager(QObject):
     """
     Handles the app's language and translations.
+
+    Translations come from a `TranslationCatalog`, so each language file is
+    only parsed once and switching back and forth is just swapping dicts.
     """
     language_changed = Signal(str)
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, cache_path=None):
         super().__init__()
         self.root_dir = root_dir
         self.languages_dir = os.path.join(root_dir, "languages")
@@ -19,41 +23,39 @@ class LanguageManager(QObject):
         if not os.path.exists(self.languages_dir):
             os.makedirs(self.languages_dir)
 
+        self.catalog = TranslationCatalog(self.languages_dir, cache_path)
+
     def load_language(self, lang_code):
         """
-        Loads the translation file for the chosen language.
+        Switches to the chosen language.
         """
         self.current_language = lang_code
-        file_path = os.path.join(self.languages_dir, f"{lang_code}.json")
-        
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.translations = json.load(f)
-            except Exception as e:
-                print(f"Error loading language {lang_code}: {e}")
-                self.translations = {}
-        else:
-            print(f"Language file not found: {file_path}")
-            self.translations = {}
-            
+        self.translations = self.catalog.get(lang_code)
         self.language_changed.emit(lang_code)
 
+    def preload_languages(self):
+        """
+        Loads all other languages ahead of time, so switching never waits on disk.
+        """
+        self.catalog.preload()
+
     def translate(self, key, default=None):
         """
         Gets the translated text for a key.
         """
         return self.translations.get(key, default if default is not None else key)
 
+    def localize(self, value, default=None):
+        """
+        Picks the current language from a {"en": ..., "de": ...} dict, like
+        the ones used for names in app manifests. Plain strings are returned as is.
+        """
+        if isinstance(value, dict):
+            return value.get(self.current_language, value.get("en", default))
+        return value
+
     def get_available_languages(self):
         """
         Finds all the languages we have files for.
         """
-        if not os.path.exists(self.languages_dir):
-            return ["en"]
-            
-        langs = []
-        for filename in os.listdir(self.languages_dir):
-            if filename.endswith(".json"):
-                langs.append(filename[:-5])
-        return sorted(langs)
+        return list(self.catalog.available_languages())
@@ -0,0 +1,159 @@
+"""
+Manifest Index Module.
+
+This module keeps a small on-disk index of parsed app manifests so the
+registry doesn't have to open and parse every 'manifest.json' on each start.
+Entries are keyed by the app folder path and remember the modification times
+they were read at, so anything that changed on disk gets picked up again.
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional
+
+class ManifestIndex:
+    """
+    Persistent cache of parsed app manifests.
+
+    Attributes:
+        VERSION (int): Format version of the index file. Bump it to force a rescan.
+        index_path (str): Where the index JSON lives.
+        entries (Dict): Cached entries keyed by app folder path.
+    """
+    VERSION = 1
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, index_path: str):
+        """
+        Sets up the index and loads it from disk if possible.
+
+        Args:
+            index_path (str): Path to the index file (usually inside 'data/').
+        """
+        self.index_path = index_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.loaded = self.load()
+
+    @classmethod
+    def get_stamp(cls, app_path: str) -> Optional[List[int]]:
+        """
+        Builds the change stamp for an app folder.
+
+        The stamp combines the folder mtime with the manifest's mtime and size,
+        so both added/removed files and in-place edits are noticed.
+
+        Args:
+            app_path (str): The app folder.
+
+        Returns:
+            List[int]: The stamp, or None if the folder has no manifest.
+        """
+        try:
+            dir_stat = os.stat(app_path)
+            manifest_stat = os.stat(os.path.join(app_path, cls.MANIFEST_FILE))
+        except OSError:
+            return None
+        return [dir_stat.st_mtime_ns, manifest_stat.st_mtime_ns, manifest_stat.st_size]
+
+    def load(self) -> bool:
+        """
+        Reads the index file.
+
+        Returns:
+            bool: True if a valid index was loaded, False if we need a full rescan.
+        """
+        self.entries = {}
+        if not os.path.exists(self.index_path):
+            return False
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading manifest index: {e}")
+            return False
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return False
+
+        self.entries = data.get("entries", {})
+        return True
+
+    def save(self):
+        """
+        Writes the index back to disk if anything changed.
+
+        Writes go to a temp file first and are then renamed into place, so a
+        crash mid-write never leaves a half-written index behind.
+        """
+        if not self.dirty:
+            return
+
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving manifest index: {e}")
+
+    def lookup(self, app_path: str, stamp: List[int]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached manifest for a folder if it is still up to date.
+
+        Args:
+            app_path (str): The app folder.
+            stamp (List[int]): The current stamp from `get_stamp`.
+
+        Returns:
+            Dict: The cached manifest, or None if missing or stale.
+        """
+        entry = self.entries.get(app_path)
+        if entry and entry.get("stamp") == stamp:
+            return entry.get("manifest")
+        return None
+
+    def store(self, app_path: str, stamp: List[int], manifest: Dict[str, Any]):
+        """
+        Remembers a freshly parsed manifest.
+
+        Args:
+            app_path (str): The app folder.
+            stamp (List[int]): The stamp the manifest was read at.
+            manifest (Dict): The parsed manifest.
+        """
+        self.entries[app_path] = {"stamp": stamp, "manifest": manifest}
+        self.dirty = True
+
+    def prune(self, keep_paths):
+        """
+        Drops entries for folders that no longer exist.
+
+        Args:
+            keep_paths (Iterable[str]): Folders that were seen during the scan.
+        """
+        keep_paths = set(keep_paths)
+        for path in list(self.entries):
+            if path not in keep_paths:
+                del self.entries[path]
+                self.dirty = True
+
+    def find_stale(self) -> List[Dict[str, str]]:
+        """
+        Checks every entry against the disk without changing anything.
+
+        Returns:
+            List[Dict[str, str]]: One item per stale entry with 'path' and 'reason'
+            ('missing' if the folder or manifest is gone, 'modified' if it changed).
+        """
+        stale = []
+        for path, entry in self.entries.items():
+            stamp = self.get_stamp(path)
+            if stamp is None:
+                stale.append({"path": path, "reason": "missing"})
+            elif entry.get("stamp") != stamp:
+                stale.append({"path": path, "reason": "modified"})
+        return stale
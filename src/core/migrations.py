@@ -0,0 +1,55 @@
+"""
+Migrations Module.
+
+Versioned schema setup for the app databases. Each database has an ordered
+list of migration functions; migration N brings the schema to version N,
+which is stored in `PRAGMA user_version`. Pending migrations run once, all in
+a single transaction. After that, opening the database costs one PRAGMA read
+per process and no DDL at all.
+"""
+
+import sqlite3
+from typing import Callable, List
+
+Migration = Callable[[sqlite3.Connection], None]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Returns the schema version stored in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run_migrations(db, migrations: List[Migration]) -> int:
+    """
+    Brings a database up to the newest schema version.
+
+    Args:
+        db (Database): The database to migrate.
+        migrations (List[Migration]): Migration functions, oldest first. Each
+            gets the connection and must not commit on its own.
+
+    Returns:
+        int: The schema version the database is at now.
+
+    Raises:
+        RuntimeError: If the file was created by a newer version of the app.
+    """
+    target = len(migrations)
+    if db.schema_version == target:
+        return target # Already checked in this process
+
+    version = get_schema_version(db.connection())
+    if version < target:
+        with db.transaction() as conn:
+            # Someone else may have migrated while we waited for the write lock
+            version = get_schema_version(conn)
+            for number in range(version + 1, target + 1):
+                migrations[number - 1](conn)
+            if version < target:
+                # PRAGMA doesn't take parameters; target is always an int
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+        version = max(version, target)
+
+    if version > target:
+        raise RuntimeError(f"{db.path} has schema version {version}, this app only knows up to {target}")
+
+    db.schema_version = version
+    return version
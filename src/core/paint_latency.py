@@ -0,0 +1,72 @@
+"""
+Paint Latency Module.
+
+Measures how long it takes from asking for a widget to be shown until it is
+actually painted. The hub uses it to time app launches and switches.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QEvent, Signal
+
+class PaintLatencyTracker(QObject):
+    """
+    Records the time between `start` and the widget's next paint event.
+
+    Attributes:
+        measured (Signal): Emitted with (key, milliseconds) for every measurement.
+        latencies (Dict[str, List[float]]): Measured milliseconds per key, oldest first.
+        history (int): How many measurements are kept per key.
+    """
+    measured = Signal(str, float)
+
+    def __init__(self, history: int = 20, parent=None):
+        """
+        Sets up the tracker.
+
+        Args:
+            history (int): Measurements kept per key.
+            parent (QObject, optional): Qt parent.
+        """
+        super().__init__(parent)
+        self.history = history
+        self.latencies: Dict[str, List[float]] = {}
+        self._pending = {} # widget -> (key, start_ns)
+
+    def start(self, key: str, widget):
+        """
+        Starts the clock; it stops when `widget` paints next.
+
+        Args:
+            key (str): What to file the measurement under, e.g. the app ID.
+            widget (QWidget): The widget that is about to be shown.
+        """
+        if widget not in self._pending:
+            widget.installEventFilter(self)
+        self._pending[widget] = (key, time.perf_counter_ns())
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and obj in self._pending:
+            key, start_ns = self._pending.pop(obj)
+            obj.removeEventFilter(self)
+            self.record(key, (time.perf_counter_ns() - start_ns) / 1e6)
+        return False
+
+    def record(self, key: str, latency_ms: float):
+        """
+        Stores a measurement.
+
+        Args:
+            key (str): What was measured.
+            latency_ms (float): The latency in milliseconds.
+        """
+        samples = self.latencies.setdefault(key, [])
+        samples.append(latency_ms)
+        del samples[:-self.history]
+        self.measured.emit(key, latency_ms)
+
+    def last(self, key: str) -> Optional[float]:
+        """Returns the most recent measurement for a key, or None."""
+        samples = self.latencies.get(key)
+        return samples[-1] if samples else None
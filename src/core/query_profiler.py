@@ -0,0 +1,319 @@
+"""
+Query Profiler Module.
+
+Measures every SQL statement the apps run. It is switched off by default;
+`python main.py --profile-sql` turns it on. Connections opened from then on
+time each statement (including fetching its rows) and keep a latency
+histogram per statement. Statements slower than `threshold_ms` are logged
+with their `EXPLAIN QUERY PLAN` output, and plans that scan a whole table
+are flagged.
+
+The numbers are written to 'data/query_stats.json' on exit. To see which
+statements cost the most time in total, run:
+
+    python -m src.core.query_profiler [data/query_stats.json] [--top 20]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import sqlite3
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Upper bounds of the histogram buckets in milliseconds (the last one is open)
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+def normalize_sql(sql: str) -> str:
+    """Collapses whitespace so the same statement always gets the same key."""
+    return re.sub(r"\s+", " ", sql).strip()
+
+def is_full_scan(plan_line: str) -> bool:
+    """
+    Whether an EXPLAIN QUERY PLAN line reads a whole table.
+
+    'SCAN t' (or 'SCAN TABLE t' on older SQLite) is a full scan; scans
+    through an index and 'SEARCH' lines are not.
+    """
+    return plan_line.startswith("SCAN ") and " USING " not in plan_line
+
+class QueryProfiler:
+    """
+    Collects statement timings.
+
+    Attributes:
+        enabled (bool): Whether new connections get profiled.
+        threshold_ms (float): Statements slower than this are logged with their plan.
+        stats (Dict): (database, sql) -> count, total/max time and histogram.
+        slow_log (List[Dict]): Slow executions, with plan and full-scan flag.
+        output_path (str): Where `write` puts the stats on exit.
+    """
+    SLOW_LOG_LIMIT = 500
+
+    def __init__(self):
+        """Sets up a disabled profiler."""
+        self.enabled = False
+        self.threshold_ms = 50.0
+        self.output_path: Optional[str] = None
+        self.stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.slow_log: List[Dict[str, Any]] = []
+        self.plans: Dict[Tuple[str, str], List[str]] = {}
+        self._lock = threading.Lock()
+        self._exit_hook = False
+
+    def enable(self, output_path: Optional[str] = None, threshold_ms: float = None):
+        """
+        Starts profiling connections opened from now on.
+
+        Args:
+            output_path (str, optional): Where to write the stats on exit.
+            threshold_ms (float, optional): Slow statement threshold.
+        """
+        self.enabled = True
+        self.output_path = output_path
+        if threshold_ms is not None:
+            self.threshold_ms = threshold_ms
+        if output_path and not self._exit_hook:
+            atexit.register(self.finish)
+            self._exit_hook = True
+
+    def disable(self):
+        """Stops profiling new connections."""
+        self.enabled = False
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        with self._lock:
+            self.stats.clear()
+            self.slow_log.clear()
+            self.plans.clear()
+
+    def record(self, database: str, sql: str, params, duration_ns: int, conn: sqlite3.Connection = None):
+        """
+        Adds one execution of a statement.
+
+        Args:
+            database (str): The database file name.
+            sql (str): The statement.
+            params: Its parameters (used to get the query plan).
+            duration_ns (int): How long it took, including fetching rows.
+            conn (sqlite3.Connection, optional): Used to explain slow statements.
+        """
+        key = (database, normalize_sql(sql))
+        duration_ms = duration_ns / 1e6
+        bucket = next((i for i, bound in enumerate(BUCKETS_MS) if duration_ms <= bound), len(BUCKETS_MS))
+
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                           "histogram": [0] * (len(BUCKETS_MS) + 1)}
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["histogram"][bucket] += 1
+
+        if duration_ms > self.threshold_ms:
+            plan = self.explain(key, sql, params, conn)
+            with self._lock:
+                entry["full_scan"] = any(is_full_scan(line) for line in plan)
+                if len(self.slow_log) < self.SLOW_LOG_LIMIT:
+                    self.slow_log.append({
+                        "database": database,
+                        "sql": key[1],
+                        "ms": round(duration_ms, 3),
+                        "plan": plan,
+                        "full_scan": entry["full_scan"],
+                    })
+
+    def explain(self, key, sql: str, params, conn: sqlite3.Connection = None) -> List[str]:
+        """
+        Returns the statement's query plan, one line per step (cached per statement).
+        """
+        if key in self.plans:
+            return self.plans[key]
+        plan = []
+        if conn is not None and key[1].upper().startswith(EXPLAINABLE):
+            try:
+                # A plain cursor, so explaining isn't profiled itself
+                cursor = sqlite3.Cursor(conn)
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = [row[3] for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                plan = [f"(no plan: {e})"]
+        self.plans[key] = plan
+        return plan
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the stats and slow log in a JSON-friendly form."""
+        with self._lock:
+            statements = [dict(stats, database=database, sql=sql) for (database, sql), stats in self.stats.items()]
+            return {"buckets_ms": list(BUCKETS_MS), "threshold_ms": self.threshold_ms,
+                    "statements": statements, "slow": list(self.slow_log)}
+
+    def write(self, path: str):
+        """Writes the stats as JSON."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def finish(self):
+        """Writes the stats to `output_path`, if anything was recorded."""
+        if not self.output_path or not self.stats:
+            return
+        try:
+            self.write(self.output_path)
+            print(f"Query stats written to {self.output_path}")
+        except OSError as e:
+            print(f"Error writing query stats: {e}")
+
+def format_report(data: Dict[str, Any], top: int = 20) -> str:
+    """
+    Builds a table of the statements that took the most time in total.
+
+    Args:
+        data (Dict): Stats as written by `QueryProfiler.write`.
+        top (int): How many statements to list.
+
+    Returns:
+        str: The formatted report.
+    """
+    statements = sorted(data.get("statements", []), key=lambda s: s["total_ms"], reverse=True)
+    lines = [f"{'Total (ms)':>11}{'Count':>8}{'Avg (ms)':>10}{'Max (ms)':>10}  {'Scan':<5}{'Database':<18}Statement"]
+    for s in statements[:top]:
+        scan = "FULL" if s.get("full_scan") else ""
+        sql = s["sql"] if len(s["sql"]) <= 90 else s["sql"][:87] + "..."
+        lines.append(f"{s['total_ms']:>11.1f}{s['count']:>8}{s['total_ms'] / s['count']:>10.2f}{s['max_ms']:>10.1f}  "
+                     f"{scan:<5}{s['database']:<18}{sql}")
+
+    slow = data.get("slow", [])
+    if slow:
+        lines.append("")
+        lines.append(f"Slow executions (> {data.get('threshold_ms')} ms): {len(slow)}")
+        seen = set()
+        for entry in sorted(slow, key=lambda e: e["ms"], reverse=True):
+            if entry["sql"] in seen:
+                continue
+            seen.add(entry["sql"])
+            flag = " [FULL SCAN]" if entry.get("full_scan") else ""
+            lines.append(f"  {entry['ms']:.1f} ms{flag}  {entry['sql'][:100]}")
+            for step in entry.get("plan", []):
+                lines.append(f"      {step}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Prints the report for a stats file."""
+    parser = argparse.ArgumentParser(description="Rank SQL statements by total time.")
+    parser.add_argument("path", nargs="?", help="Stats file (default: data/query_stats.json)")
+    parser.add_argument("--top", type=int, default=20, help="How many statements to list")
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if not path:
+        from src.core.paths import DATA_DIR
+        path = os.path.join(DATA_DIR, "query_stats.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Can't read {path}: {e}")
+        return 1
+    print(format_report(data, args.top))
+    return 0
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    A cursor that reports each statement to the profiler once its rows were
+    fetched (or right away for statements without rows).
+    """
+    def _begin(self, sql, params):
+        self._finish()
+        self._pending = [sql, params, 0]
+
+    def _finish(self):
+        pending = getattr(self, "_pending", None)
+        if pending is not None:
+            self._pending = None
+            query_profiler.record(self.connection.db_name, pending[0], pending[1], pending[2], self.connection)
+
+    def _add_time(self, start_ns, done=False):
+        pending = getattr(self, "_pending", None)
+        if pending is not None:
+            pending[2] += time.perf_counter_ns() - start_ns
+            if done:
+                self._finish()
+
+    def execute(self, sql, params=()):
+        self._begin(sql, params)
+        start_ns = time.perf_counter_ns()
+        try:
+            super().execute(sql, params)
+        finally:
+            self._add_time(start_ns, done=self.description is None)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._begin(sql, ())
+        start_ns = time.perf_counter_ns()
+        try:
+            super().executemany(sql, seq_of_params)
+        finally:
+            self._add_time(start_ns, done=True)
+        return self
+
+    def fetchone(self):
+        start_ns = time.perf_counter_ns()
+        row = super().fetchone()
+        self._add_time(start_ns, done=row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start_ns = time.perf_counter_ns()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add_time(start_ns, done=len(rows) < (self.arraysize if size is None else size))
+        return rows
+
+    def fetchall(self):
+        start_ns = time.perf_counter_ns()
+        rows = super().fetchall()
+        self._add_time(start_ns, done=True)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # fetchone() callers often drop the cursor before it runs dry
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class ProfiledConnection(sqlite3.Connection):
+    """
+    A connection whose cursors are profiled. Pass as `factory` to
+    `sqlite3.connect` and set `db_name` afterwards.
+    """
+    db_name = ""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+# Shared instance used by main.py and the database layer
+query_profiler = QueryProfiler()
+
+if __name__ == "__main__":
+    sys.exit(main())
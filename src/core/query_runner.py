@@ -0,0 +1,161 @@
+"""
+Query Runner Module.
+
+Runs database calls on a small pool of worker threads so the GUI thread never
+waits for SQLite. Results come back through a Qt signal, so callbacks always
+run on the GUI thread and can touch widgets directly.
+
+Every query can be given a key (e.g. "tasks"). Starting a new query with the
+same key supersedes the previous one: if it hasn't started yet it is
+cancelled, otherwise its result is dropped when it arrives. That way a view
+only ever shows the result of the last refresh it asked for.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, Qt, Signal
+
+WORKER_COUNT = 2
+NETWORK_WORKER_COUNT = 2
+
+_pool: Optional[ThreadPoolExecutor] = None
+_network_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Returns the shared database worker pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=WORKER_COUNT, thread_name_prefix="db-worker")
+        return _pool
+
+def get_network_pool() -> ThreadPoolExecutor:
+    """
+    Returns the pool for calls that wait on the network (e.g. product lookups).
+    They get their own threads so a slow server never holds up database queries.
+    """
+    global _network_pool
+    with _pool_lock:
+        if _network_pool is None:
+            _network_pool = ThreadPoolExecutor(max_workers=NETWORK_WORKER_COUNT, thread_name_prefix="net-worker")
+        return _network_pool
+
+def shutdown_worker_pool():
+    """
+    Drops queued queries and waits for running ones, e.g. before closing the databases.
+    Covers the network pool too, since lookups write their results to the database.
+    """
+    global _pool, _network_pool
+    with _pool_lock:
+        pools = (_pool, _network_pool)
+        _pool = _network_pool = None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+class QueryRunner(QObject):
+    """
+    Hands database calls to the worker pool and delivers their results.
+
+    Attributes:
+        pending (Dict): Futures that haven't been delivered yet -> (key, on_result, on_error).
+        latest (Dict): Key -> the most recent future started with it.
+    """
+    _finished = Signal(object)
+
+    def __init__(self, parent=None, pool: Callable[[], ThreadPoolExecutor] = get_worker_pool):
+        """
+        Sets up the runner. Usually one per app or widget.
+
+        Args:
+            parent (QObject, optional): Qt parent; the runner goes away with it.
+            pool (Callable, optional): Returns the executor to run on. Defaults to the
+                database pool; use get_network_pool for anything that talks to a server.
+        """
+        super().__init__(parent)
+        self.pool = pool
+        self.pending: Dict[Future, Tuple[Optional[str], Optional[Callable], Optional[Callable]]] = {}
+        self.latest: Dict[str, Future] = {}
+        # Queued even when the query is already done by the time add_done_callback
+        # runs (the callback then fires right away on our own thread)
+        self._finished.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    def run(self, key: Optional[str], func: Callable, *args,
+            on_result: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None, **kwargs) -> Future:
+        """
+        Calls `func(*args, **kwargs)` on a worker thread.
+
+        Args:
+            key (str, optional): Supersedes the previous query with the same key.
+                None means the query is never superseded.
+            func (Callable): The database call.
+            on_result (Callable, optional): Gets the return value, on the GUI thread.
+            on_error (Callable, optional): Gets the exception, on the GUI thread.
+                Without it, errors are printed.
+
+        Returns:
+            Future: The running query.
+        """
+        if key is not None:
+            self.cancel(key)
+
+        future = self.pool().submit(func, *args, **kwargs)
+        self.pending[future] = (key, on_result, on_error)
+        if key is not None:
+            self.latest[key] = future
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        # Runs on the worker thread; the signal queues the delivery to our thread
+        try:
+            self._finished.emit(future)
+        except RuntimeError:
+            pass # The runner was deleted while the query ran
+
+    def _deliver(self, future: Future):
+        entry = self.pending.pop(future, None)
+        if entry is None:
+            return # Dropped by cancel_all
+        key, on_result, on_error = entry
+        if key is not None:
+            if self.latest.get(key) is not future:
+                return # Superseded by a newer query
+            del self.latest[key]
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Error in background query {key}: {error}")
+        elif on_result:
+            on_result(future.result())
+
+    def cancel(self, key: str):
+        """
+        Supersedes the running query with that key, if any.
+
+        Args:
+            key (str): The query key.
+        """
+        future = self.latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def cancel_all(self):
+        """Drops every outstanding query, e.g. when the view goes away."""
+        for future in list(self.pending):
+            future.cancel()
+        self.pending.clear()
+        self.latest.clear()
+
+    def is_busy(self) -> bool:
+        """Whether any query is still waiting to be delivered."""
+        return bool(self.pending)
@@ -25,6 +25,7 @@ class ScreensaverManager(QObject):
         
         self.is_active = False
         self.load_settings()
+        self.settings_manager.setting_changed.connect(self.on_setting_changed)
 
     def load_settings(self):
         """Loads settings and starts/stops the timer."""
@@ -39,6 +40,11 @@ class ScreensaverManager(QObject):
         else:
             self.timer.stop()
 
+    def on_setting_changed(self, key_path, old_value, new_value):
+        """Applies new screensaver settings right away."""
+        if key_path.split(".")[0] == "screensaver":
+            self.load_settings()
+
     def eventFilter(self, obj, event):
         """
         Monitors global application events to detect user activity.
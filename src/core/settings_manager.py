@@ -4,23 +4,47 @@ Settings Manager Module.
 This module handles the persistence and retrieval of application settings.
 It manages user preferences such as enabled apps, widget layouts, and other
 configuration options, saving them to a JSON file.
+
+Changes are written shortly after they happen on a background thread, so
+several changes in a row end up as a single write. Use `batch()` to group
+changes explicitly and `flush()` to write right away.
+
+Every change is announced through `setting_changed` with the key path of
+each value that actually changed (e.g. 'widget_positions.2' or
+'screensaver.timeout'), so the UI only has to rebuild what is affected.
 """
 
 import json
 import os
-from typing import List, Dict, Any
+import atexit
+import threading
+import contextlib
+from typing import List, Dict, Any, Iterator, Tuple
 
-class SettingsManager:
+from PySide6.QtCore import QObject, Signal
+
+class SettingsManager(QObject):
     """
     Manages application configuration and persistence.
 
     Attributes:
+        setting_changed (Signal): Emitted with (key path, old value, new value)
+            for every changed value. Inside `batch()` the signals are held
+            back until the batch ends.
         SETTINGS_FILE (str): The filename for the settings JSON file.
         DEFAULT_SETTINGS (Dict): A dictionary containing default configuration values.
         settings_path (str): The full path to the settings file.
-        settings (Dict): The current loaded settings.
+        settings (Dict): The current loaded settings. Values are replaced, never
+            changed in place, so the background writer can safely take a copy.
     """
+    setting_changed = Signal(str, object, object)
+
     SETTINGS_FILE = "settings.json"
+    SAVE_DELAY = 0.5 # seconds to wait for more changes before writing
+
+    # Managers with unsaved changes, by settings path
+    _pending: Dict[str, "SettingsManager"] = {}
+    _pending_lock = threading.Lock()
     
     DEFAULT_SETTINGS = {
         "language": "en",
@@ -31,6 +55,17 @@ class SettingsManager:
         "widget_order": [],
         "widget_positions": {}, # {index: "widget_id"}
         "resolution": "auto", # "auto" or "WxH" (e.g., "1920x1080")
+        "prewarm_budget": 3, # How many apps are started in the background
+        "app_launch_counts": {}, # {"app_id": launches}
+        "app_eviction": {
+            "max_instances": 4, # Apps kept in memory at once, 0 for no limit
+            "idle_minutes": 15 # Unload apps unused for this long, 0 to keep them
+        },
+        "hot_reload": False, # Watch apps/ and widgets/ and reload changed code
+        "backup_keep": 5, # Backup archives kept in data/backups, older ones are deleted
+        "pantry": {
+            "warning_days": 30 # Pantry entries expiring within this many days are marked
+        },
         "screensaver": {
             "enabled": False,
             "timeout": 5, # minutes
@@ -46,7 +81,16 @@ class SettingsManager:
         Args:
             settings_dir (str): The directory where the settings file should be stored. Defaults to current directory.
         """
+        super().__init__()
         self.settings_path = os.path.join(settings_dir, self.SETTINGS_FILE)
+        self._queued_changes = []
+        self._write_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        self._batch_depth = 0
+
+        # Another manager may still be holding unsaved changes to the same file
+        self.flush_pending(self.settings_path)
         self.settings = self.load_settings()
 
     def load_settings(self) -> Dict[str, Any]:
@@ -65,15 +109,162 @@ class SettingsManager:
         except (json.JSONDecodeError, IOError):
             return self.DEFAULT_SETTINGS.copy()
 
+    def reload(self):
+        """
+        Reads the settings file again, e.g. after it was restored from a
+        backup, and announces every value that differs. Unsaved changes are
+        dropped in favor of the file.
+        """
+        with self._pending_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if SettingsManager._pending.get(self.settings_path) is self:
+                del SettingsManager._pending[self.settings_path]
+        self._dirty = False
+
+        old_settings, self.settings = self.settings, self.load_settings()
+        for key in list(old_settings) + [k for k in self.settings if k not in old_settings]:
+            self._queued_changes.extend(self.diff(old_settings.get(key), self.settings.get(key), key))
+        if self._batch_depth == 0:
+            self._emit_changes()
+
     def save_settings(self):
         """
-        Saves the current settings to the JSON file.
+        Marks the settings as changed. They are written to the JSON file once
+        no more changes came in for `SAVE_DELAY` seconds (or when the current
+        `batch()` ends).
+        """
+        self._dirty = True
+        if self._batch_depth == 0:
+            self._schedule_save()
+
+    def _schedule_save(self):
+        with self._pending_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            SettingsManager._pending[self.settings_path] = self
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Groups several changes into a single write.
+
+        Usage:
+            with settings_manager.batch():
+                settings_manager.set_language("de")
+                settings_manager.set_app_positions(positions)
         """
+        self._batch_depth += 1
         try:
-            with open(self.settings_path, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-        except IOError as e:
-            print(f"Error saving settings: {e}")
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self._dirty:
+                    self._schedule_save()
+                self._emit_changes()
+
+    def set_value(self, key: str, value: Any):
+        """
+        Updates a top-level setting, announces what changed and saves.
+
+        Args:
+            key (str): The setting, e.g. 'language'.
+            value (Any): The new value. Don't change it in place afterwards.
+        """
+        old_value = self.settings.get(key)
+        self.settings[key] = value
+        self._queued_changes.extend(self.diff(old_value, value, key))
+        self.save_settings()
+        if self._batch_depth == 0:
+            self._emit_changes()
+
+    def _emit_changes(self):
+        changes, self._queued_changes = self._queued_changes, []
+        for key_path, old_value, new_value in changes:
+            self.setting_changed.emit(key_path, old_value, new_value)
+
+    @classmethod
+    def diff(cls, old: Any, new: Any, path: str) -> Iterator[Tuple[str, Any, Any]]:
+        """
+        Lists the values that differ between two settings trees.
+
+        Nested dicts are compared key by key; everything else (including lists)
+        is compared as a whole.
+
+        Args:
+            old (Any): The previous value (None if it didn't exist).
+            new (Any): The new value.
+            path (str): Key path of the values being compared.
+
+        Yields:
+            Tuple[str, Any, Any]: (key path, old value, new value) per change.
+        """
+        if old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in list(old) + [k for k in new if k not in old]:
+                yield from cls.diff(old.get(key), new.get(key), f"{path}.{key}")
+        else:
+            yield path, old, new
+
+    def flush(self):
+        """
+        Writes pending changes to disk right away.
+
+        The file is written to a temporary file first and then renamed over the
+        old one, so a crash or power loss never leaves a half-written file.
+        """
+        with self._pending_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if SettingsManager._pending.get(self.settings_path) is self:
+                del SettingsManager._pending[self.settings_path]
+
+        with self._write_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            snapshot = dict(self.settings)
+
+            tmp_path = f"{self.settings_path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(snapshot, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.settings_path)
+            except (IOError, OSError, TypeError, ValueError) as e:
+                print(f"Error saving settings: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                # Keep the changes: the next change or the exit flush tries again.
+                # Unless the folder is gone, then only a new change retries.
+                self._dirty = True
+                if os.path.isdir(os.path.dirname(self.settings_path)):
+                    with self._pending_lock:
+                        SettingsManager._pending.setdefault(self.settings_path, self)
+
+    @classmethod
+    def flush_pending(cls, settings_path: str = None):
+        """
+        Writes unsaved changes of all managers (or just the one for `settings_path`).
+
+        Args:
+            settings_path (str, optional): Only flush the manager for this file.
+        """
+        with cls._pending_lock:
+            if settings_path is None:
+                managers = list(cls._pending.values())
+            else:
+                managers = [cls._pending[settings_path]] if settings_path in cls._pending else []
+        for manager in managers:
+            manager.flush()
 
     def get_enabled_apps(self) -> List[str]:
         """Returns a list of IDs for enabled applications."""
@@ -81,8 +272,7 @@ class SettingsManager:
 
     def set_enabled_apps(self, apps: List[str]):
         """Updates the list of enabled applications and saves settings."""
-        self.settings["enabled_apps"] = apps
-        self.save_settings()
+        self.set_value("enabled_apps", apps)
         
     def is_app_enabled(self, app_id: str) -> bool:
         """
@@ -107,8 +297,7 @@ class SettingsManager:
 
     def set_app_order(self, order: List[str]):
         """Updates the application order and saves settings."""
-        self.settings["app_order"] = order
-        self.save_settings()
+        self.set_value("app_order", order)
 
     def get_app_positions(self) -> Dict[str, Dict[str, int]]:
         """Returns the grid positions for applications."""
@@ -116,8 +305,7 @@ class SettingsManager:
 
     def set_app_positions(self, positions: Dict[str, Dict[str, int]]):
         """Updates the application positions and saves settings."""
-        self.settings["app_positions"] = positions
-        self.save_settings()
+        self.set_value("app_positions", positions)
 
     def get_enabled_widgets(self) -> List[str]:
         """Returns a list of IDs for enabled widgets."""
@@ -125,8 +313,7 @@ class SettingsManager:
 
     def set_enabled_widgets(self, widgets: List[str]):
         """Updates the list of enabled widgets and saves settings."""
-        self.settings["enabled_widgets"] = widgets
-        self.save_settings()
+        self.set_value("enabled_widgets", widgets)
 
     def is_widget_enabled(self, widget_id: str) -> bool:
         """Checks if a specific widget is enabled."""
@@ -138,8 +325,7 @@ class SettingsManager:
 
     def set_widget_order(self, order: List[str]):
         """Updates the widget order and saves settings."""
-        self.settings["widget_order"] = order
-        self.save_settings()
+        self.set_value("widget_order", order)
 
     def get_widget_positions(self) -> Dict[int, str]:
         """
@@ -154,8 +340,8 @@ class SettingsManager:
 
     def set_widget_positions(self, positions: Dict[int, str]):
         """Updates the widget positions and saves settings."""
-        self.settings["widget_positions"] = positions
-        self.save_settings()
+        # Stored with string keys, the way they come back from JSON
+        self.set_value("widget_positions", {str(k): v for k, v in positions.items()})
 
     def get_language(self) -> str:
         """Returns the current language code."""
@@ -163,8 +349,7 @@ class SettingsManager:
 
     def set_language(self, language: str):
         """Updates the language and saves settings."""
-        self.settings["language"] = language
-        self.save_settings()
+        self.set_value("language", language)
 
     def get_resolution(self) -> str:
         """Returns the saved resolution setting (e.g., 'auto' or '1920x1080')."""
@@ -172,8 +357,7 @@ class SettingsManager:
 
     def set_resolution(self, resolution: str):
         """Updates the resolution setting and saves."""
-        self.settings["resolution"] = resolution
-        self.save_settings()
+        self.set_value("resolution", resolution)
 
     def get_screensaver_settings(self) -> Dict[str, Any]:
         """Returns the screensaver settings."""
@@ -181,5 +365,45 @@ class SettingsManager:
 
     def set_screensaver_settings(self, settings: Dict[str, Any]):
         """Updates the screensaver settings and saves."""
-        self.settings["screensaver"] = settings
-        self.save_settings()
+        self.set_value("screensaver", settings)
+
+    def get_prewarm_budget(self) -> int:
+        """Returns how many apps should be started in the background."""
+        return self.settings.get("prewarm_budget", self.DEFAULT_SETTINGS["prewarm_budget"])
+
+    def set_prewarm_budget(self, budget: int):
+        """Updates the prewarm budget and saves."""
+        self.set_value("prewarm_budget", budget)
+
+    def get_app_launch_counts(self) -> Dict[str, int]:
+        """Returns how often each app has been launched."""
+        return self.settings.get("app_launch_counts", {})
+
+    def record_app_launch(self, app_id: str):
+        """Counts one launch of the given app and saves."""
+        counts = dict(self.settings.get("app_launch_counts", {}))
+        counts[app_id] = counts.get(app_id, 0) + 1
+        self.set_value("app_launch_counts", counts)
+
+    def get_app_eviction_settings(self) -> Dict[str, int]:
+        """Returns the limits used to unload idle apps."""
+        return self.settings.get("app_eviction", self.DEFAULT_SETTINGS["app_eviction"])
+
+    def set_app_eviction_settings(self, settings: Dict[str, int]):
+        """Updates the app unloading limits and saves."""
+        self.set_value("app_eviction", settings)
+
+    def get_backup_keep(self) -> int:
+        """Gets how many backup archives to keep."""
+        return self.settings.get("backup_keep", self.DEFAULT_SETTINGS["backup_keep"])
+
+    def get_pantry_settings(self) -> Dict[str, Any]:
+        """Returns the pantry manager's settings."""
+        return {**self.DEFAULT_SETTINGS["pantry"], **self.settings.get("pantry", {})}
+
+    def get_hot_reload(self) -> bool:
+        """Returns whether changed apps and widgets are reloaded while running."""
+        return self.settings.get("hot_reload", self.DEFAULT_SETTINGS["hot_reload"])
+
+# Don't lose changes made right before the interpreter exits
+atexit.register(SettingsManager.flush_pending)
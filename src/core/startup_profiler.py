@@ -0,0 +1,285 @@
+"""
+Startup Profiler Module.
+
+Times the phases of the hub's startup and how long each module import takes.
+It is switched off by default; `python main.py --profile-startup` turns it on,
+and once the first frame is painted it writes a Chrome trace-event JSON file
+(open it in chrome://tracing or https://ui.perfetto.dev) and prints a summary.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+import importlib.abc
+from typing import List, Dict, Any, Optional
+
+class _Phase(contextlib.ContextDecorator):
+    """
+    A single timed span. Works as a context manager and as a decorator.
+    """
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.start_ns = None
+
+    def _recreate_cm(self):
+        # Each decorated call gets its own span
+        return _Phase(self.profiler, self.name, self.category)
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.start_ns = time.perf_counter_ns()
+            self.profiler._push()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.start_ns is not None:
+            self.profiler._pop(self.name, self.category, self.start_ns, time.perf_counter_ns())
+            self.start_ns = None
+        return False
+
+class _TimedLoader:
+    """
+    Wraps a module loader so creating and executing the module gets timed.
+    """
+    def __init__(self, loader, profiler, fullname):
+        self._loader = loader
+        self._profiler = profiler
+        self._fullname = fullname
+        self._start_ns = None
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        self._start_ns = time.perf_counter_ns()
+        self._profiler._push()
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        if self._start_ns is None:
+            self._start_ns = time.perf_counter_ns()
+            self._profiler._push()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._pop(self._fullname, "import", self._start_ns, time.perf_counter_ns())
+            self._start_ns = None
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path hook that hands out timed loaders for every new import.
+    """
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        if not self.profiler.enabled:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self.profiler, fullname)
+            return spec
+        return None
+
+class StartupProfiler:
+    """
+    Collects timed spans during startup.
+
+    Attributes:
+        enabled (bool): Whether spans are being recorded right now.
+        events (List[Dict]): The recorded spans.
+        output_path (str): Where the trace file goes when profiling finishes.
+    """
+    def __init__(self):
+        """Sets up a disabled profiler."""
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self.output_path: Optional[str] = None
+        self.origin_ns = time.perf_counter_ns()
+        self._stacks = threading.local()
+        self._import_timer = None
+        self._paint_filter = None
+
+    def enable(self, output_path: Optional[str] = None, trace_imports: bool = True):
+        """
+        Starts recording.
+
+        Args:
+            output_path (str, optional): Where to write the trace file on `finish`.
+            trace_imports (bool): Also time every module import from now on.
+        """
+        self.enabled = True
+        self.output_path = output_path
+        if trace_imports and self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def disable(self):
+        """Stops recording and removes the import hook."""
+        self.enabled = False
+        if self._import_timer is not None:
+            if self._import_timer in sys.meta_path:
+                sys.meta_path.remove(self._import_timer)
+            self._import_timer = None
+
+    def phase(self, name: str, category: str = "phase") -> _Phase:
+        """
+        Times a block of code (or a function, when used as a decorator).
+
+        Args:
+            name (str): What shows up in the trace.
+            category (str): Trace category, e.g. 'phase' or 'paint'.
+        """
+        return _Phase(self, name, category)
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self._stacks, "stack", None)
+        if stack is None:
+            stack = self._stacks.stack = []
+        return stack
+
+    def _push(self):
+        self._stack().append(0)
+
+    def _pop(self, name, category, start_ns, end_ns):
+        stack = self._stack()
+        children_ns = stack.pop() if stack else 0
+        duration_ns = end_ns - start_ns
+        if stack:
+            stack[-1] += duration_ns
+
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "start_ns": start_ns,
+            "dur_ns": duration_ns,
+            "self_ns": duration_ns - children_ns,
+            "depth": len(stack),
+            "tid": threading.get_ident(),
+        })
+
+    def to_trace_events(self) -> Dict[str, Any]:
+        """
+        Builds the Chrome trace-event document.
+
+        Returns:
+            Dict: A dict with 'traceEvents' ready to be dumped as JSON.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for event in sorted(self.events, key=lambda e: e["start_ns"]):
+            trace_events.append({
+                "name": event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": (event["start_ns"] - self.origin_ns) / 1000.0,
+                "dur": event["dur_ns"] / 1000.0,
+                "pid": pid,
+                "tid": event["tid"],
+                "args": {"self_ms": round(event["self_ns"] / 1e6, 3)},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str):
+        """
+        Writes the trace-event JSON file.
+
+        Args:
+            path (str): Target file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_trace_events(), f)
+
+    def summary(self, top_imports: int = 15) -> str:
+        """
+        Builds a plain-text table of the phases and the slowest imports.
+
+        Args:
+            top_imports (int): How many imports to list, ranked by self time.
+
+        Returns:
+            str: The formatted table.
+        """
+        lines = [f"{'Phase':<48}{'Start (ms)':>12}{'Duration (ms)':>16}"]
+        phases = sorted((e for e in self.events if e["cat"] != "import"), key=lambda e: e["start_ns"])
+        for event in phases:
+            name = "  " * event["depth"] + event["name"]
+            start_ms = (event["start_ns"] - self.origin_ns) / 1e6
+            lines.append(f"{name:<48}{start_ms:>12.1f}{event['dur_ns'] / 1e6:>16.1f}")
+
+        imports = [e for e in self.events if e["cat"] == "import"]
+        if imports:
+            total_ms = sum(e["self_ns"] for e in imports) / 1e6
+            lines.append("")
+            lines.append(f"Imports: {len(imports)} modules, {total_ms:.1f} ms total")
+            lines.append(f"{'Module':<48}{'Self (ms)':>12}{'Total (ms)':>16}")
+            for event in sorted(imports, key=lambda e: e["self_ns"], reverse=True)[:top_imports]:
+                lines.append(f"{event['name']:<48}{event['self_ns'] / 1e6:>12.1f}{event['dur_ns'] / 1e6:>16.1f}")
+        return "\n".join(lines)
+
+    def watch_first_paint(self, widget, start_ns: Optional[int] = None):
+        """
+        Records the time until the widget is first painted, then calls `finish`.
+
+        Args:
+            widget (QWidget): The window to watch.
+            start_ns (int, optional): Where the span starts. Defaults to now.
+        """
+        if not self.enabled:
+            return
+
+        from PySide6.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+        paint_start_ns = start_ns if start_ns is not None else time.perf_counter_ns()
+
+        class _FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    # Let the paint itself run before we stop the clock
+                    QTimer.singleShot(0, lambda: profiler._on_first_paint(paint_start_ns))
+                return False
+
+        self._paint_filter = _FirstPaintFilter(widget)
+        widget.installEventFilter(self._paint_filter)
+
+    def _on_first_paint(self, start_ns):
+        self._push()
+        self._pop("first paint", "paint", start_ns, time.perf_counter_ns())
+        self.finish()
+
+    def finish(self):
+        """
+        Stops recording, writes the trace file (if a path was set) and prints the summary.
+        """
+        if not self.enabled:
+            return
+
+        self.disable()
+        self._push()
+        self._pop("startup", "phase", self.origin_ns, time.perf_counter_ns())
+
+        if self.output_path:
+            try:
+                self.write_trace(self.output_path)
+                print(f"Startup trace written to {self.output_path}")
+            except OSError as e:
+                print(f"Error writing startup trace: {e}")
+        print(self.summary())
+
+# Shared instance used by main.py and the hub
+startup_profiler = StartupProfiler()
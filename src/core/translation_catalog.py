@@ -0,0 +1,153 @@
+"""
+Translation Catalog Module.
+
+Parses each 'languages/<code>.json' file at most once per session and keeps
+the result in memory, so switching languages doesn't touch the disk. The
+parsed catalogs can also be kept together in one cache file, which is reused
+as long as each JSON file's modification time and size haven't changed. The
+cache is plain JSON and checked on load, since anyone who can write to the
+data folder can change it.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+class TranslationCatalog:
+    """
+    Memoized translation tables for all languages.
+
+    Attributes:
+        VERSION (int): Format version of the cache file. Bump it to force a reparse.
+        languages_dir (str): Folder with the '<code>.json' files.
+        cache_path (str): Optional cache file.
+        catalogs (Dict[str, Dict[str, str]]): Translations per language code.
+    """
+    VERSION = 2
+
+    def __init__(self, languages_dir: str, cache_path: Optional[str] = None):
+        """
+        Sets up an empty catalog. Nothing is read until a language is needed.
+
+        Args:
+            languages_dir (str): Where the language files live.
+            cache_path (str, optional): Where to keep the cache file.
+        """
+        self.languages_dir = languages_dir
+        self.cache_path = cache_path
+        self.catalogs: Dict[str, Dict[str, str]] = {}
+        self._languages: Optional[List[str]] = None
+        self._cache_entries = None # code -> (stamp, translations)
+
+    def available_languages(self) -> List[str]:
+        """
+        Returns the codes of all language files (listed once, then remembered).
+
+        Returns:
+            List[str]: Sorted language codes.
+        """
+        if self._languages is None:
+            if os.path.exists(self.languages_dir):
+                self._languages = sorted(
+                    filename[:-5] for filename in os.listdir(self.languages_dir)
+                    if filename.endswith(".json")
+                )
+            else:
+                self._languages = ["en"]
+        return self._languages
+
+    def get(self, lang_code: str) -> Dict[str, str]:
+        """
+        Returns the translations for a language, loading them on first use.
+
+        Args:
+            lang_code (str): The language code, e.g. 'de'.
+
+        Returns:
+            Dict[str, str]: The translations (empty if the file is missing or broken).
+        """
+        catalog = self.catalogs.get(lang_code)
+        if catalog is not None:
+            return catalog
+
+        file_path = os.path.join(self.languages_dir, f"{lang_code}.json")
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            print(f"Language file not found: {file_path}")
+            self.catalogs[lang_code] = {}
+            return self.catalogs[lang_code]
+
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cached = self._load_cache().get(lang_code)
+        if cached and cached[0] == stamp:
+            catalog = cached[1]
+        else:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    catalog = json.load(f)
+            except Exception as e:
+                print(f"Error loading language {lang_code}: {e}")
+                catalog = {}
+            else:
+                self._cache_entries[lang_code] = (stamp, catalog)
+                self._save_cache()
+
+        self.catalogs[lang_code] = catalog
+        return catalog
+
+    def preload(self):
+        """Loads every available language, so later switches are instant."""
+        for lang_code in self.available_languages():
+            self.get(lang_code)
+
+    def refresh(self):
+        """Forgets everything in memory; the next lookups check the files again."""
+        self.catalogs = {}
+        self._languages = None
+
+    def _load_cache(self):
+        if self._cache_entries is not None:
+            return self._cache_entries
+
+        self._cache_entries = {}
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return self._cache_entries
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading translation cache: {e}")
+            return self._cache_entries
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            languages = data.get("languages")
+            if isinstance(languages, dict):
+                # Anything that doesn't look right is parsed from the JSON file again
+                self._cache_entries = {code: (entry[0], entry[1]) for code, entry in languages.items()
+                                       if self._is_valid_entry(entry)}
+        return self._cache_entries
+
+    @staticmethod
+    def _is_valid_entry(entry) -> bool:
+        """Whether a cache entry is [[mtime_ns, size], {key: text}]."""
+        if not isinstance(entry, list) or len(entry) != 2:
+            return False
+        stamp, translations = entry
+        return (isinstance(stamp, list) and len(stamp) == 2 and all(type(n) is int for n in stamp)
+                and isinstance(translations, dict)
+                and all(isinstance(k, str) and isinstance(v, str) for k, v in translations.items()))
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+
+        data = {"version": self.VERSION, "languages": self._cache_entries}
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving translation cache: {e}")
@@ -4,12 +4,16 @@ Widget Registry Module.
 This module provides the `WidgetRegistry` class, which is responsible for discovering
 and managing dashboard widgets. It scans a specified directory for Python files
 defining widgets and handles their dynamic loading and instantiation.
+
+Discovery only parses the source files; a widget module is imported the first
+time one of its widgets is actually instantiated.
 """
 
 import os
+import ast
+import importlib
 import importlib.util
 import sys
-import inspect
 from typing import List, Dict, Any, Optional
 
 class WidgetRegistry:
@@ -37,35 +41,129 @@ class WidgetRegistry:
         Scans the widgets directory for valid widget implementations.
 
         It looks for Python files containing classes that end with 'Widget'.
-        Valid widgets are registered in the `self.widgets` dictionary.
+        The files are only parsed, not executed, so discovering a widget doesn't
+        pull in its dependencies. Valid widgets are registered in the
+        `self.widgets` dictionary with their class left unloaded.
         """
         self.widgets = {}
         if not os.path.exists(self.widgets_dir):
             return
 
         for entry in os.scandir(self.widgets_dir):
-            if entry.is_file() and entry.name.endswith(".py") and not entry.name.startswith("__"):
-                try:
-                    module_name = entry.name[:-3] # remove .py
-                    spec = importlib.util.spec_from_file_location(f"widgets.{module_name}", entry.path)
-                    if spec and spec.loader:
-                        module = importlib.util.module_from_spec(spec)
-                        sys.modules[f"widgets.{module_name}"] = module
-                        spec.loader.exec_module(module)
-                        
-                        # Find classes ending with 'Widget'
-                        for name, obj in inspect.getmembers(module, inspect.isclass):
-                            if name.endswith("Widget") and obj.__module__ == module.__name__:
-                                # Use filename as ID (or maybe class name?)
-                                # Let's use filename as ID for simplicity, or generate one
-                                widget_id = module_name
-                                
-                                self.widgets[widget_id] = {
-                                    "name": name.replace("Widget", ""), # Simple name extraction
-                                    "class": obj
-                                }
-                except Exception as e:
-                    print(f"Error loading widget {entry.name}: {e}")
+            if entry.is_file() and self.is_widget_file(entry.name):
+                self.register_widget_file(entry.path)
+
+    @staticmethod
+    def is_widget_file(file_name: str) -> bool:
+        """Whether a file in the widgets folder could hold a widget."""
+        return file_name.endswith(".py") and not file_name.startswith("__")
+
+    def register_widget_file(self, file_path: str) -> Optional[str]:
+        """
+        Parses a widget file and registers the widget it defines.
+
+        Args:
+            file_path (str): The Python file.
+
+        Returns:
+            str: The widget ID (the file name), or None if it holds no widget.
+        """
+        file_name = os.path.basename(file_path)
+        try:
+            module_name = file_name[:-3] # remove .py
+            class_names = self.find_widget_classes(file_path)
+            if not class_names:
+                return None
+
+            # Use filename as ID. If a file defines several widgets, the
+            # last one by name wins (same as the old inspect-based scan).
+            class_name = sorted(class_names)[-1]
+            self.widgets[module_name] = {
+                "name": class_name.replace("Widget", ""), # Simple name extraction
+                "module": f"widgets.{module_name}",
+                "path": file_path,
+                "class_name": class_name,
+                "class": None
+            }
+            return module_name
+        except Exception as e:
+            print(f"Error scanning widget {file_name}: {e}")
+            return None
+
+    def reload_widget_file(self, file_path: str) -> str:
+        """
+        Picks up changes to a single widget file without touching the others.
+
+        The widget's module is dropped from `sys.modules`, so the next
+        instance runs the new code. Deleted files are unregistered.
+
+        Args:
+            file_path (str): The widget file that was added, changed or deleted.
+
+        Returns:
+            str: The ID of the affected widget.
+        """
+        widget_id = os.path.basename(file_path)[:-3]
+        old = self.widgets.pop(widget_id, None)
+        module_name = old["module"] if old else f"widgets.{widget_id}"
+        sys.modules.pop(module_name, None)
+        importlib.invalidate_caches()
+
+        if os.path.exists(file_path):
+            self.register_widget_file(file_path)
+        return widget_id
+
+    @staticmethod
+    def find_widget_classes(file_path: str) -> List[str]:
+        """
+        Finds widget classes in a source file without importing it.
+
+        Args:
+            file_path (str): The Python file to look at.
+
+        Returns:
+            List[str]: Names of top-level classes ending with 'Widget'.
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=file_path)
+
+        return [node.name for node in tree.body
+                if isinstance(node, ast.ClassDef) and node.name.endswith("Widget")]
+
+    def load_widget_class(self, widget_id: str) -> Optional[Any]:
+        """
+        Imports the widget's module (once) and returns its class.
+
+        Args:
+            widget_id (str): The unique identifier of the widget.
+
+        Returns:
+            Optional[Any]: The widget class, or None if it couldn't be loaded.
+        """
+        widget_data = self.widgets.get(widget_id)
+        if not widget_data:
+            return None
+
+        if widget_data["class"]:
+            return widget_data["class"]
+
+        try:
+            module_name = widget_data["module"]
+            module = sys.modules.get(module_name)
+            if module is None or os.path.abspath(getattr(module, "__file__", "") or "") != os.path.abspath(widget_data["path"]):
+                spec = importlib.util.spec_from_file_location(module_name, widget_data["path"])
+                if not spec or not spec.loader:
+                    return None
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+
+            widget_data["class"] = getattr(module, widget_data["class_name"])
+        except Exception as e:
+            print(f"Error loading widget {widget_id}: {e}")
+            return None
+
+        return widget_data["class"]
 
     def get_widget_list(self) -> List[Dict[str, Any]]:
         """
@@ -91,25 +189,28 @@ class WidgetRegistry:
         if widget_id not in self.widgets:
             return None
             
-        widget_data = self.widgets[widget_id]
+        widget_class = self.load_widget_class(widget_id)
+        if widget_class is None:
+            return None
+
         # Always create a new instance because the UI might have deleted the previous one
         try:
             # Try with both managers
             if language_manager and res_manager:
                 try:
-                    return widget_data["class"](language_manager=language_manager, res_manager=res_manager)
+                    return widget_class(language_manager=language_manager, res_manager=res_manager)
                 except TypeError:
                     pass # Fallback
 
             # Try with just language_manager
             if language_manager:
                 try:
-                    return widget_data["class"](language_manager=language_manager)
+                    return widget_class(language_manager=language_manager)
                 except TypeError:
                     pass # Fallback
             
             # Try with no args
-            return widget_data["class"]()
+            return widget_class()
 
         except Exception as e:
             print(f"Error instantiating widget {widget_id}: {e}")
@@ -0,0 +1,139 @@
+"""
+Preview Cache Module.
+
+Keeps the scaled preview images shown on dashboard tiles, both in memory and
+on disk. A preview is reused as long as its app's content generation and the
+tile size haven't changed, and the last known preview of every app survives
+a restart so tiles aren't empty while apps are still starting up.
+"""
+
+import os
+import threading
+import weakref
+from typing import Dict, Tuple, Optional
+
+from PySide6.QtGui import QPixmap
+
+_caches = weakref.WeakSet() # Every live cache, for clear_preview_caches
+
+class PreviewCache:
+    """
+    Two-level (memory + disk) cache of scaled tile previews.
+
+    Attributes:
+        cache_dir (str): Folder holding one PNG per app and tile size.
+        memory (Dict): app_id -> (generation, size, pixmap) of the current session.
+    """
+    def __init__(self, cache_dir: str):
+        """
+        Sets up the cache.
+
+        Args:
+            cache_dir (str): Where preview images are stored.
+        """
+        self.cache_dir = cache_dir
+        self.memory: Dict[str, Tuple[int, Tuple[int, int], QPixmap]] = {}
+        self.pending_writes = []
+        _caches.add(self)
+
+    def file_path(self, app_id: str, size: Tuple[int, int]) -> str:
+        """Returns the on-disk location of an app's preview for a tile size."""
+        return os.path.join(self.cache_dir, f"{app_id}_{size[0]}x{size[1]}.png")
+
+    def get(self, app_id: str, generation: int, size: Tuple[int, int]) -> Optional[QPixmap]:
+        """
+        Returns the cached preview if it matches the generation and size exactly.
+
+        Args:
+            app_id (str): The app.
+            generation (int): The app's current content generation.
+            size (Tuple[int, int]): The tile's preview size.
+
+        Returns:
+            QPixmap: The cached preview, or None if it has to be captured again.
+        """
+        entry = self.memory.get(app_id)
+        if entry and entry[0] == generation and entry[1] == tuple(size):
+            return entry[2]
+        return None
+
+    def get_latest(self, app_id: str, size: Tuple[int, int]) -> Optional[QPixmap]:
+        """
+        Returns the most recent preview we know of, even if it may be outdated.
+
+        Used to fill tiles before their app is running. Falls back to the
+        preview saved on disk by an earlier session.
+
+        Args:
+            app_id (str): The app.
+            size (Tuple[int, int]): The tile's preview size.
+
+        Returns:
+            QPixmap: The last known preview, or None.
+        """
+        entry = self.memory.get(app_id)
+        if entry and entry[1] == tuple(size):
+            return entry[2]
+
+        path = self.file_path(app_id, size)
+        if os.path.exists(path):
+            pixmap = QPixmap(path)
+            if not pixmap.isNull():
+                return pixmap
+        return None
+
+    def put(self, app_id: str, generation: int, size: Tuple[int, int], pixmap: QPixmap):
+        """
+        Stores a freshly captured preview in memory and writes it to disk.
+
+        The PNG is encoded on a background thread so the UI doesn't wait for it.
+
+        Args:
+            app_id (str): The app.
+            generation (int): The content generation the preview was captured at.
+            size (Tuple[int, int]): The tile's preview size.
+            pixmap (QPixmap): The scaled preview.
+        """
+        self.memory[app_id] = (generation, tuple(size), pixmap)
+
+        # QPixmap is tied to the GUI thread, QImage can be saved from anywhere
+        image = pixmap.toImage()
+        path = self.file_path(app_id, size)
+
+        def save_task(img, target):
+            try:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                tmp_path = f"{target}.tmp.png"
+                if img.save(tmp_path):
+                    os.replace(tmp_path, target)
+            except Exception as e:
+                print(f"Error saving preview for {app_id}: {e}")
+
+        thread = threading.Thread(target=save_task, args=(image, path), daemon=True)
+        thread.start()
+        self.pending_writes = [t for t in self.pending_writes if t.is_alive()] + [thread]
+
+    def flush(self):
+        """Waits until all previews queued by `put` are written to disk."""
+        for thread in self.pending_writes:
+            thread.join()
+        self.pending_writes = []
+
+    def invalidate(self, app_id: str):
+        """Forgets the in-memory preview of an app (the disk copy stays as a fallback)."""
+        self.memory.pop(app_id, None)
+
+    def clear(self):
+        """
+        Forgets every preview, e.g. after the data was reset or restored.
+
+        Waits for queued disk writes first, so none of them puts an old
+        preview back after the caller deleted the folder.
+        """
+        self.memory.clear()
+        self.flush()
+
+def clear_preview_caches():
+    """Clears every preview cache in use (see `PreviewCache.clear`)."""
+    for cache in list(_caches):
+        cache.clear()
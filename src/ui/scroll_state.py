@@ -0,0 +1,26 @@
+"""
+Scroll State Module.
+
+Helpers for putting a scroll bar back where it was. A freshly built view
+usually hasn't been laid out yet, so its scroll range is still empty and the
+saved position can only be applied once the content has been measured.
+"""
+
+def restore_scroll_position(scroll_bar, value: int):
+    """
+    Scrolls to `value`, waiting for the scroll range to grow if needed.
+
+    Args:
+        scroll_bar (QScrollBar): The scroll bar to move.
+        value (int): The saved position.
+    """
+    if not value or value <= scroll_bar.maximum():
+        scroll_bar.setValue(value or 0)
+        return
+
+    def on_range_changed(minimum, maximum):
+        # Only wait for the first layout pass, later changes are the user's business
+        scroll_bar.rangeChanged.disconnect(on_range_changed)
+        scroll_bar.setValue(min(value, maximum))
+
+    scroll_bar.rangeChanged.connect(on_range_changed)
@@ -8,8 +8,14 @@ from PySide6.QtWidgets import QApplication
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import src.core.paths as paths
+import apps.calendar.database as calendar_database
+import apps.task_board.database as task_database
+import apps.hub.components.dashboard as dashboard
 from src.core.settings_manager import SettingsManager
 from src.core.paths import get_db_path
+from src.core.database import close_database, close_all_databases
+from src.core.query_runner import shutdown_worker_pool
 
 @pytest.fixture(scope="session")
 def qapp():
@@ -21,6 +27,28 @@ def qapp():
         app = QApplication([])
     yield app
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "real_data_dir: use the repository's data/ folder (read-only tests)")
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(request, monkeypatch):
+    """
+    Points everything that writes to data/ (app databases, previews, caches)
+    at a temporary folder, so running the tests never changes the repository.
+    """
+    if request.node.get_closest_marker("real_data_dir"):
+        yield paths.DATA_DIR
+        return
+    data_dir = tempfile.mkdtemp()
+    monkeypatch.setattr(paths, "DATA_DIR", data_dir)
+    monkeypatch.setattr(dashboard, "DATA_DIR", data_dir)
+    monkeypatch.setattr(calendar_database, "DB_PATH", os.path.join(data_dir, "events.db"))
+    monkeypatch.setattr(task_database, "DB_PATH", os.path.join(data_dir, "tasks.db"))
+    yield data_dir
+    shutdown_worker_pool()
+    close_all_databases()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
 @pytest.fixture
 def temp_dir():
     """
@@ -28,6 +56,8 @@ def temp_dir():
     """
     temp_dir = tempfile.mkdtemp()
     yield temp_dir
+    # Settings managers still waiting to write would do so into the deleted folder
+    SettingsManager.flush_pending()
     shutil.rmtree(temp_dir)
 
 @pytest.fixture
@@ -39,6 +69,16 @@ def mock_settings(temp_dir):
     os.makedirs(config_dir)
     return SettingsManager(config_dir)
 
+@pytest.fixture
+def pantry(temp_dir):
+    """
+    A pantry DatabaseManager on an empty database in the temporary directory.
+    """
+    from apps.pantry_manager.database import DatabaseManager
+    path = os.path.join(temp_dir, "pantry.db")
+    yield DatabaseManager(path)
+    close_database(path)
+
 @pytest.fixture
 def temp_db(temp_dir):
     """
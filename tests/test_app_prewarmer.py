@@ -0,0 +1,28 @@
+from src.core.app_registry import AppRegistry
+from src.core.app_prewarmer import AppPrewarmer
+
+def test_rank_apps_by_launch_count():
+    ranked = AppPrewarmer.rank_apps(["a", "b", "c", "d"], {"c": 5, "b": 2, "d": 2})
+    assert ranked == ["c", "b", "d", "a"]
+
+def test_prewarm_respects_budget(qapp, temp_dir):
+    registry = AppRegistry(temp_dir)
+    for app_id in ("alpha", "beta", "gamma"):
+        registry.apps[app_id] = {
+            "name": app_id, "entry_point": "app:App", "path": temp_dir,
+            "instance": None, "class": type("App", (), {})
+        }
+
+    prewarmer = AppPrewarmer(registry)
+    ready = []
+    prewarmer.app_ready.connect(lambda app_id, instance: ready.append(app_id))
+
+    prewarmer.schedule(["alpha", "beta", "gamma"], {"gamma": 3, "beta": 1}, budget=2)
+    # Nothing is started until the event loop gets to it
+    assert all(registry.get_loaded_instance(a) is None for a in ("alpha", "beta", "gamma"))
+
+    while prewarmer.queue:
+        prewarmer.process_next()
+
+    assert ready == ["gamma", "beta"]
+    assert registry.get_loaded_instance("alpha") is None
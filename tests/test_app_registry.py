@@ -61,5 +61,131 @@ class TestAppRegistry(unittest.TestCase):
         apps = self.registry.get_app_list()
         self.assertEqual(len(apps), 0)
 
+    def test_manifest_index_reuse(self):
+        index_path = os.path.join(self.test_dir, "index", "app_index.json")
+        self.create_dummy_app("app1", "App One")
+        registry = AppRegistry(self.test_dir, index_path=index_path)
+        self.assertTrue(os.path.exists(index_path))
+
+        # Same size and mtime: the index entry is still considered fresh
+        manifest_path = os.path.join(self.test_dir, "app1", "manifest.json")
+        stat = os.stat(manifest_path)
+        with open(manifest_path, "w") as f:
+            json.dump({"name": "App Uno", "id": "app1", "entry_point": "app.py:App"}, f)
+        os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        registry = AppRegistry(self.test_dir, index_path=index_path)
+        self.assertEqual(registry.get_app_list()[0]["name"], "App One")
+
+        registry.scan_apps(force_rescan=True)
+        self.assertEqual(registry.get_app_list()[0]["name"], "App Uno")
+
+    def test_manifest_index_validation(self):
+        index_path = os.path.join(self.test_dir, "index", "app_index.json")
+        self.create_dummy_app("app1", "App One")
+        self.create_dummy_app("app2", "App Two")
+        registry = AppRegistry(self.test_dir, index_path=index_path)
+        self.assertEqual(registry.validate_index(), [])
+
+        manifest_path = os.path.join(self.test_dir, "app1", "manifest.json")
+        with open(manifest_path, "w") as f:
+            json.dump({"name": "Renamed App", "id": "app1", "entry_point": "app.py:App"}, f)
+        shutil.rmtree(os.path.join(self.test_dir, "app2"))
+        self.create_dummy_app("app3", "App Three")
+
+        reasons = {os.path.basename(s["path"]): s["reason"] for s in registry.validate_index()}
+        self.assertEqual(reasons, {"app1": "modified", "app2": "missing", "app3": "unindexed"})
+
+        registry.scan_apps()
+        self.assertEqual(registry.validate_index(), [])
+        names = {app["id"]: app["name"] for app in registry.get_app_list()}
+        self.assertEqual(names, {"app1": "Renamed App", "app3": "App Three"})
+
+    def test_corrupt_index_falls_back_to_rescan(self):
+        index_path = os.path.join(self.test_dir, "app_index.json")
+        with open(index_path, "w") as f:
+            f.write("{not json")
+        self.create_dummy_app("app1", "App One")
+
+        registry = AppRegistry(self.test_dir, index_path=index_path)
+        self.assertEqual([app["id"] for app in registry.get_app_list()], ["app1"])
+
+    def register_stateful_apps(self, *app_ids):
+        class StatefulApp:
+            def __init__(self):
+                self.state = None
+                self.closed = False
+
+            def save_state(self):
+                return {"scroll": 42}
+
+            def restore_state(self, state):
+                self.state = state
+
+            def close(self):
+                self.closed = True
+
+        for app_id in app_ids:
+            self.create_dummy_app(app_id, app_id)
+        self.registry.scan_apps()
+        for app_id in app_ids:
+            self.registry.apps[app_id]["class"] = StatefulApp
+
+    def test_evicts_least_recently_used_beyond_limit(self):
+        self.register_stateful_apps("app1", "app2", "app3")
+        self.registry.max_instances = 2
+
+        for now, app_id in enumerate(["app1", "app2", "app3"]):
+            self.registry.get_app_instance(app_id)
+            self.registry.touch(app_id, now=now)
+        self.registry.touch("app1", now=10)
+
+        self.assertEqual(self.registry.evict_idle(now=11), ["app2"])
+        self.assertIsNone(self.registry.get_loaded_instance("app2"))
+        self.assertIsNotNone(self.registry.get_loaded_instance("app1"))
+
+    def test_evicts_idle_apps_but_not_protected_ones(self):
+        self.register_stateful_apps("app1", "app2")
+        self.registry.idle_timeout = 60
+        first = self.registry.get_app_instance("app1")
+        self.registry.get_app_instance("app2")
+        self.registry.touch("app1", now=0)
+        self.registry.touch("app2", now=0)
+
+        self.assertEqual(self.registry.evict_idle(now=100, protected=["app2"]), ["app1"])
+        self.assertTrue(first.closed)
+        self.assertEqual(self.registry.evict_idle(now=110, protected=["app2"]), [])
+
+    def test_state_is_restored_after_eviction(self):
+        self.register_stateful_apps("app1")
+        first = self.registry.get_app_instance("app1")
+        self.assertTrue(self.registry.evict_app("app1"))
+
+        second = self.registry.get_app_instance("app1")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.state, {"scroll": 42})
+        metrics = self.registry.get_metrics()
+        self.assertEqual((metrics["evictions"], metrics["restores"], metrics["loaded"]), (1, 1, 1))
+
+    def test_reload_app_dir_only_touches_that_app(self):
+        self.register_stateful_apps("app1", "app2")
+        first = self.registry.get_app_instance("app1")
+        other = self.registry.get_app_instance("app2")
+
+        manifest_path = os.path.join(self.test_dir, "app1", "manifest.json")
+        with open(manifest_path, "w") as f:
+            json.dump({"name": "Renamed", "id": "app1", "entry_point": "app.py:App"}, f)
+        self.assertEqual(self.registry.reload_app_dir(os.path.join(self.test_dir, "app1")), "app1")
+
+        self.assertTrue(first.closed)
+        self.assertIsNone(self.registry.get_loaded_instance("app1"))
+        self.assertEqual(self.registry.apps["app1"]["saved_state"], {"scroll": 42})
+        self.assertEqual(self.registry.apps["app1"]["name"], "Renamed")
+        self.assertIs(self.registry.get_loaded_instance("app2"), other)
+
+        shutil.rmtree(os.path.join(self.test_dir, "app1"))
+        self.registry.reload_app_dir(os.path.join(self.test_dir, "app1"))
+        self.assertNotIn("app1", self.registry.apps)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import zipfile
+import pytest
+from src.core.backup_manager import BackupManager
+
+@pytest.fixture
+def hub_dirs(temp_dir):
+    data_dir = os.path.join(temp_dir, "data")
+    config_dir = os.path.join(temp_dir, "config")
+    os.makedirs(data_dir)
+    os.makedirs(config_dir)
+
+    conn = sqlite3.connect(os.path.join(data_dir, "tasks.db"))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE tasks (name TEXT)")
+    conn.executemany("INSERT INTO tasks VALUES (?)", [(f"task {i}",) for i in range(500)])
+    conn.commit()
+    conn.close()
+    with open(os.path.join(config_dir, "settings.json"), "w") as f:
+        f.write('{"language": "de"}')
+    with open(os.path.join(data_dir, "whiteboard.png"), "wb") as f:
+        f.write(b"png")
+    return data_dir, config_dir
+
+def make_manager(hub_dirs, keep=5):
+    data_dir, config_dir = hub_dirs
+    return BackupManager(keep=keep, data_dir=data_dir, config_dir=config_dir)
+
+def test_backup_and_restore_round_trip(hub_dirs):
+    data_dir, config_dir = hub_dirs
+    manager = make_manager(hub_dirs)
+    archive = manager.create_backup()
+
+    with zipfile.ZipFile(archive) as zf:
+        assert set(zf.namelist()) == {"data/tasks.db", "data/whiteboard.png", "config/settings.json", "manifest.json"}
+
+    # Change everything after the backup
+    conn = sqlite3.connect(os.path.join(data_dir, "tasks.db"))
+    conn.execute("DELETE FROM tasks")
+    conn.commit()
+    conn.close()
+    os.remove(os.path.join(data_dir, "whiteboard.png"))
+    with open(os.path.join(config_dir, "settings.json"), "w") as f:
+        f.write('{"language": "en"}')
+
+    manager.apply_restore(manager.stage_restore(archive))
+
+    conn = sqlite3.connect(os.path.join(data_dir, "tasks.db"))
+    assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 500
+    conn.close()
+    assert os.path.exists(os.path.join(data_dir, "whiteboard.png"))
+    with open(os.path.join(config_dir, "settings.json")) as f:
+        assert "de" in f.read()
+    assert not [n for n in os.listdir(data_dir) if n.startswith(".restore-")]
+
+def test_old_backups_are_rotated(hub_dirs):
+    manager = make_manager(hub_dirs, keep=2)
+    archives = [manager.create_backup() for _ in range(3)]
+    assert manager.list_backups() == archives[:0:-1]
+
+def test_broken_archive_leaves_live_data_alone(hub_dirs, temp_dir):
+    data_dir, _ = hub_dirs
+    manager = make_manager(hub_dirs)
+    bad = os.path.join(temp_dir, "bad.zip")
+    with zipfile.ZipFile(bad, "w") as zf:
+        zf.writestr("manifest.json", '{"format": 1, "files": ["data/../../evil.db"]}')
+
+    with pytest.raises(ValueError):
+        manager.stage_restore(bad)
+    assert os.path.exists(os.path.join(data_dir, "tasks.db"))
+    assert not [n for n in os.listdir(data_dir) if n.startswith(".restore-")]
+
+def test_failed_swap_rolls_back(hub_dirs, monkeypatch):
+    data_dir, config_dir = hub_dirs
+    manager = make_manager(hub_dirs)
+    archive = manager.create_backup()
+    with open(os.path.join(config_dir, "settings.json"), "w") as f:
+        f.write('{"language": "en"}')
+    os.remove(os.path.join(data_dir, "whiteboard.png"))
+    staging = manager.stage_restore(archive)
+
+    real_replace = os.replace
+    def flaky_replace(src, dst):
+        if staging in src and dst.endswith("settings.json"):
+            raise PermissionError("locked")
+        real_replace(src, dst)
+    monkeypatch.setattr(os, "replace", flaky_replace)
+
+    with pytest.raises(PermissionError):
+        manager.apply_restore(staging)
+    with open(os.path.join(config_dir, "settings.json")) as f:
+        assert "en" in f.read()
+    assert not os.path.exists(os.path.join(data_dir, "whiteboard.png"))
+    conn = sqlite3.connect(os.path.join(data_dir, "tasks.db"))
+    assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 500
+    conn.close()
+    assert not [n for n in os.listdir(data_dir) if n.startswith((".restore-", ".rollback-"))]
+
+def test_pending_settings_write_does_not_undo_restore(hub_dirs, qapp):
+    from src.core.settings_manager import SettingsManager
+    data_dir, config_dir = hub_dirs
+    settings = SettingsManager(config_dir)
+    manager = BackupManager(data_dir=data_dir, config_dir=config_dir, settings_manager=settings)
+    archive = manager.create_backup()
+
+    settings.set_language("en") # Still waiting to be written
+    restored = []
+    manager.restore_finished.connect(restored.append)
+    manager.finish_restore(manager.stage_restore(archive), archive)
+
+    assert restored == [archive]
+    assert settings.get_language() == "de"
+    settings.flush()
+    with open(os.path.join(config_dir, "settings.json")) as f:
+        assert '"de"' in f.read()
@@ -1,3 +1,4 @@
+import pytest
 import os
 import sys
 from src.core.paths import ROOT_DIR, DATA_DIR, CONFIG_DIR, APPS_DIR, WIDGETS_DIR, get_db_path, get_config_path
@@ -26,6 +27,7 @@ def test_widgets_dir_structure():
     assert WIDGETS_DIR.startswith(ROOT_DIR)
     assert WIDGETS_DIR.endswith("widgets")
 
+@pytest.mark.real_data_dir
 def test_get_db_path():
     path = get_db_path("test.db")
     assert path == os.path.join(DATA_DIR, "test.db")
@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import threading
+import pytest
+from typing import NamedTuple
+from src.core.database import Database, get_database, close_database
+
+class Item(NamedTuple):
+    id: int
+    name: str
+
+@pytest.fixture
+def db(temp_dir):
+    database = Database(os.path.join(temp_dir, "test.db"))
+    database.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    yield database
+    database.close()
+
+def test_connection_is_reused_per_thread(db):
+    assert db.connection() is db.connection()
+    assert db.fetch_one("PRAGMA journal_mode")[0] == "wal"
+    assert db.fetch_one("PRAGMA synchronous")[0] == 1 # NORMAL
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not db.connection()
+
+def test_transaction_commits_or_rolls_back(db):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('a')")
+        with db.transaction():
+            conn.execute("INSERT INTO items (name) VALUES ('b')")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('c')")
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+
+    assert db.fetch_dicts("SELECT name FROM items ORDER BY name") == [{"name": "a"}, {"name": "b"}]
+    assert not db.connection().in_transaction
+
+def test_rows_come_back_as_records(db):
+    db.execute("INSERT INTO items (name) VALUES ('a'), ('b')")
+
+    items = db.fetch_records(Item, "SELECT id, name FROM items ORDER BY name")
+    assert items == [Item(1, "a"), Item(2, "b")]
+    assert type(items[0]) is Item and items[1].name == "b"
+    assert db.fetch_record(Item, "SELECT id, name FROM items WHERE name = ?", ("b",)).id == 2
+    assert db.fetch_record(Item, "SELECT id, name FROM items WHERE name = 'x'") is None
+
+    # The query has to match the record, or fields would silently get the wrong values
+    with pytest.raises(ValueError):
+        db.fetch_records(Item, "SELECT name, id FROM items")
+
+def test_get_database_is_shared_and_reopens_after_close(temp_dir):
+    path = os.path.join(temp_dir, "shared.db")
+    db = get_database(path)
+    assert get_database(path) is db
+    db.execute("CREATE TABLE t (x)")
+
+    # Whoever deletes the file closes it first; the next user gets a fresh pool
+    close_database(path)
+    os.remove(path)
+    reopened = get_database(path)
+    assert reopened is not db
+    reopened.execute("CREATE TABLE t (x)")
+    close_database(path)
+
+def test_writes_are_published_after_commit(db, qapp):
+    from src.core.change_bus import get_change_bus
+    changes = []
+    bus = get_change_bus()
+    bus.changed.connect(changes.append)
+    try:
+        with db.transaction() as conn:
+            cursor = conn.execute("INSERT INTO items (name) VALUES ('a')")
+            db.record_change("items", cursor.lastrowid, "insert")
+            assert changes == [] # Not before the commit
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.transaction() as conn:
+                db.record_change("items", None, "insert")
+                conn.execute("INSERT INTO items (name) VALUES ('a')")
+    finally:
+        bus.changed.disconnect(changes.append)
+
+    assert [(c.table, c.row_id, c.op) for c in changes] == [("items", 1, "insert")]
+
+def test_external_writes_are_detected(temp_dir, qapp):
+    from src.core.change_bus import ChangeBus
+    path = os.path.join(temp_dir, "external.db")
+    db = get_database(path)
+    db.execute("CREATE TABLE t (x)")
+
+    bus = ChangeBus()
+    changes = []
+    bus.changed.connect(changes.append)
+    bus.watch(db)
+
+    # Our own writes were announced already and don't count
+    db.execute("INSERT INTO t VALUES (1)")
+    db.record_change("t", 1, "insert")
+    changes.clear()
+    bus.check_external_changes()
+    assert changes == []
+
+    other = sqlite3.connect(path)
+    other.execute("INSERT INTO t VALUES (2)")
+    other.commit()
+    other.close()
+
+    bus.check_external_changes()
+    assert [(c.table, c.op) for c in changes] == [(None, "external")]
+    assert changes[0].affects(db.path, ("t",))
+    close_database(path)
@@ -0,0 +1,51 @@
+import os
+import sqlite3
+from src.core.db_maintenance import MaintenanceScheduler
+
+def make_db(path, rows=2000):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO items (payload) VALUES (?)", [("x" * 200,) for _ in range(rows)])
+    conn.commit()
+    conn.execute("DELETE FROM items WHERE id > ?", (rows // 5,)) # Churn leaves free pages behind
+    conn.commit()
+    conn.close()
+
+def test_round_runs_every_step_and_logs_sizes(temp_dir, qapp):
+    db_path = os.path.join(temp_dir, "pantry.db")
+    make_db(db_path)
+    scheduler = MaintenanceScheduler([db_path], os.path.join(temp_dir, "log.json"))
+
+    scheduler.start()
+    scheduler.wait(10)
+
+    log = scheduler.load_log()
+    assert len(log) == 1 and not log[0]["aborted"]
+    steps = log[0]["steps"]
+    assert [s["step"] for s in steps] == list(MaintenanceScheduler.STEPS)
+    vacuum = steps[0]
+    assert vacuum["result"].startswith("reclaimed")
+    assert vacuum["size_after"] < vacuum["size_before"]
+    assert all("seconds" in s for s in steps)
+
+    # Within MIN_INTERVAL nothing new is started, even by a fresh scheduler
+    again = MaintenanceScheduler([db_path], scheduler.log_path)
+    again.start()
+    assert again.thread is None
+
+def test_abort_keeps_remaining_steps(temp_dir, qapp):
+    db_path = os.path.join(temp_dir, "tasks.db")
+    make_db(db_path, rows=10)
+    scheduler = MaintenanceScheduler([db_path], os.path.join(temp_dir, "log.json"))
+    scheduler.queue = [(db_path, step) for step in MaintenanceScheduler.STEPS]
+
+    scheduler.abort()
+    entry = scheduler.run_queue()
+    assert entry["aborted"] and entry["steps"] == []
+    assert len(scheduler.queue) == len(MaintenanceScheduler.STEPS)
+
+    # The next idle period picks up where we left off
+    scheduler.abort_event.clear()
+    entry = scheduler.run_queue()
+    assert not entry["aborted"] and scheduler.queue == []
@@ -0,0 +1,54 @@
+import os
+import json
+from src.core.hot_reloader import HotReloader
+
+def make_app(apps_dir, app_id):
+    app_dir = os.path.join(apps_dir, app_id)
+    os.makedirs(app_dir)
+    with open(os.path.join(app_dir, "manifest.json"), "w") as f:
+        json.dump({"id": app_id, "name": app_id, "entry_point": "app.py:App"}, f)
+    with open(os.path.join(app_dir, "app.py"), "w") as f:
+        f.write("class App: pass\n")
+    return app_dir
+
+def bump(path, content):
+    """Rewrites a file and makes sure its mtime moves on, even on coarse clocks."""
+    stat = os.stat(path) if os.path.exists(path) else None
+    with open(path, "w") as f:
+        f.write(content)
+    if stat:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+def test_reports_only_changed_sources(qapp, temp_dir):
+    """
+    Source edits are reported per app folder or widget file; data files are ignored.
+    """
+    apps_dir = os.path.join(temp_dir, "apps")
+    widgets_dir = os.path.join(temp_dir, "widgets")
+    os.makedirs(widgets_dir)
+    app1 = make_app(apps_dir, "app1")
+    make_app(apps_dir, "app2")
+    bump(os.path.join(widgets_dir, "clock.py"), "class ClockWidget: pass\n")
+
+    reloader = HotReloader(apps_dir, widgets_dir)
+    changes = {"apps": [], "widgets": []}
+    reloader.apps_changed.connect(changes["apps"].extend)
+    reloader.widgets_changed.connect(changes["widgets"].extend)
+    reloader.start()
+    assert apps_dir in reloader.watcher.directories()
+
+    # An app writing its own settings file is not a code change
+    with open(os.path.join(app1, "settings.json"), "w") as f:
+        f.write("{}")
+    os.makedirs(os.path.join(app1, "__pycache__"))
+    reloader.check_for_changes()
+    assert changes == {"apps": [], "widgets": []}
+
+    bump(os.path.join(app1, "app.py"), "class App:\n    pass\n")
+    bump(os.path.join(widgets_dir, "timer.py"), "class TimerWidget: pass\n")
+    app3 = make_app(apps_dir, "app3")
+    reloader.check_for_changes()
+
+    assert sorted(changes["apps"]) == sorted([app1, app3])
+    assert changes["widgets"] == [os.path.join(widgets_dir, "timer.py")]
+    reloader.stop()
@@ -1,3 +1,4 @@
+import os
 import pytest
 from PySide6.QtWidgets import QStackedWidget
 from apps.hub.ui import HubWindow
@@ -72,3 +73,140 @@ def test_dashboard_structure(qapp, mock_settings):
     dashboard = Dashboard(mock_settings, app_registry, language_manager, res_manager)
     
     assert dashboard.layout is not None
+
+def test_dashboard_only_regrabs_dirty_apps(qapp, mock_settings, temp_dir):
+    """
+    Test that previews are re-captured only after content_changed.
+    """
+    from PySide6.QtCore import Signal
+    from PySide6.QtWidgets import QWidget
+    from src.core.app_registry import AppRegistry
+    from src.core.language_manager import LanguageManager
+    from src.ui.resolution_manager import ResolutionManager
+    from src.ui.preview_cache import PreviewCache
+
+    class ReportingApp(QWidget):
+        content_changed = Signal()
+        grabs = 0
+
+        def grab(self, *args):
+            ReportingApp.grabs += 1
+            return super().grab(*args)
+
+    instance = ReportingApp()
+    app_registry = AppRegistry("dummy_path")
+    app_registry.apps["reporting"] = {
+        "name": "Reporting", "entry_point": None, "path": temp_dir,
+        "instance": instance, "class": ReportingApp
+    }
+    mock_settings.settings["app_positions"] = {"reporting": {"row": 0, "col": 0}}
+    mock_settings.settings["prewarm_budget"] = 0
+
+    preview_cache = PreviewCache(os.path.join(temp_dir, "previews"))
+    dashboard = Dashboard(mock_settings, app_registry, LanguageManager("dummy_path"), ResolutionManager(),
+                          preview_cache=preview_cache)
+    assert ReportingApp.grabs == 1
+
+    dashboard.on_app_launched("reporting", instance)
+    dashboard.refresh_previews()
+    assert ReportingApp.grabs == 1
+
+    instance.content_changed.emit()
+    dashboard.refresh_previews()
+    assert ReportingApp.grabs == 2
+    preview_cache.flush()
+
+def test_launched_apps_keep_their_stack_page(qapp, mock_settings):
+    """
+    Switching between apps flips pages instead of reparenting the apps.
+    """
+    from PySide6.QtWidgets import QWidget
+
+    window = HubWindow()
+    window.dashboard.prewarmer.cancel()
+    first, second = QWidget(), QWidget()
+    instances = {"first": first, "second": second}
+    window.app_registry.get_app_instance = lambda app_id, language_manager=None: instances[app_id]
+    window.settings_manager.record_app_launch = lambda app_id: None
+
+    window.launch_app("first")
+    first_index = window.stack.currentIndex()
+    window.launch_app("second")
+    window.show_dashboard()
+    window.launch_app("first")
+
+    assert window.stack.currentIndex() == first_index
+    assert window.stack.currentWidget() is first
+    assert second.parentWidget() is window.stack
+    assert window.stack.count() == 3 # Dashboard plus one page per app
+
+    window.close()
+
+def test_paint_latency_is_recorded(qapp):
+    """
+    The tracker stops the clock on the widget's next paint.
+    """
+    from PySide6.QtWidgets import QWidget
+    from src.core.paint_latency import PaintLatencyTracker
+
+    tracker = PaintLatencyTracker()
+    widget = QWidget()
+    widget.resize(50, 50)
+    tracker.start("app", widget)
+    widget.show()
+    qapp.processEvents()
+
+    assert tracker.last("app") is not None
+    assert tracker.last("app") >= 0
+    widget.close()
+
+def test_top_bar_rebuilds_only_changed_slots(qapp, mock_settings):
+    """
+    Changing one widget position leaves the other widgets running.
+    """
+    from PySide6.QtWidgets import QLabel
+    from src.core.widget_registry import WidgetRegistry
+    from src.core.language_manager import LanguageManager
+    from src.ui.resolution_manager import ResolutionManager
+
+    widget_registry = WidgetRegistry("dummy_path")
+    widget_registry.get_widget_instance = lambda widget_id, *args: QLabel(widget_id)
+    mock_settings.set_widget_positions({0: "clock", 1: "weather"})
+
+    top_bar = TopBar(mock_settings, widget_registry, LanguageManager("dummy_path"), ResolutionManager())
+    clock, weather = top_bar.slots[0][1], top_bar.slots[1][1]
+    volume = top_bar.volume_control
+
+    mock_settings.set_widget_positions({0: "clock", 1: "timer", 3: "calendar"})
+
+    assert top_bar.slots[0][1] is clock
+    assert top_bar.slots[1][1] is not weather
+    assert top_bar.slots[1][0] == "timer"
+    assert top_bar.slots[3][0] == "calendar"
+    assert top_bar.volume_control is volume
+    assert top_bar.layout.indexOf(top_bar.slots[1][1]) == top_bar.layout.indexOf(clock) + 2
+
+def test_dashboard_moves_tiles_in_place(qapp, mock_settings):
+    """
+    Rearranging apps keeps the existing tiles instead of rebuilding the grid.
+    """
+    from src.core.app_registry import AppRegistry
+    from src.core.language_manager import LanguageManager
+    from src.ui.resolution_manager import ResolutionManager
+
+    app_registry = AppRegistry("dummy_path")
+    for app_id in ("one", "two", "three"):
+        app_registry.apps[app_id] = {"name": app_id.title(), "entry_point": None, "path": "",
+                                     "instance": None, "class": None}
+    mock_settings.settings["prewarm_budget"] = 0
+    mock_settings.set_app_positions({"one": {"row": 0, "col": 0}, "two": {"row": 0, "col": 1}})
+
+    dashboard = Dashboard(mock_settings, app_registry, LanguageManager("dummy_path"), ResolutionManager())
+    one, two = dashboard.tiles["one"], dashboard.tiles["two"]
+
+    mock_settings.set_app_positions({"one": {"row": 1, "col": 0}, "three": {"row": 0, "col": 0}})
+
+    assert dashboard.tiles["one"] is one
+    assert "two" not in dashboard.tiles
+    assert dashboard.layout.getItemPosition(dashboard.layout.indexOf(one))[:2] == (1, 0)
+    assert "three" in dashboard.tiles
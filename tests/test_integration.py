@@ -25,7 +25,7 @@ def test_full_task_flow(integration_db, qapp):
     
     # 4. Verify
     assert len(tasks) == 1
-    assert tasks[0]['name'] == "Integration Task"
+    assert tasks[0].name == "Integration Task"
     
     # In a real integration test with Selenium/Appium or careful PySide testing,
     # we would click buttons. For this scope, verifying the logic flow is sufficient.
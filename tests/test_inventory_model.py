@@ -0,0 +1,117 @@
+import pytest
+from datetime import date, timedelta
+
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import QStyleOptionViewItem
+
+from apps.pantry_manager.inventory_model import (
+    InventoryModel, InventoryFilterProxy, ExpiryDelegate, load_inventory, COLUMNS, STATUS_ROLE, STATUS_COLORS,
+    STATUS_EXPIRED, STATUS_WARNING, STATUS_OK, STATUS_UNKNOWN
+)
+
+def add(manager, barcode, name, days, quantity=1):
+    expiry = (date.today() + timedelta(days=days)).isoformat()
+    assert manager.add_product(barcode, name, "Food", expiry, quantity, "1kg", 1)[0]
+
+def test_rows_are_fetched_in_pages(pantry, qapp):
+    for i in range(25):
+        add(pantry, f"{i:04d}", f"Product {i:02d}", 100)
+
+    model = InventoryModel()
+    model.PAGE_SIZE = 10
+    model.set_data(load_inventory(pantry, page_size=7))
+    assert len(model.data_store) == 25
+    assert model.rowCount() == 10
+    assert model.canFetchMore()
+
+    model.fetchMore()
+    assert model.rowCount() == 20
+    model.fetch_all()
+    assert model.rowCount() == 25 and not model.canFetchMore()
+    assert model.entry(0).name == "Product 00"
+    assert model.index(0, 2).data() == "Product 00"
+
+def test_single_rows_are_patched(pantry, qapp):
+    add(pantry, "1", "Bread", -1)
+    add(pantry, "2", "Milk", 5)
+    add(pantry, "3", "Rice", 300)
+
+    model = InventoryModel()
+    model.set_data(load_inventory(pantry))
+    names = lambda: [model.entry(row).name for row in range(model.rowCount())]
+    assert [model.data_store.status[row] for row in range(3)] == [STATUS_EXPIRED, STATUS_WARNING, STATUS_OK]
+
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    add(pantry, "4", "Eggs", 10)
+    eggs = pantry.get_inventory_entries(barcode="4")
+    model.patch(eggs, barcode="4")
+    assert names() == ["Bread", "Eggs", "Milk", "Rice"]
+
+    milk = model.entry(2)
+    pantry.delete_inventory_item(milk.id, 1)
+    model.patch(pantry.get_inventory_entries(inventory_id=milk.id), inventory_id=milk.id)
+    assert names() == ["Bread", "Eggs", "Rice"]
+
+    add(pantry, "1", "Bread", -1, quantity=2)
+    bread = model.entry(0)
+    model.patch(pantry.get_inventory_entries(inventory_id=bread.id), inventory_id=bread.id)
+    assert model.entry(0).quantity == 3
+    assert resets == []
+
+def test_proxy_filters_all_rows(pantry, qapp):
+    for i in range(30):
+        add(pantry, f"{i:04d}", "Apple" if i % 10 == 0 else f"Product {i}", 100)
+
+    model = InventoryModel()
+    model.PAGE_SIZE = 5
+    model.set_data(load_inventory(pantry))
+    proxy = InventoryFilterProxy()
+    proxy.setSourceModel(model)
+
+    model.fetch_all()
+    proxy.set_matches(pantry.search_products("apple"))
+    assert proxy.rowCount() == 3
+    proxy.set_matches(pantry.search_products("0020"))
+    assert proxy.rowCount() == 1
+    proxy.set_matches(None)
+    proxy.sort(5) # quantity
+    assert proxy.rowCount() == 30
+
+def test_expiry_status_comes_from_the_query(pantry, qapp):
+    pantry.warning_days = 7
+    add(pantry, "1", "Bread", -1)
+    add(pantry, "2", "Milk", 5)
+    add(pantry, "3", "Rice", 10)
+    pantry.db.execute("INSERT INTO products (barcode, name) VALUES ('4', 'Salt')")
+    pantry.db.execute("INSERT INTO inventory (barcode, location_id, expiry_date, quantity) VALUES ('4', 1, NULL, 1)")
+
+    entries = pantry.get_inventory_with_details()
+    assert [(e.name, e.days_left, e.status) for e in entries] == [
+        ("Bread", -1, STATUS_EXPIRED), ("Milk", 5, STATUS_WARNING), ("Rice", 10, STATUS_OK), ("Salt", None, STATUS_UNKNOWN)]
+    assert [e.name for e in pantry.get_expiring_inventory()] == ["Bread", "Milk"]
+
+    model = InventoryModel()
+    model.set_data(load_inventory(pantry))
+    assert model.columnCount() == len(COLUMNS)
+    assert [model.index(row, 0).data(STATUS_ROLE) for row in range(4)] == [
+        STATUS_EXPIRED, STATUS_WARNING, STATUS_OK, STATUS_UNKNOWN]
+
+    delegate = ExpiryDelegate()
+    option = QStyleOptionViewItem()
+    delegate.initStyleOption(option, model.index(0, 2))
+    assert option.palette.color(QPalette.ColorRole.Text) == STATUS_COLORS[STATUS_EXPIRED]
+
+def test_app_follows_hub_warning_days(temp_dir, qapp):
+    from apps.pantry_manager.ui_qt import LebensmittelManagerApp
+    from src.core.settings_manager import SettingsManager
+    settings = SettingsManager(temp_dir)
+    settings.set_value("pantry", {"warning_days": 14})
+
+    app = LebensmittelManagerApp(settings_manager=settings)
+    assert app.db_manager.warning_days == 14
+    settings.set_value("pantry", {"warning_days": 3})
+    assert app.db_manager.warning_days == 3
+    app.queries.cancel_all()
+    app.deleteLater()
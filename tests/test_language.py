@@ -68,5 +68,56 @@ class TestLanguageImplementation(unittest.TestCase):
         self.assertIn("de", langs)
         self.assertEqual(len(langs), 2)
 
+    def test_switching_reuses_parsed_catalogs(self):
+        lm = LanguageManager(self.test_dir)
+        lm.load_language("en")
+        english = lm.translations
+        lm.load_language("de")
+
+        # Once parsed, a language is not read again, even if the file changes
+        with open(os.path.join(self.lang_dir, "en.json"), "w") as f:
+            f.write('{"hello": "Howdy"}')
+        lm.load_language("en")
+        self.assertIs(lm.translations, english)
+        self.assertEqual(lm.translate("hello"), "Hello")
+
+    def test_cache_is_invalidated_by_mtime(self):
+        cache_path = os.path.join(self.test_dir, "translations.cache")
+        lm = LanguageManager(self.test_dir, cache_path=cache_path)
+        lm.preload_languages()
+        self.assertTrue(os.path.exists(cache_path))
+
+        # Unchanged file: the cached copy is used
+        lm = LanguageManager(self.test_dir, cache_path=cache_path)
+        lm.catalog._load_cache()["de"][1]["hello"] = "Servus"
+        lm.load_language("de")
+        self.assertEqual(lm.translate("hello"), "Servus")
+
+        # Changed file: parsed again
+        de_path = os.path.join(self.lang_dir, "de.json")
+        with open(de_path, "w") as f:
+            f.write('{"hello": "Moin", "world": "Welt"}')
+        stat = os.stat(de_path)
+        os.utime(de_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        lm = LanguageManager(self.test_dir, cache_path=cache_path)
+        lm.load_language("de")
+        self.assertEqual(lm.translate("hello"), "Moin")
+
+    def test_malformed_cache_is_ignored(self):
+        cache_path = os.path.join(self.test_dir, "translations.cache")
+        with open(cache_path, "w") as f:
+            f.write('{"version": 2, "languages": {"de": [[1, 2], {"hello": ["not", "text"]}], "en": "junk"}}')
+        lm = LanguageManager(self.test_dir, cache_path=cache_path)
+        self.assertEqual(lm.catalog._load_cache(), {})
+        lm.load_language("de")
+        self.assertEqual(lm.translate("hello"), "Hallo")
+
+    def test_localize_manifest_names(self):
+        lm = LanguageManager(self.test_dir)
+        lm.load_language("de")
+        self.assertEqual(lm.localize({"en": "Pantry", "de": "Vorrat"}), "Vorrat")
+        self.assertEqual(lm.localize({"en": "Pantry"}), "Pantry")
+        self.assertEqual(lm.localize("Plain"), "Plain")
+
 if __name__ == "__main__":
     unittest.main()
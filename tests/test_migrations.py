@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import pytest
+from src.core.database import Database, get_database, close_database
+from src.core.migrations import run_migrations, get_schema_version
+from apps.pantry_manager.database import DatabaseManager, MIGRATIONS
+
+@pytest.fixture
+def db(temp_dir):
+    database = Database(os.path.join(temp_dir, "migrate.db"))
+    yield database
+    database.close()
+
+def test_migrations_run_once_in_order(db):
+    calls = []
+    migrations = [
+        lambda conn: calls.append(1) or conn.execute("CREATE TABLE a (x)"),
+        lambda conn: calls.append(2) or conn.execute("ALTER TABLE a ADD COLUMN y"),
+    ]
+    assert run_migrations(db, migrations) == 2
+    assert calls == [1, 2]
+    assert get_schema_version(db.connection()) == 2
+
+    # Fast path: nothing runs again, not even in a fresh process
+    db.schema_version = None
+    run_migrations(db, migrations)
+    assert calls == [1, 2]
+
+    migrations.append(lambda conn: calls.append(3) or conn.execute("CREATE TABLE b (x)"))
+    run_migrations(db, migrations)
+    assert calls == [1, 2, 3]
+
+def test_failed_migration_rolls_back(db):
+    def broken(conn):
+        conn.execute("CREATE TABLE a (x)")
+        raise sqlite3.OperationalError("boom")
+
+    with pytest.raises(sqlite3.OperationalError):
+        run_migrations(db, [broken])
+    assert get_schema_version(db.connection()) == 0
+    assert db.fetch_all("SELECT name FROM sqlite_master WHERE name = 'a'") == []
+
+def test_refuses_newer_schema(db):
+    db.execute("PRAGMA user_version = 5")
+    with pytest.raises(RuntimeError):
+        run_migrations(db, [lambda conn: None])
+
+def test_legacy_pantry_table_is_split(temp_dir):
+    path = os.path.join(temp_dir, "legacy_pantry.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE lebensmittel (barcode, name, kategorie, ablaufdatum, anzahl, gewicht_volumen)")
+    conn.execute("INSERT INTO lebensmittel VALUES ('123', 'Milk', 'Dairy', '2030-01-01', 2, '1l')")
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(path)
+    assert manager.db.fetch_all("SELECT barcode, name FROM products") == [("123", "Milk")]
+    assert manager.db.fetch_all("SELECT barcode, quantity FROM inventory") == [("123", 2)]
+    assert get_schema_version(manager.get_connection()) == 4
+    close_database(path)
+
+def test_inventory_key_merges_duplicates_and_upserts(temp_dir):
+    path = os.path.join(temp_dir, "pantry_v1.db")
+    db = Database(path)
+    run_migrations(db, MIGRATIONS[:1])
+    db.execute("INSERT INTO products (barcode, name) VALUES ('123', 'Milk')")
+    db.execute("INSERT INTO inventory (barcode, location_id, expiry_date, quantity) VALUES "
+               "('123', 1, '2030-01-01', 2), ('123', 1, '2030-01-01', 3), ('123', 1, '2030-02-01', 1)")
+    db.close()
+
+    manager = DatabaseManager(path)
+    assert manager.db.fetch_all("SELECT expiry_date, quantity FROM inventory ORDER BY expiry_date") == [
+        ("2030-01-01", 5), ("2030-02-01", 1)]
+
+    assert manager.add_product("123", "Milk", "", "2030-01-01", 4, "", 1)[0]
+    assert manager.add_product("123", "Milk", "", "2030-03-01", 1, "", 1)[0]
+    assert manager.db.fetch_all("SELECT expiry_date, quantity FROM inventory ORDER BY expiry_date") == [
+        ("2030-01-01", 9), ("2030-02-01", 1), ("2030-03-01", 1)]
+
+    # Topping up an entry that's down to 0 is still an update, not a new entry
+    manager.db.execute("UPDATE inventory SET quantity = 0 WHERE expiry_date = '2030-02-01'")
+    assert "erhöht" in manager.add_product("123", "Milk", "", "2030-02-01", 2, "", 1)[1]
+    assert "hinzugefügt" in manager.add_product("123", "Milk", "", "2030-04-01", 1, "", 1)[1]
+
+    plan = manager.db.fetch_all("EXPLAIN QUERY PLAN SELECT COUNT(*) FROM inventory WHERE location_id = 1")
+    assert "idx_inventory_location" in plan[0][3]
+    plan = manager.db.fetch_all("EXPLAIN QUERY PLAN SELECT id FROM inventory WHERE expiry_date <= '2030-01-01'")
+    assert "idx_inventory_expiry" in plan[0][3]
+    close_database(path)
+
+def test_pantry_follows_repeated_resets(temp_dir):
+    path = os.path.join(temp_dir, "pantry.db")
+    manager = DatabaseManager(path)
+    for _ in range(2):
+        assert manager.add_product("123", "Milk", "", "2030-01-01", 1, "", 1)[0]
+        # What reset_application_data does with the file
+        close_database(path)
+        for name in (path, f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    assert manager.add_product("456", "Bread", "", "2030-01-01", 1, "", 1)[0]
+    assert os.path.exists(path)
+    assert get_database(path).fetch_all("SELECT name FROM products") == [("Bread",)]
+    close_database(path)
+
+def test_editing_onto_an_existing_entry_merges_them(temp_dir):
+    path = os.path.join(temp_dir, "pantry.db")
+    manager = DatabaseManager(path)
+    assert manager.add_product("123", "Milk", "", "2030-01-01", 2, "", 1)[0]
+    assert manager.add_product("123", "Milk", "", "2030-02-01", 3, "", 1)[0]
+    first, second = manager.db.fetch_all("SELECT id FROM inventory ORDER BY expiry_date")
+
+    ok, msg = manager.update_inventory_item(second[0], 1, "2030-01-01", 4)
+    assert ok, msg
+    assert manager.db.fetch_all("SELECT id, expiry_date, quantity FROM inventory") == [(first[0], "2030-01-01", 6)]
+
+    # A plain edit still just updates the row
+    assert manager.update_inventory_item(first[0], 1, "2030-03-01", 1)[0]
+    assert manager.db.fetch_all("SELECT id, expiry_date, quantity FROM inventory") == [(first[0], "2030-03-01", 1)]
+    close_database(path)
@@ -0,0 +1,35 @@
+import pytest
+
+@pytest.fixture
+def pantry(pantry):
+    for barcode, name, category in [
+        ("4001", "Whole Milk", "Dairy"),
+        ("4002", "Tomato Sauce", "Canned"),
+        ("4003", "Rye Bread", "Bakery"),
+        ("5005", "Tomatoes", "Vegetables"),
+    ]:
+        pantry.add_product(barcode, name, category, "2030-01-01", 1, "1kg", 1)
+    return pantry
+
+def test_prefix_and_substring_search(pantry):
+    assert sorted(pantry.search_products("tom")) == ["4002", "5005"]
+    assert pantry.search_products("bread rye") == ["4003"]
+    assert pantry.search_products("dairy") == ["4001"]
+    assert sorted(pantry.search_products("40")) == ["4001", "4002", "4003"]
+    assert pantry.search_products("xyz") == []
+    assert pantry.search_products("   ") == []
+
+def test_search_tolerates_typos(pantry):
+    assert pantry.search_products("milc") == ["4001"]
+    assert sorted(pantry.search_products("tomatoe")) == ["4002", "5005"]
+    assert "4003" in pantry.search_products("bred")
+
+def test_index_follows_product_changes(pantry):
+    pantry.add_product("4001", "Oat Drink", "Dairy", "2030-01-01", 1, "1l", 1)
+    assert pantry.search_products("oat") == ["4001"]
+    assert pantry.search_products("whole") == []
+
+    pantry.db.execute("DELETE FROM inventory WHERE barcode = '4003'")
+    pantry.db.execute("DELETE FROM products WHERE barcode = '4003'")
+    assert pantry.search_products("rye") == []
+    assert pantry.db.fetch_one("SELECT COUNT(*) FROM products_fts")[0] == 3
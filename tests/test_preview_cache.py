@@ -0,0 +1,44 @@
+import os
+from PySide6.QtGui import QPixmap, QColor
+
+from src.ui.preview_cache import PreviewCache
+
+def make_pixmap(w=40, h=30):
+    pixmap = QPixmap(w, h)
+    pixmap.fill(QColor("red"))
+    return pixmap
+
+def test_hit_requires_same_generation_and_size(qapp, temp_dir):
+    cache = PreviewCache(temp_dir)
+    pixmap = make_pixmap()
+    cache.memory["app"] = (1, (40, 30), pixmap)
+
+    assert cache.get("app", 1, (40, 30)) is pixmap
+    assert cache.get("app", 2, (40, 30)) is None
+    assert cache.get("app", 1, (80, 60)) is None
+    # The stale preview is still good enough to fill the tile
+    assert cache.get_latest("app", (40, 30)) is pixmap
+
+def test_last_known_preview_loaded_from_disk(qapp, temp_dir):
+    size = (40, 30)
+    assert make_pixmap(*size).save(PreviewCache(temp_dir).file_path("app", size))
+
+    cache = PreviewCache(temp_dir)
+    assert cache.get("app", 0, size) is None
+    latest = cache.get_latest("app", size)
+    assert latest is not None
+    assert (latest.width(), latest.height()) == size
+    assert cache.get_latest("other", size) is None
+
+def test_reset_clears_previews_and_waits_for_writes(qapp, temp_dir):
+    import shutil
+    from src.ui.preview_cache import clear_preview_caches
+    size = (40, 30)
+    cache = PreviewCache(os.path.join(temp_dir, "previews"))
+    cache.put("app", 1, size, make_pixmap(*size))
+
+    clear_preview_caches()
+    shutil.rmtree(cache.cache_dir, ignore_errors=True)
+    assert cache.pending_writes == []
+    assert cache.get_latest("app", size) is None
+    assert not os.path.exists(cache.cache_dir)
@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+from apps.pantry_manager.api import OpenFoodFactsAPI, NOT_FOUND
+
+MILK = ("Milk", "Dairy", "1l")
+
+def counting_api(pantry, answers, **kwargs):
+    """An API whose network fetch answers from a dict and counts the calls."""
+    api = OpenFoodFactsAPI(pantry, **kwargs)
+    api.calls = []
+    def fetch(barcode):
+        api.calls.append(barcode)
+        answer = answers.get(barcode, NOT_FOUND)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+    api.fetch = fetch
+    return api
+
+def test_repeated_scans_stay_off_the_network(pantry):
+    api = counting_api(pantry, {"4001": MILK})
+    assert api.get_product_info("4001") == MILK
+    assert api.get_product_info("4001") == MILK
+    assert api.get_product_info("9999") == NOT_FOUND
+    assert api.get_product_info("9999") == NOT_FOUND
+    assert api.calls == ["4001", "9999"]
+
+    # A fresh start still remembers both, through the database
+    restarted = counting_api(pantry, {"4001": MILK})
+    assert restarted.get_product_info("4001") == MILK
+    assert restarted.get_product_info("9999") == NOT_FOUND
+    assert restarted.calls == []
+    assert pantry.get_product_lookup("9999").found == 0
+
+def test_unknown_barcodes_expire_sooner(pantry):
+    api = counting_api(pantry, {"4001": MILK}, miss_ttl=0)
+    api.get_product_info("4001")
+    api.get_product_info("9999")
+    api.get_product_info("4001")
+    api.get_product_info("9999")
+    assert api.calls == ["4001", "9999", "9999"]
+
+def test_network_errors_are_not_remembered(pantry):
+    answers = {"4001": requests.ConnectionError("offline")}
+    api = counting_api(pantry, answers)
+    assert api.get_product_info("4001") == NOT_FOUND
+    assert pantry.get_product_lookup("4001") is None
+
+    answers["4001"] = MILK
+    assert api.get_product_info("4001") == MILK
+    assert api.calls == ["4001", "4001"]
+
+def test_memory_cache_is_bounded(pantry):
+    api = counting_api(pantry, {})
+    api.MEMORY_SIZE = 3
+    for barcode in ["1", "2", "3", "1", "4"]:
+        api.get_product_info(barcode)
+    assert list(api._memory) == ["3", "1", "4"]
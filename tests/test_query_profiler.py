@@ -0,0 +1,48 @@
+import os
+import json
+
+from src.core.database import Database
+from src.core.query_profiler import query_profiler, format_report, main
+
+def test_statements_are_timed_and_full_scans_flagged(temp_dir, capsys):
+    query_profiler.reset()
+    query_profiler.enable(threshold_ms=0)
+    try:
+        db = Database(os.path.join(temp_dir, "profiled.db"))
+        db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        with db.transaction() as conn:
+            for i in range(20):
+                conn.execute("INSERT INTO items (name) VALUES (?)", (f"item {i}",))
+        for _ in range(3):
+            db.fetch_all("SELECT * FROM items WHERE name = ?", ("item 3",))
+        db.fetch_one("SELECT name FROM items WHERE id = ?", (5,))
+        db.close()
+    finally:
+        query_profiler.disable()
+
+    data = query_profiler.to_dict()
+    query_profiler.reset()
+    stats = {s["sql"]: s for s in data["statements"]}
+
+    scan = stats["SELECT * FROM items WHERE name = ?"]
+    assert scan["count"] == 3
+    assert sum(scan["histogram"]) == 3
+    assert scan["full_scan"] is True
+    assert stats["INSERT INTO items (name) VALUES (?)"]["count"] == 20
+    assert stats["SELECT name FROM items WHERE id = ?"]["full_scan"] is False
+
+    path = os.path.join(temp_dir, "stats.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert main([path, "--top", "3"]) == 0
+    report = capsys.readouterr().out
+    assert "FULL" in report
+    assert len(format_report(data, top=1).splitlines()[0]) > 0
+
+def test_disabled_profiler_uses_plain_connections(temp_dir):
+    query_profiler.reset()
+    db = Database(os.path.join(temp_dir, "plain.db"))
+    db.execute("CREATE TABLE t (x)")
+    db.fetch_all("SELECT * FROM t")
+    db.close()
+    assert query_profiler.stats == {}
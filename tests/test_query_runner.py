@@ -0,0 +1,68 @@
+import threading
+import time
+from src.core.query_runner import QueryRunner, NETWORK_WORKER_COUNT, get_network_pool
+
+def wait_until(qapp, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+def test_results_arrive_on_gui_thread(qapp):
+    runner = QueryRunner()
+    results = []
+    worker_threads = []
+
+    def query(x):
+        worker_threads.append(threading.current_thread())
+        return x * 2
+
+    runner.run("double", query, 21, on_result=lambda r: results.append((r, threading.current_thread())))
+    assert wait_until(qapp, lambda: results)
+    assert results[0] == (42, threading.main_thread())
+    assert worker_threads[0] is not threading.main_thread()
+
+def test_superseded_queries_are_dropped(qapp):
+    runner = QueryRunner()
+    release = threading.Event()
+    results = []
+
+    def slow(value):
+        release.wait(2)
+        return value
+
+    runner.run("list", slow, "old", on_result=results.append)
+    runner.run("list", slow, "new", on_result=results.append)
+    release.set()
+
+    assert wait_until(qapp, lambda: not runner.is_busy())
+    assert results == ["new"]
+
+def test_errors_go_to_error_callback(qapp):
+    runner = QueryRunner()
+    errors = []
+
+    def broken():
+        raise ValueError("no such table")
+
+    runner.run(None, broken, on_error=errors.append)
+    assert wait_until(qapp, lambda: errors)
+    assert isinstance(errors[0], ValueError)
+
+def test_network_calls_do_not_block_database_queries(qapp):
+    lookups = QueryRunner(pool=get_network_pool)
+    queries = QueryRunner()
+    release = threading.Event()
+    results = []
+
+    # Slow lookups filling every network thread must not hold up the database pool
+    for i in range(NETWORK_WORKER_COUNT):
+        lookups.run(None, release.wait, 2)
+    queries.run("tasks", lambda: threading.current_thread().name, on_result=results.append)
+    try:
+        assert wait_until(qapp, lambda: results, timeout=1.0)
+        assert results[0].startswith("db-worker")
+    finally:
+        release.set()
+    assert wait_until(qapp, lambda: not lookups.is_busy())
@@ -3,6 +3,7 @@ import os
 import sys
 import shutil
 import tempfile
+import json
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,6 +19,7 @@ class TestSettingsManager(unittest.TestCase):
         self.manager = SettingsManager(self.test_dir)
 
     def tearDown(self):
+        self.manager.flush()
         shutil.rmtree(self.test_dir)
 
     def test_defaults(self):
@@ -41,5 +43,88 @@ class TestSettingsManager(unittest.TestCase):
         # JSON keys become strings when saved, but our getter converts them back to int
         self.assertEqual(new_manager.get_widget_positions(), positions)
 
+    def test_writes_are_deferred_and_batched(self):
+        settings_path = os.path.join(self.test_dir, "settings.json")
+        writes = []
+        original_replace = os.replace
+
+        def counting_replace(src, dst):
+            writes.append(dst)
+            original_replace(src, dst)
+
+        os.replace = counting_replace
+        try:
+            with self.manager.batch():
+                self.manager.set_language("de")
+                self.manager.set_prewarm_budget(5)
+                self.assertFalse(os.path.exists(settings_path))
+            self.manager.flush()
+        finally:
+            os.replace = original_replace
+
+        self.assertEqual(writes, [settings_path])
+        self.assertFalse(os.path.exists(settings_path + ".tmp"))
+        with open(settings_path) as f:
+            saved = json.load(f)
+        self.assertEqual((saved["language"], saved["prewarm_budget"]), ("de", 5))
+
+    def test_debounced_write_happens_in_background(self):
+        self.manager.SAVE_DELAY = 0.01
+        self.manager.set_language("de")
+        timer = self.manager._save_timer
+        timer.join(1)
+        with open(os.path.join(self.test_dir, "settings.json")) as f:
+            self.assertEqual(json.load(f)["language"], "de")
+
+    def test_change_notifications_report_key_paths(self):
+        changes = []
+        self.manager.setting_changed.connect(lambda *change: changes.append(change))
+        self.manager.set_screensaver_settings(dict(self.manager.get_screensaver_settings(), timeout=9))
+        self.assertEqual(changes, [("screensaver.timeout", 5, 9)])
+
+        changes.clear()
+        with self.manager.batch():
+            self.manager.set_widget_positions({0: "clock"})
+            self.manager.set_widget_positions({0: "clock", 2: "weather"})
+            self.manager.set_language("en") # Not a change
+            self.assertEqual(changes, [])
+        self.assertEqual(changes, [("widget_positions.0", None, "clock"),
+                                   ("widget_positions.2", None, "weather")])
+
+    def test_failed_write_keeps_changes(self):
+        self.manager.set_language("de")
+        good_path = self.manager.settings_path
+        self.manager.settings_path = os.path.join(self.test_dir, "blocked")
+        os.makedirs(self.manager.settings_path) # Can't be replaced by a file
+        self.manager.flush()
+        self.manager.settings_path = good_path
+
+        SettingsManager.flush_pending()
+        with open(good_path) as f:
+            self.assertEqual(json.load(f)["language"], "de")
+
+    def test_failed_write_to_missing_folder_is_not_retried(self):
+        gone_dir = os.path.join(self.test_dir, "gone")
+        os.makedirs(gone_dir)
+        manager = SettingsManager(gone_dir)
+        manager.set_language("de")
+        shutil.rmtree(gone_dir)
+
+        manager.flush()
+        self.assertNotIn(manager, SettingsManager._pending.values())
+        self.assertTrue(manager._dirty) # Still kept for the next change
+
+    def test_reload_announces_restored_values(self):
+        self.manager.set_language("de")
+        self.manager.flush()
+        with open(self.manager.settings_path, "w") as f:
+            json.dump(dict(self.manager.settings, language="en"), f)
+
+        changes = []
+        self.manager.setting_changed.connect(lambda *change: changes.append(change))
+        self.manager.reload()
+        self.assertEqual(changes, [("language", "de", "en")])
+        self.assertEqual(self.manager.get_language(), "en")
+
 if __name__ == "__main__":
     unittest.main()
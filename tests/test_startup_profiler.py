@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+
+from src.core.startup_profiler import StartupProfiler
+
+def test_phases_nest_and_trace_is_written(temp_dir):
+    profiler = StartupProfiler()
+    profiler.enable(trace_imports=False)
+
+    with profiler.phase("outer"):
+        with profiler.phase("inner"):
+            pass
+
+    profiler.finish()
+
+    events = {e["name"]: e for e in profiler.events}
+    assert events["inner"]["depth"] == events["outer"]["depth"] + 1
+    assert events["outer"]["self_ns"] <= events["outer"]["dur_ns"]
+
+    path = os.path.join(temp_dir, "trace.json")
+    profiler.write_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+    names = [e["name"] for e in trace["traceEvents"]]
+    assert {"outer", "inner", "startup"} <= set(names)
+    assert all(e["ph"] == "X" for e in trace["traceEvents"])
+
+def test_disabled_profiler_records_nothing():
+    profiler = StartupProfiler()
+
+    @profiler.phase("decorated")
+    def work():
+        return 42
+
+    assert work() == 42
+    assert profiler.events == []
+
+def test_import_timing(temp_dir):
+    module_name = "_profiled_module"
+    with open(os.path.join(temp_dir, f"{module_name}.py"), "w") as f:
+        f.write("VALUE = 1\n")
+    sys.path.insert(0, temp_dir)
+
+    profiler = StartupProfiler()
+    profiler.enable()
+    try:
+        import _profiled_module
+        assert _profiled_module.VALUE == 1
+    finally:
+        profiler.disable()
+        sys.path.remove(temp_dir)
+        sys.modules.pop(module_name, None)
+
+    assert module_name in [e["name"] for e in profiler.events if e["cat"] == "import"]
+    assert "Imports:" in profiler.summary()
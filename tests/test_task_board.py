@@ -21,7 +21,7 @@ def test_add_and_get_people(task_db):
     
     people = get_people()
     assert len(people) == 2
-    names = [p['name'] for p in people]
+    names = [p.name for p in people]
     assert "Alice" in names
     assert "Bob" in names
 
@@ -35,17 +35,17 @@ def test_add_task(task_db):
     # It should be due immediately
     tasks = get_due_tasks()
     assert len(tasks) == 1
-    assert tasks[0]['name'] == "Test Task"
+    assert tasks[0].name == "Test Task"
 
 def test_complete_task(task_db):
     add_person("Alice")
     people = get_people()
-    alice_id = people[0]['id']
+    alice_id = people[0].id
     
     add_task("Task 1", "specific", str(alice_id), "Daily")
     
     tasks = get_due_tasks()
-    task_id = tasks[0]['id']
+    task_id = tasks[0].id
     
     # Complete it
     complete_task(task_id, alice_id)
@@ -59,3 +59,57 @@ def test_recurrence_logic(task_db):
     # This is hard to test without mocking datetime.
     # For now, we trust the logic or add a specific test for date calculation if needed.
     pass
+
+def test_app_loads_tasks_in_background(task_db, qapp):
+    import time
+    from apps.task_board.app import TaskBoardApp
+
+    add_person("Alice")
+    add_task("Water plants", "all", None, "Daily")
+    app = TaskBoardApp()
+    assert app.task_list.count() == 0 # Not loaded on the GUI thread
+
+    deadline = time.monotonic() + 2
+    while app.queries.is_busy() and time.monotonic() < deadline:
+        qapp.processEvents()
+    assert app.task_list.count() == 1
+    app.deleteLater()
+
+def test_people_are_loaded_in_background(task_db, qapp):
+    import time
+    from apps.task_board.app import TaskBoardApp, AddTaskDialog
+
+    add_person("Alice")
+    alice_id = get_people()[0].id
+    add_task("Feed cat", "specific", str(alice_id), "Daily")
+    app = TaskBoardApp()
+    dialog = AddTaskDialog(app)
+    assert dialog.people_checks == [] # Not read on the GUI thread
+
+    app.on_task_complete(get_due_tasks()[0].id)
+    deadline = time.monotonic() + 2
+    while (app.queries.is_busy() or dialog.queries.is_busy()) and time.monotonic() < deadline:
+        qapp.processEvents()
+    assert [chk.text() for chk in dialog.people_checks] == ["Alice"]
+    assert get_due_tasks() == []
+    app.deleteLater() # Takes the dialog with it
+
+def test_task_is_saved_in_background(task_db, qapp):
+    import time
+    from PySide6.QtWidgets import QDialog
+    from apps.task_board.app import TaskBoardApp, AddTaskDialog
+
+    app = TaskBoardApp()
+    dialog = AddTaskDialog(app)
+    dialog.name_input.setText("Take out trash")
+    dialog.assign_type_combo.setCurrentIndex(dialog.assign_type_combo.findData("all"))
+    dialog.save_task()
+    assert dialog.result() != QDialog.DialogCode.Accepted # Closes once saved
+
+    deadline = time.monotonic() + 2
+    while dialog.queries.is_busy() and time.monotonic() < deadline:
+        qapp.processEvents()
+    assert dialog.result() == QDialog.DialogCode.Accepted
+    from apps.task_board.database import get_db
+    assert get_db().fetch_all("SELECT name FROM tasks") == [("Take out trash",)]
+    app.deleteLater()
@@ -42,5 +42,42 @@ class {name.capitalize()}Widget(QWidget):
         self.assertIn("clock", widget_ids)
         self.assertIn("weather", widget_ids)
 
+    def test_discovery_does_not_import(self):
+        with open(os.path.join(self.test_dir, "lazy.py"), "w") as f:
+            f.write("""
+import sys
+sys.modules["_lazy_widget_imported"] = True
+class LazyWidget:
+    pass
+""")
+        sys.modules.pop("_lazy_widget_imported", None)
+
+        self.registry.scan_widgets()
+        self.assertEqual(self.registry.get_widget_list(), [{"id": "lazy", "name": "Lazy"}])
+        self.assertNotIn("_lazy_widget_imported", sys.modules)
+
+        instance = self.registry.get_widget_instance("lazy")
+        self.assertEqual(type(instance).__name__, "LazyWidget")
+        self.assertIn("_lazy_widget_imported", sys.modules)
+        sys.modules.pop("_lazy_widget_imported", None)
+        sys.modules.pop("widgets.lazy", None)
+
+    def test_reload_widget_file_picks_up_new_code(self):
+        path = os.path.join(self.test_dir, "hotswap.py")
+        with open(path, "w") as f:
+            f.write("class HotswapWidget:\n    VERSION = 1\n")
+        self.registry.scan_widgets()
+        self.assertEqual(self.registry.load_widget_class("hotswap").VERSION, 1)
+
+        with open(path, "w") as f:
+            f.write("class HotswapWidget:\n    VERSION = 2\n")
+        self.assertEqual(self.registry.reload_widget_file(path), "hotswap")
+        self.assertEqual(self.registry.load_widget_class("hotswap").VERSION, 2)
+
+        os.remove(path)
+        self.registry.reload_widget_file(path)
+        self.assertNotIn("hotswap", self.registry.widgets)
+        sys.modules.pop("widgets.hotswap", None)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,20 @@
-from .clock import ClockWidget
-from .weather import WeatherWidget
-from .app_tile import AppTile
+"""
+Widgets package.
+
+Widgets are loaded on demand by the WidgetRegistry, so nothing is imported
+here eagerly. The names below are still available as package attributes.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ClockWidget": ".clock",
+    "WeatherWidget": ".weather",
+    "AppTile": ".app_tile",
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
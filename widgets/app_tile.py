@@ -70,11 +70,7 @@ class AppTile(QPushButton):
         self.preview_label.setStyleSheet("background: transparent; border: none;")
         
         if preview_pixmap:
-            # Scale pixmap to fit inside the tile, leaving room for text
-            target_w = width - (margin * 2)
-            target_h = height - (margin * 2) - self.res_manager.scale(30) # Space for text
-            scaled_pixmap = preview_pixmap.scaled(target_w, target_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.preview_label.setPixmap(scaled_pixmap)
+            self.preview_label.setPixmap(self.scale_preview(preview_pixmap))
         else:
             # Icon (Placeholder if none provided)
             self.preview_label.setText("📱") 
@@ -92,9 +88,54 @@ class AppTile(QPushButton):
         
         self.clicked.connect(self.on_click)
 
+    def set_name(self, name):
+        """
+        Changes the name shown under the preview (e.g. after a language switch).
+
+        Args:
+            name (str): The new display name.
+        """
+        self.name = name
+        self.name_label.setText(name)
+
     def on_click(self):
         self.launch_app.emit(self.app_id)
 
+    def preview_target_size(self):
+        """
+        Returns the size previews are scaled to for this tile.
+
+        Returns:
+            tuple: (width, height) inside the tile, leaving room for the name.
+        """
+        margin = self.res_manager.scale(15)
+        target_w = self.width() - (margin * 2)
+        target_h = self.height() - (margin * 2) - self.res_manager.scale(30) # Space for text
+        return (target_w, target_h)
+
+    def scale_preview(self, preview_pixmap):
+        """
+        Scales a raw app capture to fit inside the tile.
+
+        Args:
+            preview_pixmap (QPixmap): The full-size capture.
+
+        Returns:
+            QPixmap: The scaled preview.
+        """
+        target_w, target_h = self.preview_target_size()
+        return preview_pixmap.scaled(target_w, target_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+    def set_scaled_preview(self, scaled_pixmap):
+        """
+        Shows a preview that is already scaled to `preview_target_size`.
+
+        Args:
+            scaled_pixmap (QPixmap): The scaled preview.
+        """
+        self.preview_label.setPixmap(scaled_pixmap)
+        self.preview_label.setStyleSheet("background: transparent; border: none;")
+
     def update_preview(self, preview_pixmap):
         """
         Updates the preview image of the tile.
@@ -103,21 +144,9 @@ class AppTile(QPushButton):
             preview_pixmap (QPixmap): The new preview image.
         """
         if preview_pixmap:
-            width = self.width()
-            height = self.height()
-            margin = self.res_manager.scale(15)
-            
-            # Scale pixmap to fit inside the tile, leaving room for text
-            target_w = width - (margin * 2)
-            target_h = height - (margin * 2) - self.res_manager.scale(30) # Space for text
-            
-            scaled_pixmap = preview_pixmap.scaled(target_w, target_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.preview_label.setPixmap(scaled_pixmap)
-            self.preview_label.setStyleSheet("background: transparent; border: none;")
+            self.set_scaled_preview(self.scale_preview(preview_pixmap))
         else:
             # Revert to icon/placeholder if preview is removed (though unlikely in this flow)
             self.preview_label.setText("📱") 
             font_size = self.res_manager.scale(64)
             self.preview_label.setStyleSheet(f"font-size: {font_size}px; background: transparent; border: none;")
-
-
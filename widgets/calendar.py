@@ -8,20 +8,26 @@ Integrates with the Calendar App database to show relevant reminders.
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
 from PySide6.QtCore import Qt, QTimer, QDate
 from PySide6.QtGui import QFont
-from apps.calendar.database import get_upcoming_events, init_db
+from apps.calendar.database import get_db, get_upcoming_events, init_db
 from src.ui.resolution_manager import ResolutionManager
 from src.ui.theme import Theme
+from src.core.query_runner import QueryRunner
+from src.core.change_bus import get_change_bus
 
 class CalendarWidget(QFrame):
     """
     A dashboard widget displaying the date and upcoming events.
 
-    Updates automatically every minute.
+    Updates when events change and when the day changes.
     """
     def __init__(self):
         """Initializes the CalendarWidget."""
         super().__init__()
         init_db()
+        self.queries = QueryRunner(self)
+        bus = get_change_bus()
+        bus.watch(get_db())
+        bus.changed.connect(self.on_data_changed)
         self.res_manager = ResolutionManager()
         
         self.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Raised)
@@ -59,21 +65,35 @@ class CalendarWidget(QFrame):
         self.events_label.setStyleSheet(f"color: #ddd; font-size: {events_font_size}px;")
         layout.addWidget(self.events_label)
         
-        # Timer for updates
+        # Only the date needs watching; event changes come from the change bus
+        self.shown_date = None
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_widget)
-        self.timer.start(60000) # Update every minute
+        self.timer.timeout.connect(self.check_date)
+        self.timer.start(60000) # Check every minute
         
         self.update_widget()
 
+    def check_date(self):
+        """Refreshes after midnight, when the date and the 'days until' move on."""
+        if QDate.currentDate() != self.shown_date:
+            self.update_widget()
+
+    def on_data_changed(self, change):
+        """Refreshes when events were added or removed."""
+        if change.affects(get_db().path, ("events",)):
+            self.update_widget()
+
     def update_widget(self):
         # Update Date
         now = QDate.currentDate()
+        self.shown_date = now
         self.date_label.setText(now.toString("ddd, MMM d"))
         
-        # Update Events
-        upcoming = get_upcoming_events(days_ahead=7)
-        
+        # Update Events (queried in the background)
+        self.queries.run("upcoming", get_upcoming_events, days_ahead=7, on_result=self.show_events)
+
+    def show_events(self, upcoming):
+        """Shows the next events once they were loaded."""
         if not upcoming:
             self.events_label.setText("No upcoming events")
             events_font_size = self.res_manager.scale(14)
@@ -90,8 +110,8 @@ class CalendarWidget(QFrame):
             }
             
             for e in upcoming[:2]:
-                days = e['days_until']
-                cat = e.get("category", "General")
+                days = e.days_until
+                cat = e.category
                 icon = icons.get(cat, "📅")
                 
                 if days == 0:
@@ -101,7 +121,7 @@ class CalendarWidget(QFrame):
                 else:
                     prefix = f"{icon} In {days}d:"
                 
-                text_lines.append(f"{prefix} {e['title']}")
+                text_lines.append(f"{prefix} {e.title}")
             
             if len(upcoming) > 2:
                 text_lines.append(f"+{len(upcoming)-2} more")